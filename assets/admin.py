@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import RealEstate, Investment, Loan
+from .models import RealEstate, Investment, Loan, ValueChange
 
 
 @admin.register(RealEstate)
@@ -21,3 +21,19 @@ class LoanAdmin(admin.ModelAdmin):
     list_display = ["name", "lender", "current_balance", "interest_rate", "monthly_payment", "next_payment_date", "status"]
     list_filter = ["status"]
     search_fields = ["name", "borrower_description", "collateral", "notes_text"]
+
+
+@admin.register(ValueChange)
+class ValueChangeAdmin(admin.ModelAdmin):
+    list_display = ["kind", "object_id", "field", "old_value", "new_value", "changed_at"]
+    list_filter = ["kind", "field"]
+
+    # Append-only log
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
@@ -0,0 +1,181 @@
+"""Loan amortization schedules, computed for many loans at once with NumPy.
+
+A fixed-payment loan's balance after k payments has a closed form,
+
+    B_k = B_0 (1 + r)^k - P ((1 + r)^k - 1) / r      (B_k = B_0 - P k when r = 0)
+
+so the balances of every loan for every month are a single (loans x months)
+array expression instead of a Python loop per loan per month. Interest for
+month k is B_{k-1} r; principal is the rest of the payment, and the final
+payment only clears what's left.
+
+Inputs are the stored current_balance, interest_rate (annual %) and
+monthly_payment, with the first payment on next_payment_date (default: a
+month from today). When monthly_payment is empty but maturity_date is set,
+the level payment that retires the balance by maturity is used. A payment
+that doesn't cover the interest never pays off: its schedule stops at
+MAX_MONTHS with ``paid_off`` False.
+
+Extra-payment scenarios: ``extra_monthly`` is added to every payment and
+``lump_sum`` is paid with the first one.
+
+``loan_schedule`` and ``projected_payments`` are cached through
+blaine.cache, keyed on each loan's pk and updated_at (and today's date),
+so editing a loan recomputes only what depends on it.
+"""
+import calendar
+from datetime import date
+
+import numpy as np
+from django.utils import timezone
+
+MAX_MONTHS = 600
+
+
+def add_months(day, months):
+    """``day`` moved by ``months`` calendar months, clamped to the month's last day."""
+    month_index = day.month - 1 + months
+    year, month = day.year + month_index // 12, month_index % 12 + 1
+    return date(year, month, min(day.day, calendar.monthrange(year, month)[1]))
+
+
+def _months_until(start, end):
+    return (end.year - start.year) * 12 + end.month - start.month + 1
+
+
+def _inputs(loan, today):
+    """(balance, monthly rate, payment, first payment date) or None when the loan can't be scheduled."""
+    if loan.status != "active" or not loan.current_balance or loan.current_balance <= 0:
+        return None
+    balance = float(loan.current_balance)
+    rate = float(loan.interest_rate or 0) / 1200
+    first = loan.next_payment_date or add_months(today, 1)
+    payment = float(loan.monthly_payment or 0)
+    if not payment and loan.maturity_date and loan.maturity_date >= first:
+        months = _months_until(first, loan.maturity_date)
+        payment = balance / months if rate == 0 else balance * rate / (1 - (1 + rate) ** -months)
+    if payment <= 0:
+        return None
+    return balance, rate, payment, first
+
+
+def amortize(loans, extra_monthly=0, lump_sum=0, today=None, horizon=MAX_MONTHS):
+    """Schedules for ``loans``: {pk: schedule}. Loans that can't be scheduled are left out.
+
+    A schedule holds per-payment NumPy arrays (``payment``, ``interest``,
+    ``principal``, ``balance`` after the payment) trimmed to its own length,
+    plus ``first_payment``, ``months``, ``paid_off``, ``payoff_date``,
+    ``total_interest`` and ``total_paid``.
+    """
+    today = today or timezone.localdate()
+    pks, rows = [], []
+    for loan in loans:
+        inputs = _inputs(loan, today)
+        if inputs:
+            pks.append(loan.pk)
+            rows.append(inputs)
+    if not rows:
+        return {}
+
+    balance0 = np.array([r[0] for r in rows])
+    rate = np.array([r[1] for r in rows])
+    payment = np.array([r[2] for r in rows]) + float(extra_monthly)
+    balance0 = np.maximum(balance0 - float(lump_sum), 0.0)
+
+    k = np.arange(horizon + 1, dtype=float)
+    growth = (1 + rate)[:, None] ** k
+    safe_rate = np.where(rate == 0, 1.0, rate)[:, None]
+    balances = np.where(
+        (rate == 0)[:, None],
+        balance0[:, None] - payment[:, None] * k,
+        balance0[:, None] * growth - payment[:, None] * (growth - 1) / safe_rate,
+    )
+    # Number of payments: first k >= 1 whose balance reaches 0 (half a cent of float noise allowed)
+    cleared = balances[:, 1:] <= 0.005
+    paid_off = cleared.any(axis=1) | (balance0 == 0)
+    months = np.where(balance0 == 0, 0, np.where(paid_off, cleared.argmax(axis=1) + 1, horizon))
+
+    opening = balances[:, :-1]
+    interest = opening * rate[:, None]
+    principal = np.minimum(payment[:, None] - interest, opening)
+    paid = interest + principal
+    closing = opening - principal
+
+    schedules = {}
+    for i, pk in enumerate(pks):
+        n = int(months[i])
+        first = rows[i][3]
+        schedules[pk] = {
+            "first_payment": first,
+            "months": n,
+            "paid_off": bool(paid_off[i]),
+            "payoff_date": add_months(first, n - 1) if paid_off[i] and n else None,
+            "payment": paid[i, :n],
+            "interest": interest[i, :n],
+            "principal": principal[i, :n],
+            "balance": np.maximum(closing[i, :n], 0.0),
+            "total_interest": float(interest[i, :n].sum()),
+            "total_paid": float(paid[i, :n].sum()),
+        }
+    return schedules
+
+
+def schedule_rows(schedule):
+    """Template rows: dicts of number, date, payment, interest, principal, balance."""
+    return [
+        {"number": i + 1, "date": add_months(schedule["first_payment"], i),
+         "payment": round(float(pay), 2), "interest": round(float(interest), 2),
+         "principal": round(float(principal), 2), "balance": round(float(balance), 2)}
+        for i, (pay, interest, principal, balance) in enumerate(zip(
+            schedule["payment"], schedule["interest"], schedule["principal"], schedule["balance"],
+        ))
+    ]
+
+
+def loan_schedule(loan, extra_monthly=0, lump_sum=0):
+    """One loan's schedule (or None), cached until the loan is saved again."""
+    from blaine.cache import cached
+
+    today = timezone.localdate()
+    return cached(
+        "amortization:loan", [],
+        lambda: amortize([loan], extra_monthly, lump_sum, today).get(loan.pk),
+        vary=[loan.pk, loan.updated_at, extra_monthly, lump_sum, today],
+    )
+
+
+def projected_payments(start, end, exclude=()):
+    """[(date, amount, loan pk)] for every active loan's payments between start and end.
+
+    ``exclude`` holds loan pks to leave out (e.g. ones already forecast by hand).
+    """
+    from blaine.cache import cached
+
+    from .models import Loan
+
+    loans = list(
+        Loan.objects.filter(status="active", current_balance__gt=0).exclude(pk__in=exclude).only(
+            "status", "current_balance", "interest_rate", "monthly_payment",
+            "next_payment_date", "maturity_date", "updated_at",
+        )
+    )
+    today = timezone.localdate()
+
+    def compute():
+        # Enough months to reach ``end`` from the earliest first payment (overdue ones included)
+        earliest = min([loan.next_payment_date or today for loan in loans] + [today])
+        horizon = min(MAX_MONTHS, max(_months_until(earliest, end) + 1, 1))
+        payments = []
+        for pk, schedule in amortize(loans, today=today, horizon=horizon).items():
+            for i, amount in enumerate(schedule["payment"]):
+                day = add_months(schedule["first_payment"], i)
+                if day > end:
+                    break
+                if day >= start:
+                    payments.append((day, round(float(amount), 2), pk))
+        return sorted(payments)
+
+    return cached(
+        "amortization:projected", [], compute,
+        vary=[start, end, today, [(loan.pk, loan.updated_at) for loan in loans]],
+    )
@@ -3,3 +3,9 @@ from django.apps import AppConfig
 
 class AssetsConfig(AppConfig):
     name = 'assets'
+
+    def ready(self):
+        from assets import changes, risk
+
+        changes.connect_signals()
+        risk.connect_signals()
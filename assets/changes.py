@@ -0,0 +1,102 @@
+"""Field-level change log for property, investment and loan values.
+
+pre_save reads the stored values of the tracked fields (one indexed query
+by pk) and keeps the ones that differ on the instance; post_save writes
+them as ValueChange rows, so a save that fails logs nothing. Creation is
+not logged. ``QuerySet.update`` and ``bulk_update`` bypass both signals;
+callers log through ``record_bulk`` instead.
+"""
+from django.db.models.signals import post_save, pre_save
+
+from .models import Investment, Loan, RealEstate, ValueChange
+
+# model -> (ValueChange.kind, tracked fields)
+TRACKED = {
+    RealEstate: ("property", ("estimated_value", "status")),
+    Investment: ("investment", ("current_value",)),
+    Loan: ("loan", ("original_amount", "current_balance", "interest_rate", "monthly_payment", "status")),
+}
+
+
+def _text(field, value):
+    if value is None:
+        return None
+    if field.get_internal_type() == "DecimalField":
+        return f"{value:.{field.decimal_places}f}"
+    return str(value)
+
+
+def _capture(sender, instance, raw=False, update_fields=None, **kwargs):
+    instance._value_changes = []
+    if raw or instance.pk is None:
+        return
+    fields = TRACKED[sender][1]
+    if update_fields is not None:
+        fields = [f for f in fields if f in update_fields]
+    if not fields:
+        return
+    old = sender.objects.filter(pk=instance.pk).values(*fields).first()
+    if old is None:
+        return
+    for name in fields:
+        field = sender._meta.get_field(name)
+        # Compare as values, so "100" from a form equals the stored 100.00
+        before, after = old[name], field.to_python(getattr(instance, name))
+        if before != after:
+            instance._value_changes.append((name, _text(field, before), _text(field, after)))
+
+
+def _record(sender, instance, created, raw=False, **kwargs):
+    changes = getattr(instance, "_value_changes", None)
+    if not changes:
+        return
+    kind = TRACKED[sender][0]
+    ValueChange.objects.bulk_create(
+        ValueChange(kind=kind, object_id=instance.pk, field=field, old_value=old, new_value=new)
+        for field, old, new in changes
+    )
+    instance._value_changes = []
+
+
+def record_bulk(model, changes):
+    """Log changes written with ``bulk_update``: an iterable of (pk, field name, old, new)."""
+    kind = TRACKED[model][0]
+    rows = []
+    for pk, name, old, new in changes:
+        field = model._meta.get_field(name)
+        if old != new:
+            rows.append(ValueChange(kind=kind, object_id=pk, field=name,
+                                    old_value=_text(field, old), new_value=_text(field, new)))
+    ValueChange.objects.bulk_create(rows)
+
+
+def connect_signals():
+    for model in TRACKED:
+        label = model._meta.label_lower
+        pre_save.connect(_capture, sender=model, dispatch_uid=f"changes.capture.{label}")
+        post_save.connect(_record, sender=model, dispatch_uid=f"changes.record.{label}")
+
+
+def history(kind, object_id):
+    """ValueChange rows for one asset, newest first (served by valuechange_asset_idx)."""
+    return ValueChange.objects.filter(kind=kind, object_id=object_id)
+
+
+def _display(field, value):
+    if value is None:
+        return "—"
+    if field.choices:
+        return dict(field.choices).get(value, value)
+    if field.name == "interest_rate":
+        return f"{value}%"
+    return f"${float(value):,.2f}"
+
+
+def describe(model, changes):
+    """(change, field label, old display, new display) for a page of ValueChange rows."""
+    rows = []
+    for change in changes:
+        field = model._meta.get_field(change.field)
+        rows.append((change, field.verbose_name.capitalize(),
+                     _display(field, change.old_value), _display(field, change.new_value)))
+    return rows
@@ -0,0 +1,196 @@
+"""Exposure and concentration across jurisdictions, lenders, institutions and stakeholders.
+
+Each dimension is computed by grouped aggregate queries (GROUP BY the
+dimension, SUM the values) so the database returns one row per group
+instead of every asset, and the covering indexes added for these queries
+let it do so from the index alone. Results are cached per dimension until
+one of the models they read changes.
+
+Rows carry the group's count, value and share of the dimension total;
+property and lender rows add the active debt secured against the group's
+properties (through ``Loan.collateral_property``) and its loan-to-value.
+Every dimension also gets a Herfindahl-Hirschman index (the sum of squared
+percentage shares, 0-10,000) as a single concentration figure.
+"""
+from decimal import Decimal
+
+from django.db.models import Count, Exists, OuterRef, Q, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+
+from .models import Investment, Loan, RealEstate
+
+TOP_N = 25
+# HHI bands: below MODERATE is unconcentrated, MODERATE and up moderately, HIGH and up highly
+MODERATE_HHI = 1500
+HIGH_HHI = 2500
+
+
+def _percent(part, whole):
+    return round(100 * float(part) / float(whole), 1) if whole else None
+
+
+def _summarize(rows):
+    """Sort rows by value, add shares, keep the top ``TOP_N`` and fold the rest into "Other"."""
+    rows = sorted(rows, key=lambda row: row["value"], reverse=True)
+    total = sum((row["value"] for row in rows), Decimal(0))
+    for row in rows:
+        row["share"] = _percent(row["value"], total) or 0.0
+    hhi = round(sum((100 * float(row["value"]) / float(total)) ** 2 for row in rows)) if total else 0
+    top, rest = rows[:TOP_N], rows[TOP_N:]
+    if rest:
+        top.append({
+            "label": f"{len(rest)} others", "other": True,
+            "count": sum(row["count"] for row in rest),
+            "value": sum((row["value"] for row in rest), Decimal(0)),
+            "share": round(sum(row["share"] for row in rest), 1),
+        })
+    return {
+        "rows": top,
+        "groups": len(rows),
+        "total": total,
+        "hhi": hhi,
+        "level": "high" if hhi >= HIGH_HHI else "moderate" if hhi >= MODERATE_HHI else "low",
+    }
+
+
+def _label_stakeholders(summary, missing=""):
+    """Name the stakeholder rows that are shown (one query for at most ``TOP_N`` pks)."""
+    from stakeholders.models import Stakeholder
+
+    shown = [row["stakeholder_id"] for row in summary["rows"] if not row.get("other")]
+    names = dict(Stakeholder.objects.filter(pk__in=shown).values_list("pk", "name"))
+    for row in summary["rows"]:
+        if not row.get("other"):
+            row["label"] = names.get(row["stakeholder_id"], missing)
+
+
+def _active_properties():
+    return RealEstate.objects.exclude(status="sold")
+
+
+def _properties_by(field):
+    """Properties grouped by ``field`` with value, secured debt and LTV."""
+    secured = Exists(Loan.objects.filter(collateral_property=OuterRef("pk"), status="active"))
+    groups = (
+        _active_properties().values(field)
+        .annotate(count=Count("pk"), value=Sum("estimated_value", default=Decimal(0)),
+                  secured_value=Sum("estimated_value", filter=Q(secured), default=Decimal(0)))
+        .order_by()
+    )
+    debt = dict(
+        Loan.objects.filter(status="active", collateral_property__isnull=False)
+        .exclude(collateral_property__status="sold")
+        .values_list(f"collateral_property__{field}")
+        .annotate(debt=Sum("current_balance", default=Decimal(0)))
+        .order_by()
+    )
+    rows = []
+    for group in groups:
+        secured_debt = debt.get(group[field], Decimal(0))
+        rows.append({
+            "label": group[field] or "Unspecified",
+            "count": group["count"],
+            "value": group["value"],
+            "debt": secured_debt,
+            "ltv": _percent(secured_debt, group["secured_value"]),
+        })
+    return _summarize(rows)
+
+
+def by_jurisdiction():
+    return _properties_by("jurisdiction")
+
+
+def by_property_type():
+    return _properties_by("property_type")
+
+
+def _lender_collateral_value():
+    """Value of the unsold properties securing the outer lender's active loans, each counted once."""
+    # Driven from the lender's loans (loan_status_lender_idx), then a pk lookup per property
+    secured = Loan.objects.filter(status="active", lender=OuterRef(OuterRef("lender"))).values("collateral_property")
+    return Subquery(
+        _active_properties().filter(pk__in=secured).values(group=Value(1))
+        .annotate(total=Sum("estimated_value")).values("total"),
+    )
+
+
+def by_lender():
+    """Active loan balances grouped by lender, with LTV over the collateral that's linked."""
+    secured = Q(collateral_property__isnull=False) & ~Q(collateral_property__status="sold")
+    groups = (
+        Loan.objects.filter(status="active")
+        .values("lender")
+        .annotate(count=Count("pk"), value=Sum("current_balance", default=Decimal(0)),
+                  payments=Sum("monthly_payment", default=Decimal(0)),
+                  secured_debt=Sum("current_balance", filter=secured, default=Decimal(0)),
+                  collateral_value=Coalesce(_lender_collateral_value(), Decimal(0)))
+        .order_by()
+    )
+    summary = _summarize([
+        {
+            "stakeholder_id": group["lender"],
+            "count": group["count"],
+            "value": group["value"],
+            "payments": group["payments"],
+            "debt": group["secured_debt"],
+            "ltv": _percent(group["secured_debt"], group["collateral_value"]),
+        }
+        for group in groups
+    ])
+    _label_stakeholders(summary, "No lender")
+    return summary
+
+
+def by_institution():
+    groups = (
+        Investment.objects.values("institution")
+        .annotate(count=Count("pk"), value=Sum("current_value", default=Decimal(0)))
+        .order_by()
+    )
+    return _summarize([
+        {"label": group["institution"] or "Unspecified", "count": group["count"], "value": group["value"]}
+        for group in groups
+    ])
+
+
+def by_stakeholder():
+    """Property and investment value held with, and loan balances owed to, each stakeholder."""
+    rows = {}
+    sources = [
+        ("properties", _active_properties().filter(stakeholder__isnull=False), "stakeholder", "estimated_value"),
+        ("investments", Investment.objects.filter(stakeholder__isnull=False), "stakeholder", "current_value"),
+        ("loans", Loan.objects.filter(status="active", lender__isnull=False), "lender", "current_balance"),
+    ]
+    for column, qs, fk, field in sources:
+        groups = qs.values_list(fk).annotate(count=Count("pk"), total=Sum(field, default=Decimal(0))).order_by()
+        for pk, count, total in groups:
+            row = rows.setdefault(pk, {"stakeholder_id": pk, "count": 0, "value": Decimal(0),
+                                       "properties": Decimal(0), "investments": Decimal(0), "loans": Decimal(0)})
+            row[column] = total
+            row["count"] += count
+            row["value"] += total
+    summary = _summarize(list(rows.values()))
+    _label_stakeholders(summary)
+    return summary
+
+
+# name -> (label, compute, models it reads)
+DIMENSIONS = {
+    "jurisdiction": ("Jurisdiction", by_jurisdiction, ["assets.RealEstate", "assets.Loan"]),
+    "lender": ("Lender", by_lender, ["assets.Loan", "assets.RealEstate", "stakeholders.Stakeholder"]),
+    "institution": ("Institution", by_institution, ["assets.Investment"]),
+    "property_type": ("Property Type", by_property_type, ["assets.RealEstate", "assets.Loan"]),
+    "stakeholder": ("Stakeholder", by_stakeholder,
+                    ["assets.RealEstate", "assets.Investment", "assets.Loan", "stakeholders.Stakeholder"]),
+}
+
+
+def exposure(dimension):
+    """The cached summary for one of ``DIMENSIONS``."""
+    from django.apps import apps
+
+    from blaine.cache import cached
+
+    _label, compute, models = DIMENSIONS[dimension]
+    return cached(f"exposure:{dimension}", [apps.get_model(label) for label in models], compute)
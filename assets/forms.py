@@ -30,7 +30,7 @@ class LoanForm(TailwindFormMixin, forms.ModelForm):
         model = Loan
         fields = ["name", "lender", "borrower_description", "original_amount",
                   "current_balance", "interest_rate", "monthly_payment",
-                  "next_payment_date", "maturity_date", "collateral", "status", "notes_text"]
+                  "next_payment_date", "maturity_date", "collateral", "collateral_property", "status", "notes_text"]
         widgets = {
             "next_payment_date": forms.DateInput(attrs={"type": "date"}),
             "maturity_date": forms.DateInput(attrs={"type": "date"}),
@@ -0,0 +1,46 @@
+# Generated by Django 6.0.2 on 2026-10-19 08:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('assets', '0001_initial'),
+        ('stakeholders', '0002_list_view_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='investment',
+            index=models.Index(fields=['name'], name='investment_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='investment',
+            index=models.Index(fields=['current_value'], name='investment_value_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='loan',
+            index=models.Index(fields=['name'], name='loan_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='loan',
+            index=models.Index(fields=['status', 'next_payment_date'], name='loan_status_payment_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='loan',
+            index=models.Index(fields=['next_payment_date'], name='loan_payment_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='realestate',
+            index=models.Index(fields=['name'], name='realestate_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='realestate',
+            index=models.Index(fields=['status', 'estimated_value'], name='realestate_status_value_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='realestate',
+            index=models.Index(fields=['acquisition_date'], name='realestate_acquired_idx'),
+        ),
+    ]
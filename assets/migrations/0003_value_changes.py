@@ -0,0 +1,30 @@
+# Generated by Django 6.0.2 on 2026-10-19 09:40
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('assets', '0002_list_view_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ValueChange',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('property', 'Property'), ('investment', 'Investment'), ('loan', 'Loan')], max_length=10)),
+                ('object_id', models.PositiveBigIntegerField()),
+                ('field', models.CharField(max_length=30)),
+                ('old_value', models.CharField(blank=True, max_length=40, null=True)),
+                ('new_value', models.CharField(blank=True, max_length=40, null=True)),
+                ('changed_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'ordering': ['-changed_at', '-id'],
+                'indexes': [models.Index(fields=['kind', 'object_id', '-changed_at'], name='valuechange_asset_idx')],
+            },
+        ),
+    ]
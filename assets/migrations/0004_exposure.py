@@ -0,0 +1,40 @@
+# Generated by Django 6.0.2 on 2026-10-19 11:05
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('assets', '0003_value_changes'),
+        ('stakeholders', '0002_list_view_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='loan',
+            name='collateral_property',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='secured_loans', to='assets.realestate'),
+        ),
+        migrations.AddIndex(
+            model_name='investment',
+            index=models.Index(fields=['institution', 'current_value'], name='investment_inst_value_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='loan',
+            index=models.Index(fields=['status', 'lender', 'current_balance'], name='loan_status_lender_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='loan',
+            index=models.Index(fields=['status', 'collateral_property', 'current_balance'], name='loan_status_collateral_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='realestate',
+            index=models.Index(fields=['status', 'jurisdiction', 'estimated_value'], name='realestate_juris_value_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='realestate',
+            index=models.Index(fields=['status', 'property_type', 'estimated_value'], name='realestate_type_value_idx'),
+        ),
+    ]
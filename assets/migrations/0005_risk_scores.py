@@ -0,0 +1,44 @@
+# Generated by Django 6.0.2 on 2026-10-19 13:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('assets', '0004_exposure'),
+        ('stakeholders', '0002_list_view_indexes'),
+        ('cashflow', '0003_idempotency_key'),
+        ('legal', '0003_list_view_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='loan',
+            name='risk_factors',
+            field=models.JSONField(blank=True, default=list, editable=False),
+        ),
+        migrations.AddField(
+            model_name='loan',
+            name='risk_score',
+            field=models.PositiveSmallIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='realestate',
+            name='risk_factors',
+            field=models.JSONField(blank=True, default=list, editable=False),
+        ),
+        migrations.AddField(
+            model_name='realestate',
+            name='risk_score',
+            field=models.PositiveSmallIntegerField(default=0, editable=False),
+        ),
+        migrations.AddIndex(
+            model_name='loan',
+            index=models.Index(fields=['-risk_score'], name='loan_risk_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='realestate',
+            index=models.Index(fields=['-risk_score'], name='realestate_risk_idx'),
+        ),
+    ]
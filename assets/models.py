@@ -1,5 +1,6 @@
 from django.db import models
 from django.urls import reverse
+from django.utils import timezone
 
 
 class RealEstate(models.Model):
@@ -22,6 +23,9 @@ class RealEstate(models.Model):
         null=True, blank=True, related_name="properties",
     )
     notes_text = models.TextField(blank=True)
+    # Denormalized by assets.risk; not edited by hand
+    risk_score = models.PositiveSmallIntegerField(default=0, editable=False)
+    risk_factors = models.JSONField(default=list, blank=True, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -34,6 +38,16 @@ class RealEstate(models.Model):
     class Meta:
         verbose_name_plural = "Real estate"
         ordering = ["name"]
+        indexes = [
+            models.Index(fields=["name"], name="realestate_name_idx"),
+            # Covers net worth (status != sold) and status filters
+            models.Index(fields=["status", "estimated_value"], name="realestate_status_value_idx"),
+            models.Index(fields=["acquisition_date"], name="realestate_acquired_idx"),
+            # Exposure analytics GROUP BY these, reading values from the index
+            models.Index(fields=["status", "jurisdiction", "estimated_value"], name="realestate_juris_value_idx"),
+            models.Index(fields=["status", "property_type", "estimated_value"], name="realestate_type_value_idx"),
+            models.Index(fields=["-risk_score"], name="realestate_risk_idx"),
+        ]
 
 
 class Investment(models.Model):
@@ -57,6 +71,11 @@ class Investment(models.Model):
 
     class Meta:
         ordering = ["name"]
+        indexes = [
+            models.Index(fields=["name"], name="investment_name_idx"),
+            models.Index(fields=["current_value"], name="investment_value_idx"),
+            models.Index(fields=["institution", "current_value"], name="investment_inst_value_idx"),
+        ]
 
 
 class Loan(models.Model):
@@ -80,8 +99,15 @@ class Loan(models.Model):
     next_payment_date = models.DateField(null=True, blank=True)
     maturity_date = models.DateField(null=True, blank=True)
     collateral = models.TextField(blank=True)
+    collateral_property = models.ForeignKey(
+        RealEstate, on_delete=models.SET_NULL,
+        null=True, blank=True, related_name="secured_loans",
+    )
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default="active")
     notes_text = models.TextField(blank=True)
+    # Denormalized by assets.risk; not edited by hand
+    risk_score = models.PositiveSmallIntegerField(default=0, editable=False)
+    risk_factors = models.JSONField(default=list, blank=True, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -93,3 +119,41 @@ class Loan(models.Model):
 
     class Meta:
         ordering = ["name"]
+        indexes = [
+            models.Index(fields=["name"], name="loan_name_idx"),
+            models.Index(fields=["status", "next_payment_date"], name="loan_status_payment_idx"),
+            models.Index(fields=["next_payment_date"], name="loan_payment_idx"),
+            models.Index(fields=["status", "lender", "current_balance"], name="loan_status_lender_idx"),
+            models.Index(fields=["status", "collateral_property", "current_balance"], name="loan_status_collateral_idx"),
+            models.Index(fields=["-risk_score"], name="loan_risk_idx"),
+        ]
+
+
+class ValueChange(models.Model):
+    """One field edit on a property, investment or loan (assets.changes).
+
+    Append-only: rows are written by a save signal and never edited.
+    """
+
+    KIND_CHOICES = [
+        ("property", "Property"),
+        ("investment", "Investment"),
+        ("loan", "Loan"),
+    ]
+
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES)
+    object_id = models.PositiveBigIntegerField()
+    field = models.CharField(max_length=30)
+    # Stored as text so amounts and statuses share one table; null = empty
+    old_value = models.CharField(max_length=40, null=True, blank=True)
+    new_value = models.CharField(max_length=40, null=True, blank=True)
+    changed_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        ordering = ["-changed_at", "-id"]
+        indexes = [
+            models.Index(fields=["kind", "object_id", "-changed_at"], name="valuechange_asset_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.get_kind_display()} #{self.object_id} {self.field}: {self.old_value} -> {self.new_value}"
@@ -0,0 +1,136 @@
+"""Post loan payments as they fall due and move each loan to its next payment.
+
+``post_due_payments`` runs daily from the qcluster, first in
+``dashboard.networth.daily_update``.
+Every active loan whose next_payment_date has passed gets, for each missed
+payment date:
+
+- an actual CashFlowEntry outflow linked through ``related_loan``,
+- its principal taken off ``current_balance`` (the interest/principal split
+  comes from ``amortization.amortize``, so it matches the schedule shown on
+  the loan page),
+- next_payment_date moved a month on, until it is today or later.
+
+A loan whose balance reaches zero is marked paid off. Loans without a
+balance or rate still post ``monthly_payment`` and advance.
+
+Everything is written with bulk_create/bulk_update inside one transaction.
+Each entry carries an idempotency key ("loan:<pk>:<due date>"), and a date
+whose key already exists is skipped along with its balance change (and
+without using up a schedule row, since the schedule starts from the
+current balance), so re-running the job (or re-running after a loan's date
+was moved back by hand) never posts a payment twice.
+"""
+from decimal import Decimal
+
+from django.db import transaction
+from django.utils import timezone
+
+from blaine.cache import mark_changed
+from cashflow.models import CashFlowEntry
+
+from . import risk
+from .amortization import add_months, amortize
+from .changes import record_bulk
+from .models import Loan, ValueChange
+
+CATEGORY = "Loan Payment"
+CENT = Decimal("0.01")
+
+
+def payment_key(loan_pk, day):
+    return f"loan:{loan_pk}:{day.isoformat()}"
+
+
+def _due_dates(loan, today):
+    """The loan's payment dates before ``today``, oldest first."""
+    dates, day = [], loan.next_payment_date
+    while day < today:
+        dates.append(day)
+        day = add_months(loan.next_payment_date, len(dates))
+    return dates
+
+
+def _money(value):
+    return Decimal(str(value)).quantize(CENT)
+
+
+def post_due_payments(today=None):
+    """Post every overdue payment of every active loan; safe to re-run."""
+    from dashboard import deadlines
+
+    today = today or timezone.localdate()
+    with transaction.atomic():
+        loans = list(
+            Loan.objects.select_for_update()
+            .filter(status="active", next_payment_date__lt=today)
+            .order_by("pk")
+        )
+        if not loans:
+            return "No loan payments due."
+        due = {loan.pk: _due_dates(loan, today) for loan in loans}
+        horizon = max(len(dates) for dates in due.values())
+        schedules = amortize(loans, today=today, horizon=horizon)
+        posted = set(
+            CashFlowEntry.objects.filter(
+                idempotency_key__in=[payment_key(pk, day) for pk, dates in due.items() for day in dates]
+            ).values_list("idempotency_key", flat=True)
+        )
+
+        entries, changes = [], []
+        for loan in loans:
+            schedule = schedules.get(loan.pk)
+            old_balance, old_status = loan.current_balance, loan.status
+            balance, first = loan.current_balance, loan.next_payment_date
+            # The schedule starts from the current balance, so its rows are
+            # used by the payments posted now; dates posted earlier (whose
+            # principal is already off the balance) don't use one up
+            row = 0
+            for i, day in enumerate(due[loan.pk]):
+                if schedule is not None and row >= schedule["months"]:
+                    break
+                # Count from the first date so Jan 31 -> Feb 28 -> Mar 31 doesn't drift
+                loan.next_payment_date = add_months(first, i + 1)
+                key = payment_key(loan.pk, day)
+                if key in posted:
+                    continue
+                if schedule is not None:
+                    amount = _money(schedule["payment"][row])
+                    principal = _money(schedule["principal"][row])
+                    row += 1
+                else:
+                    amount, principal = loan.monthly_payment, None
+                if not amount:
+                    continue
+                entries.append(CashFlowEntry(
+                    description=f"{loan.name} payment",
+                    amount=amount,
+                    entry_type="outflow",
+                    category=CATEGORY,
+                    date=day,
+                    related_loan=loan,
+                    related_stakeholder_id=loan.lender_id,
+                    idempotency_key=key,
+                ))
+                if principal is not None:
+                    balance = max(balance - principal, Decimal(0))
+            if schedule is not None and schedule["paid_off"] and row >= schedule["months"]:
+                balance, loan.status = Decimal(0), "paid_off"
+            loan.current_balance = balance
+            loan.updated_at = timezone.now()
+            changes += [(loan.pk, "current_balance", old_balance, balance),
+                        (loan.pk, "status", old_status, loan.status)]
+
+        CashFlowEntry.objects.bulk_create(entries, ignore_conflicts=True)
+        # ignore_conflicts drops rows silently; count what's actually there
+        inserted = CashFlowEntry.objects.filter(
+            idempotency_key__in=[entry.idempotency_key for entry in entries],
+        ).count()
+        Loan.objects.bulk_update(loans, ["current_balance", "next_payment_date", "status", "updated_at"])
+        record_bulk(Loan, changes)
+        deadlines.sync_objects(Loan, loans)
+        risk.score_loans([loan.pk for loan in loans], today)
+    # bulk writes skip the signals that version the caches
+    for model in (CashFlowEntry, Loan, ValueChange):
+        mark_changed(model)
+    return f"Posted {inserted} loan payment(s) across {len(loans)} loan(s)."
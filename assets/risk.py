@@ -0,0 +1,280 @@
+"""Risk scores for properties and loans, stored on the rows themselves.
+
+Each property and loan carries ``risk_score`` (0-100) and ``risk_factors``
+(the reasons, for display), so the dashboard's risk panel and the list
+sorts are indexed ORDER BY risk_score queries instead of joins across
+legal matters, stakeholders and cash flow at read time.
+
+A property scores for being in dispute, its active/pending legal matters,
+its owner's risk_rating, negative actual cash flow over the last year and
+securing a defaulted or disputed loan. A loan scores for its status, an
+overdue payment, its lender's risk_rating and trouble with its collateral.
+Sold properties and paid-off loans score 0.
+
+Saves and deletes of the inputs (properties, loans, legal matters and their
+property links, stakeholders, cash flow entries) re-score the affected rows
+(connected in AssetsConfig.ready); moving a loan's collateral or an entry's
+property re-scores the old property as well as the new one. Writes that bypass signals must call
+``score_properties``/``score_loans`` or ``rebuild`` themselves; the daily
+``rebuild`` (after the day's payments, in ``dashboard.networth.daily_update``)
+picks up payments that became overdue.
+
+Scores are written with bulk_update, which skips the save signals, so
+scoring never re-triggers itself. The migration that adds the fields only
+changes the schema: run ``manage.py rescore_risk`` once after upgrading (the
+daily rebuild also fills them in).
+"""
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import Count, Q, Sum
+from django.utils import timezone
+
+from blaine.cache import mark_changed
+
+from .models import Loan, RealEstate
+
+# factor -> points; a score is the capped sum of its factors
+WEIGHTS = {
+    "property_in_dispute": 40,
+    "legal_matter": 20,  # per active or pending matter
+    "legal_matter_max": 40,
+    "rating_point": 5,  # per risk_rating point above 1 (owner or lender)
+    "negative_cash_flow": 15,
+    "secures_troubled_loan": 20,
+    "loan_defaulted": 50,
+    "loan_in_dispute": 40,
+    "payment_overdue": 25,
+    "collateral_at_risk": 15,
+}
+MAX_SCORE = 100
+# Score from which the dashboard lists an asset
+ALERT_SCORE = 20
+CASH_FLOW_DAYS = 365
+ACTIVE_MATTER_STATUSES = ["active", "pending"]
+TROUBLED_LOAN_STATUSES = ["defaulted", "in_dispute"]
+
+LABELS = ["assets.realestate", "assets.loan", "legal.legalmatter", "cashflow.cashflowentry"]
+# label -> the property FK whose previous value also needs re-scoring when it changes
+PROPERTY_FKS = {"assets.loan": "collateral_property_id", "cashflow.cashflowentry": "related_property_id"}
+
+
+def _filter(qs, pks, field="pk"):
+    return qs if pks is None else qs.filter(**{f"{field}__in": pks})
+
+
+def _matter_counts(property_pks):
+    from legal.models import LegalMatter
+
+    through = LegalMatter.related_properties.through
+    rows = _filter(through.objects.filter(legalmatter__status__in=ACTIVE_MATTER_STATUSES),
+                   property_pks, "realestate_id")
+    return dict(rows.values_list("realestate_id").annotate(n=Count("pk")).order_by())
+
+
+def _negative_cash_flow(property_pks, today):
+    """Properties whose actual inflows minus outflows over the last year is below zero."""
+    from cashflow.models import CashFlowEntry
+
+    rows = _filter(
+        CashFlowEntry.objects.filter(
+            related_property__isnull=False, is_projected=False, date__gt=today - timedelta(days=CASH_FLOW_DAYS),
+        ),
+        property_pks, "related_property_id",
+    )
+    rows = rows.values("related_property_id").annotate(
+        net=Sum("amount", filter=Q(entry_type="inflow"), default=0)
+        - Sum("amount", filter=Q(entry_type="outflow"), default=0),
+    ).order_by()
+    return {row["related_property_id"] for row in rows if row["net"] < 0}
+
+
+def _rating_points(rating):
+    return max((rating or 1) - 1, 0) * WEIGHTS["rating_point"]
+
+
+def _finish(factors):
+    return min(sum(points for _label, points in factors), MAX_SCORE), [label for label, _points in factors]
+
+
+def _write(model, current, scores):
+    """bulk_update the rows whose score or factors changed; returns how many did."""
+    changed = [
+        model(pk=pk, risk_score=score, risk_factors=factors)
+        for pk, (score, factors) in scores.items()
+        if current[pk] != (score, factors)
+    ]
+    if changed:
+        model.objects.bulk_update(changed, ["risk_score", "risk_factors"], batch_size=500)
+        mark_changed(model)
+    return len(changed)
+
+
+def score_properties(pks=None, today=None):
+    """Re-score the given properties (all when ``pks`` is None)."""
+    today = today or timezone.localdate()
+    rows = list(_filter(RealEstate.objects.order_by(), pks).values_list(
+        "pk", "status", "stakeholder__risk_rating", "risk_score", "risk_factors",
+    ))
+    if not rows:
+        return 0
+    if pks is not None:
+        pks = [row[0] for row in rows]
+    matters = _matter_counts(pks)
+    negative = _negative_cash_flow(pks, today)
+    troubled = set(_filter(Loan.objects.filter(status__in=TROUBLED_LOAN_STATUSES).order_by(), pks, "collateral_property_id")
+                   .values_list("collateral_property_id", flat=True))
+
+    scores, current = {}, {}
+    for pk, status, rating, score, factors in rows:
+        current[pk] = (score, factors)
+        found = []
+        if status != "sold":
+            if status == "in_dispute":
+                found.append(("In dispute", WEIGHTS["property_in_dispute"]))
+            if matters.get(pk):
+                n = matters[pk]
+                found.append((f"{n} active legal matter{'s' if n != 1 else ''}",
+                              min(n * WEIGHTS["legal_matter"], WEIGHTS["legal_matter_max"])))
+            if _rating_points(rating):
+                found.append((f"Owner risk rating {rating}", _rating_points(rating)))
+            if pk in negative:
+                found.append(("Negative cash flow", WEIGHTS["negative_cash_flow"]))
+            if pk in troubled:
+                found.append(("Secures a troubled loan", WEIGHTS["secures_troubled_loan"]))
+        scores[pk] = _finish(found)
+    return _write(RealEstate, current, scores)
+
+
+def score_loans(pks=None, today=None):
+    """Re-score the given loans (all when ``pks`` is None)."""
+    today = today or timezone.localdate()
+    rows = list(_filter(Loan.objects.order_by(), pks).values_list(
+        "pk", "status", "next_payment_date", "lender__risk_rating", "collateral_property_id",
+        "collateral_property__status", "risk_score", "risk_factors",
+    ))
+    if not rows:
+        return 0
+    collateral = None if pks is None else {row[4] for row in rows if row[4]}
+    matters = _matter_counts(collateral)
+    negative = _negative_cash_flow(collateral, today)
+
+    scores, current = {}, {}
+    for pk, status, next_payment, rating, collateral_pk, collateral_status, score, factors in rows:
+        current[pk] = (score, factors)
+        found = []
+        if status != "paid_off":
+            if status == "defaulted":
+                found.append(("Defaulted", WEIGHTS["loan_defaulted"]))
+            elif status == "in_dispute":
+                found.append(("In dispute", WEIGHTS["loan_in_dispute"]))
+            if status == "active" and next_payment and next_payment < today:
+                found.append(("Payment overdue", WEIGHTS["payment_overdue"]))
+            if _rating_points(rating):
+                found.append((f"Lender risk rating {rating}", _rating_points(rating)))
+            if collateral_pk and (collateral_status == "in_dispute" or matters.get(collateral_pk)):
+                found.append(("Collateral in dispute", WEIGHTS["collateral_at_risk"]))
+            if collateral_pk in negative:
+                found.append(("Collateral cash flow negative", WEIGHTS["collateral_at_risk"]))
+        scores[pk] = _finish(found)
+    return _write(Loan, current, scores)
+
+
+def rebuild(today=None):
+    """Re-score every property and loan; returns how many rows changed."""
+    with transaction.atomic():
+        return score_properties(today=today) + score_loans(today=today)
+
+
+def _secured_by(property_pks):
+    property_pks = [pk for pk in property_pks if pk]
+    if not property_pks:
+        return []
+    return list(Loan.objects.filter(collateral_property__in=property_pks).values_list("pk", flat=True))
+
+
+def _linked_properties(instance, field):
+    """The property ``instance`` points at now, plus the one it pointed at before this save."""
+    return [pk for pk in {getattr(instance, field), getattr(instance, "_risk_previous", None)} if pk]
+
+
+def _affected(sender, instance):
+    """(property pks, loan pks) whose score may depend on ``instance``."""
+    label = sender._meta.label_lower
+    if label == "assets.realestate":
+        properties = [instance.pk]
+    elif label == "assets.loan":
+        return _linked_properties(instance, PROPERTY_FKS[label]), [instance.pk]
+    elif label == "legal.legalmatter":
+        properties = list(instance.related_properties.values_list("pk", flat=True))
+    elif label == "stakeholders.stakeholder":
+        return (list(RealEstate.objects.filter(stakeholder=instance.pk).values_list("pk", flat=True)),
+                list(Loan.objects.filter(lender=instance.pk).values_list("pk", flat=True)))
+    else:  # cash flow entry
+        properties = _linked_properties(instance, PROPERTY_FKS[label])
+    return properties, _secured_by(properties)
+
+
+def _rescore(properties, loans):
+    if properties:
+        score_properties(properties)
+    if loans:
+        score_loans(loans)
+
+
+def _capture(sender, instance, raw=False, update_fields=None, **kwargs):
+    # The property a loan or cash flow entry is moved away from loses its factors too
+    field = PROPERTY_FKS[sender._meta.label_lower]
+    instance._risk_previous = None
+    if raw or instance.pk is None:
+        return
+    if update_fields is not None and field not in update_fields and field.removesuffix("_id") not in update_fields:
+        return
+    previous = sender.objects.filter(pk=instance.pk).values_list(field, flat=True).first()
+    if previous != getattr(instance, field):
+        instance._risk_previous = previous
+
+
+def _on_save(sender, instance, raw=False, **kwargs):
+    if not raw:
+        _rescore(*_affected(sender, instance))
+        instance._risk_previous = None
+
+
+def _before_delete(sender, instance, **kwargs):
+    # Links (matter properties, lender/owner FKs) are gone by post_delete
+    instance._risk_affected = _affected(sender, instance)
+
+
+def _on_delete(sender, instance, **kwargs):
+    _rescore(*getattr(instance, "_risk_affected", ([], [])))
+
+
+def _on_matter_properties(sender, instance, action, reverse, pk_set, **kwargs):
+    if action == "pre_clear":
+        instance._risk_cleared = (
+            [instance.pk] if reverse else list(instance.related_properties.values_list("pk", flat=True))
+        )
+        return
+    if action == "post_clear":
+        properties = getattr(instance, "_risk_cleared", [])
+    elif action in ("post_add", "post_remove"):
+        properties = [instance.pk] if reverse else list(pk_set)
+    else:
+        return
+    _rescore(properties, _secured_by(properties))
+
+
+def connect_signals():
+    from django.apps import apps
+    from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete, pre_save
+
+    for label in [*LABELS, "stakeholders.stakeholder"]:
+        model = apps.get_model(label)
+        post_save.connect(_on_save, sender=model, dispatch_uid=f"risk.save.{label}")
+        pre_delete.connect(_before_delete, sender=model, dispatch_uid=f"risk.before_delete.{label}")
+        post_delete.connect(_on_delete, sender=model, dispatch_uid=f"risk.delete.{label}")
+        if label in PROPERTY_FKS:
+            pre_save.connect(_capture, sender=model, dispatch_uid=f"risk.capture.{label}")
+    through = apps.get_model("legal.legalmatter").related_properties.through
+    m2m_changed.connect(_on_matter_properties, sender=through, dispatch_uid="risk.matter_properties")
@@ -1,11 +1,15 @@
+from datetime import date
 from decimal import Decimal
 
 from django.test import TestCase
 from django.urls import reverse
 
+from blaine.testing import QueryGuardMixin
 from stakeholders.models import Stakeholder
 
-from .models import Investment, Loan, RealEstate
+from .amortization import add_months, amortize
+from .payments import post_due_payments
+from .models import Investment, Loan, RealEstate, ValueChange
 
 
 class RealEstateModelTests(TestCase):
@@ -161,6 +165,18 @@ class AssetViewTests(TestCase):
         resp = self.client.get(reverse("assets:realestate_export_pdf", args=[self.prop.pk]))
         self.assertEqual(resp["Content-Type"], "application/pdf")
 
+    def test_realestate_pdf_query_count(self):
+        from cashflow.models import CashFlowEntry
+        self.prop.stakeholder = Stakeholder.objects.create(name="Owner")
+        self.prop.save()
+        for i in range(3):
+            CashFlowEntry.objects.create(description=f"Rent {i}", amount=Decimal("100"), entry_type="inflow",
+                                         date="2025-01-01", related_property=self.prop)
+        # property with stakeholder joined + cash flow entries
+        with self.assertNumQueries(2):
+            resp = self.client.get(reverse("assets:realestate_export_pdf", args=[self.prop.pk]))
+        self.assertEqual(resp["Content-Type"], "application/pdf")
+
     # --- Investments ---
     def test_investment_list(self):
         resp = self.client.get(reverse("assets:investment_list"))
@@ -190,6 +206,13 @@ class AssetViewTests(TestCase):
         resp = self.client.get(reverse("assets:investment_export_pdf", args=[self.inv.pk]))
         self.assertEqual(resp["Content-Type"], "application/pdf")
 
+    def test_investment_pdf_query_count(self):
+        self.inv.stakeholder = Stakeholder.objects.create(name="Advisor")
+        self.inv.save()
+        with self.assertNumQueries(1):
+            resp = self.client.get(reverse("assets:investment_export_pdf", args=[self.inv.pk]))
+        self.assertEqual(resp["Content-Type"], "application/pdf")
+
     # --- Loans ---
     def test_loan_list(self):
         resp = self.client.get(reverse("assets:loan_list"))
@@ -219,3 +242,366 @@ class AssetViewTests(TestCase):
     def test_loan_pdf(self):
         resp = self.client.get(reverse("assets:loan_export_pdf", args=[self.loan.pk]))
         self.assertEqual(resp["Content-Type"], "application/pdf")
+
+    def test_loan_pdf_query_count(self):
+        from cashflow.models import CashFlowEntry
+        self.loan.lender = Stakeholder.objects.create(name="Lender", entity_type="lender")
+        self.loan.save()
+        for i in range(3):
+            CashFlowEntry.objects.create(description=f"Payment {i}", amount=Decimal("100"), entry_type="outflow",
+                                         date="2025-01-01", related_loan=self.loan)
+        # loan with lender joined + cash flow entries
+        with self.assertNumQueries(2):
+            resp = self.client.get(reverse("assets:loan_export_pdf", args=[self.loan.pk]))
+        self.assertEqual(resp["Content-Type"], "application/pdf")
+
+
+class ValueChangeTests(TestCase):
+    def test_update_view_logs_changed_fields(self):
+        prop = RealEstate.objects.create(name="P", address="1 Main", estimated_value=Decimal("500000.00"))
+        self.assertFalse(ValueChange.objects.exists())  # creation is not logged
+        resp = self.client.post(reverse("assets:realestate_edit", args=[prop.pk]), {
+            "name": "P renamed", "address": "1 Main", "estimated_value": "550000", "status": "in_dispute",
+        })
+        self.assertEqual(resp.status_code, 302)
+        self.assertEqual(
+            sorted(ValueChange.objects.values_list("kind", "object_id", "field", "old_value", "new_value")),
+            [("property", prop.pk, "estimated_value", "500000.00", "550000.00"),
+             ("property", prop.pk, "status", "owned", "in_dispute")],
+        )
+
+    def test_unchanged_and_partial_saves(self):
+        loan = Loan.objects.create(name="L", current_balance=Decimal("1000.00"), interest_rate=Decimal("5.000"))
+        loan.current_balance = 1000  # same value, different type
+        loan.save()
+        loan.interest_rate = Decimal("4.5")
+        loan.current_balance = Decimal("900")
+        loan.save(update_fields=["interest_rate"])
+        change = ValueChange.objects.get()
+        self.assertEqual((change.field, change.old_value, change.new_value), ("interest_rate", "5.000", "4.500"))
+
+    def test_history_panel_paginates(self):
+        inv = Investment.objects.create(name="I", current_value=Decimal("0"))
+        for value in range(1, 46):
+            inv.current_value = Decimal(value)
+            inv.save()
+        url = reverse("assets:investment_history", args=[inv.pk])
+        with self.assertNumQueries(2):  # count + one page
+            resp = self.client.get(url)
+        self.assertEqual(len(resp.context["rows"]), 20)
+        self.assertContains(resp, "$45.00")  # newest first
+        self.assertContains(resp, f"{url}?page=2")
+        resp = self.client.get(url, {"page": 3})
+        self.assertEqual(len(resp.context["rows"]), 5)
+        self.assertContains(resp, "$0.00")
+        self.assertContains(self.client.get(reverse("assets:investment_detail", args=[inv.pk])), url)
+
+
+class AmortizationTests(TestCase):
+    def _loan(self, pk, balance, rate, payment=None, **kwargs):
+        return Loan(pk=pk, name=f"L{pk}", status="active", current_balance=Decimal(balance),
+                    interest_rate=Decimal(rate), monthly_payment=payment and Decimal(payment),
+                    next_payment_date=kwargs.pop("first", date(2026, 11, 1)), **kwargs)
+
+    def test_schedules(self):
+        mortgage = self._loan(1, "300000", "6", "1798.65")
+        interest_free = self._loan(2, "12000", "0", "1000", first=date(2026, 1, 31))
+        underwater = self._loan(3, "100000", "12", "500")
+        by_maturity = self._loan(4, "100000", "6", maturity_date=date(2036, 10, 1))
+        schedules = amortize([mortgage, interest_free, underwater, by_maturity], today=date(2026, 10, 19))
+
+        s = schedules[1]
+        # 30-year fixed at 6%: the rounded payment leaves a few cents for a 361st payment
+        self.assertEqual(s["months"], 361)
+        self.assertAlmostEqual(s["total_interest"], 347515.59, places=1)
+        self.assertAlmostEqual(s["interest"][0], 1500.00, places=2)
+        self.assertAlmostEqual(s["principal"][0], 298.65, places=2)
+        self.assertAlmostEqual(s["balance"][-1], 0, places=2)
+        self.assertEqual(s["payoff_date"], date(2056, 11, 1))
+
+        self.assertEqual((schedules[2]["months"], schedules[2]["total_interest"]), (12, 0))
+        self.assertEqual(schedules[2]["payoff_date"], date(2026, 12, 31))
+        self.assertFalse(schedules[3]["paid_off"])
+        self.assertIsNone(schedules[3]["payoff_date"])
+        self.assertEqual((schedules[4]["months"], schedules[4]["payoff_date"]), (120, date(2036, 10, 1)))
+
+        # Computing loans together gives the same result as one at a time
+        alone = amortize([by_maturity], today=date(2026, 10, 19))[4]
+        self.assertEqual(alone["months"], schedules[4]["months"])
+        self.assertAlmostEqual(alone["total_interest"], schedules[4]["total_interest"], places=6)
+
+    def test_extra_payments(self):
+        mortgage = self._loan(1, "300000", "6", "1798.65")
+        base = amortize([mortgage])[1]
+        extra = amortize([mortgage], extra_monthly=200)[1]
+        lump = amortize([mortgage], lump_sum=300000)[1]
+        self.assertLess(extra["months"], base["months"])
+        self.assertLess(extra["total_interest"], base["total_interest"])
+        self.assertEqual(lump["months"], 0)
+
+    def test_unschedulable(self):
+        self.assertEqual(amortize([self._loan(1, "1000", "5"), self._loan(2, "0", "5", "100")]), {})
+
+    def test_add_months(self):
+        self.assertEqual(add_months(date(2026, 1, 31), 1), date(2026, 2, 28))
+        self.assertEqual(add_months(date(2026, 12, 15), 1), date(2027, 1, 15))
+
+    def test_amortization_partial(self):
+        loan = Loan.objects.create(name="M", status="active", current_balance=Decimal("10000"),
+                                   interest_rate=Decimal("6"), monthly_payment=Decimal("500"))
+        url = reverse("assets:loan_amortization", args=[loan.pk])
+        resp = self.client.get(url)
+        months = resp.context["schedule"]["months"]
+        self.assertEqual(months, len(resp.context["rows"]))
+        resp = self.client.get(url, {"extra_monthly": "500", "lump_sum": "junk"})
+        self.assertGreater(resp.context["months_saved"], 0)
+        self.assertGreater(resp.context["interest_saved"], 0)
+        self.assertContains(self.client.get(reverse("assets:loan_detail", args=[loan.pk])), url)
+
+        # The cached schedule is keyed on updated_at, so an edit shows at once
+        loan.current_balance = Decimal("20000")
+        loan.save()
+        self.assertGreater(self.client.get(url).context["schedule"]["months"], months)
+
+
+class LoanPaymentTests(TestCase):
+    def test_posts_overdue_payments(self):
+        from cashflow.models import CashFlowEntry
+        from dashboard.models import Deadline
+
+        lender = Stakeholder.objects.create(name="Bank", entity_type="firm")
+        loan = Loan.objects.create(name="M", lender=lender, current_balance=Decimal("10000.00"),
+                                   interest_rate=Decimal("6"), monthly_payment=Decimal("500.00"),
+                                   next_payment_date=date(2026, 8, 31))
+        flat = Loan.objects.create(name="Flat", monthly_payment=Decimal("100.00"),
+                                   next_payment_date=date(2026, 10, 19))
+        today = date(2026, 10, 19)
+        post_due_payments(today)
+
+        entries = list(CashFlowEntry.objects.filter(related_loan=loan).order_by("date"))
+        self.assertEqual([e.date for e in entries], [date(2026, 8, 31), date(2026, 9, 30)])
+        self.assertEqual([e.amount for e in entries], [Decimal("500.00")] * 2)
+        self.assertEqual(entries[0].related_stakeholder, lender)
+        self.assertFalse(entries[0].is_projected)
+        loan.refresh_from_db()
+        # 50.00 then 47.75 interest at 0.5% a month
+        self.assertEqual(loan.current_balance, Decimal("9097.75"))
+        self.assertEqual(loan.next_payment_date, date(2026, 10, 31))
+        self.assertEqual(Deadline.objects.get(kind="payment", object_id=loan.pk).date, date(2026, 10, 31))
+        self.assertTrue(ValueChange.objects.filter(kind="loan", object_id=loan.pk,
+                                                   field="current_balance", new_value="9097.75").exists())
+        # Due today isn't posted yet
+        flat.refresh_from_db()
+        self.assertEqual(flat.next_payment_date, today)
+
+        # Re-running, even with the date moved back by hand, posts nothing twice
+        post_due_payments(today)
+        Loan.objects.filter(pk=loan.pk).update(next_payment_date=date(2026, 8, 31))
+        post_due_payments(today)
+        self.assertEqual(CashFlowEntry.objects.filter(related_loan=loan).count(), 2)
+        loan.refresh_from_db()
+        self.assertEqual((loan.current_balance, loan.next_payment_date), (Decimal("9097.75"), date(2026, 10, 31)))
+
+        post_due_payments(date(2026, 10, 20))
+        self.assertEqual(CashFlowEntry.objects.get(related_loan=flat).amount, Decimal("100.00"))
+
+    def test_skipped_dates_leave_the_schedule_alone(self):
+        from cashflow.models import CashFlowEntry
+
+        loan = Loan.objects.create(name="M", current_balance=Decimal("10000.00"), interest_rate=Decimal("6"),
+                                   monthly_payment=Decimal("500.00"), next_payment_date=date(2026, 8, 31))
+        post_due_payments(date(2026, 10, 19))
+        Loan.objects.filter(pk=loan.pk).update(next_payment_date=date(2026, 8, 31))
+        # Aug and Sep are already posted; Oct is split from the current balance
+        self.assertEqual(post_due_payments(date(2026, 11, 1)), "Posted 1 loan payment(s) across 1 loan(s).")
+        loan.refresh_from_db()
+        # 9097.75 less (500 - 45.49 interest)
+        self.assertEqual(loan.current_balance, Decimal("8643.24"))
+        self.assertEqual(loan.next_payment_date, date(2026, 11, 30))
+        self.assertEqual(CashFlowEntry.objects.filter(related_loan=loan).count(), 3)
+
+    def test_final_payment_pays_off(self):
+        from cashflow.models import CashFlowEntry
+
+        loan = Loan.objects.create(name="Car", current_balance=Decimal("250.00"), interest_rate=Decimal("0"),
+                                   monthly_payment=Decimal("200.00"), next_payment_date=date(2026, 1, 1))
+        post_due_payments(date(2026, 10, 19))
+        loan.refresh_from_db()
+        self.assertEqual((loan.status, loan.current_balance), ("paid_off", Decimal("0")))
+        amounts = CashFlowEntry.objects.filter(related_loan=loan).order_by("date").values_list("amount", flat=True)
+        self.assertEqual(list(amounts), [Decimal("200.00"), Decimal("50.00")])
+
+
+class ExposureTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.bank = Stakeholder.objects.create(name="Bank", entity_type="firm")
+        cls.owner = Stakeholder.objects.create(name="Owner", entity_type="contact")
+        austin = RealEstate.objects.create(name="A", address="x", jurisdiction="Travis", property_type="Duplex",
+                                           estimated_value=Decimal("400000"), stakeholder=cls.owner)
+        RealEstate.objects.create(name="B", address="x", jurisdiction="Travis", estimated_value=Decimal("200000"))
+        RealEstate.objects.create(name="C", address="x", jurisdiction="Harris", estimated_value=Decimal("200000"))
+        RealEstate.objects.create(name="Sold", address="x", jurisdiction="Harris", status="sold",
+                                  estimated_value=Decimal("900000"))
+        Loan.objects.create(name="M", lender=cls.bank, current_balance=Decimal("300000"), collateral_property=austin)
+        Loan.objects.create(name="Card", lender=cls.bank, current_balance=Decimal("100000"))
+        Loan.objects.create(name="Old", lender=cls.bank, current_balance=Decimal("50000"), status="paid_off")
+        Investment.objects.create(name="Fund", institution="Vanguard", current_value=Decimal("90000"))
+        Investment.objects.create(name="ETF", institution="Vanguard", current_value=Decimal("10000"),
+                                  stakeholder=cls.owner)
+
+    def test_dimensions(self):
+        from .exposure import by_institution, by_jurisdiction, by_lender, by_stakeholder
+
+        with self.assertNumQueries(2):
+            summary = by_jurisdiction()
+        travis, harris = summary["rows"]
+        self.assertEqual((travis["label"], travis["count"], travis["value"]), ("Travis", 2, Decimal("600000")))
+        self.assertEqual((travis["share"], travis["debt"], travis["ltv"]), (75.0, Decimal("300000"), 75.0))
+        self.assertIsNone(harris["ltv"])
+        self.assertEqual(summary["hhi"], 6250)  # 75² + 25²
+        self.assertEqual(summary["level"], "high")
+
+        (lender,) = by_lender()["rows"]
+        self.assertEqual((lender["label"], lender["count"], lender["value"]), ("Bank", 2, Decimal("400000")))
+        self.assertEqual(lender["ltv"], 75.0)  # only the secured 300k against the 400k property
+
+        self.assertEqual(by_institution()["rows"][0]["value"], Decimal("100000"))
+        rows = by_stakeholder()["rows"]
+        self.assertEqual([row["label"] for row in rows], ["Owner", "Bank"])
+        self.assertEqual((rows[0]["properties"], rows[0]["investments"], rows[0]["count"]),
+                         (Decimal("400000"), Decimal("10000"), 2))
+
+    def test_lender_ltv_counts_each_property_once(self):
+        from .exposure import by_lender
+
+        austin = RealEstate.objects.get(name="A")
+        sold = RealEstate.objects.get(name="Sold")
+        # A second loan on the same property, and one against a sold property
+        Loan.objects.create(name="HELOC", lender=self.bank, current_balance=Decimal("60000"), collateral_property=austin)
+        Loan.objects.create(name="Stale", lender=self.bank, current_balance=Decimal("10000"), collateral_property=sold)
+        (lender,) = by_lender()["rows"]
+        self.assertEqual(lender["debt"], Decimal("360000"))
+        self.assertEqual(lender["ltv"], 90.0)  # 360k against the 400k property, counted once
+
+    def test_top_n_folds_the_rest(self):
+        from . import exposure
+
+        for i in range(exposure.TOP_N + 3):
+            Investment.objects.create(name=f"I{i}", institution=f"Inst {i}", current_value=Decimal(1000 + i))
+        summary = exposure.by_institution()
+        self.assertEqual(len(summary["rows"]), exposure.TOP_N + 1)
+        self.assertEqual(summary["rows"][-1]["label"], "4 others")
+        self.assertEqual(summary["groups"], exposure.TOP_N + 4)
+
+    def test_views(self):
+        self.assertContains(self.client.get(reverse("assets:exposure")),
+                            reverse("assets:exposure_dimension", args=["lender"]))
+        url = reverse("assets:exposure_dimension", args=["jurisdiction"])
+        resp = self.client.get(url)
+        self.assertContains(resp, "Travis")
+        self.assertContains(resp, "75.0%")
+        self.assertEqual(self.client.get(reverse("assets:exposure_dimension", args=["nope"])).status_code, 404)
+
+
+class RiskScoreTests(TestCase):
+    def _score(self, obj):
+        obj.refresh_from_db()
+        return obj.risk_score, obj.risk_factors
+
+    def test_scores_follow_their_inputs(self):
+        from cashflow.models import CashFlowEntry
+        from legal.models import LegalMatter
+
+        owner = Stakeholder.objects.create(name="Owner", entity_type="contact", risk_rating=1)
+        prop = RealEstate.objects.create(name="P", address="x", stakeholder=owner)
+        loan = Loan.objects.create(name="L", collateral_property=prop, next_payment_date=date(2026, 11, 1))
+        self.assertEqual(self._score(prop), (0, []))
+
+        matter = LegalMatter.objects.create(title="Suit")
+        matter.related_properties.add(prop)
+        self.assertEqual(self._score(prop), (20, ["1 active legal matter"]))
+        self.assertEqual(self._score(loan), (15, ["Collateral in dispute"]))
+
+        owner.risk_rating = 5
+        owner.save()
+        CashFlowEntry.objects.create(description="Repair", amount=Decimal("900"), entry_type="outflow",
+                                     date=date.today(), related_property=prop)
+        self.assertEqual(self._score(prop)[0], 20 + 20 + 15)
+
+        loan.status = "defaulted"
+        loan.save()
+        self.assertIn("Secures a troubled loan", self._score(prop)[1])
+        self.assertEqual(self._score(loan)[1], ["Defaulted", "Collateral in dispute", "Collateral cash flow negative"])
+
+        matter.status = "closed"
+        matter.save()
+        self.assertNotIn("1 active legal matter", self._score(prop)[1])
+        matter.status = "active"
+        matter.save()
+        matter.delete()
+        self.assertNotIn("1 active legal matter", self._score(prop)[1])
+
+        prop.status = "in_dispute"
+        prop.save()
+        self.assertEqual(self._score(prop)[0], 40 + 20 + 15 + 20)
+
+    def test_moving_a_link_rescores_the_old_property(self):
+        from cashflow.models import CashFlowEntry
+
+        old = RealEstate.objects.create(name="Old", address="x")
+        new = RealEstate.objects.create(name="New", address="y")
+        loan = Loan.objects.create(name="L", collateral_property=old, status="defaulted")
+        self.assertEqual(self._score(old), (20, ["Secures a troubled loan"]))
+
+        loan.collateral_property = new
+        loan.save()
+        self.assertEqual(self._score(old), (0, []))
+        self.assertEqual(self._score(new), (20, ["Secures a troubled loan"]))
+        loan.collateral_property = None
+        loan.save(update_fields=["collateral_property"])
+        self.assertEqual(self._score(new), (0, []))
+
+        entry = CashFlowEntry.objects.create(description="Repair", amount=Decimal("900"), entry_type="outflow",
+                                             date=date.today(), related_property=old)
+        self.assertEqual(self._score(old), (15, ["Negative cash flow"]))
+        entry.related_property = new
+        entry.save()
+        self.assertEqual(self._score(old), (0, []))
+        self.assertEqual(self._score(new), (15, ["Negative cash flow"]))
+
+    def test_overdue_payments_and_sorting(self):
+        from . import risk
+
+        overdue = Loan.objects.create(name="Late", next_payment_date=date(2026, 10, 1))
+        Loan.objects.create(name="Fine", next_payment_date=date(2026, 11, 1))
+        risk.rebuild(today=date(2026, 10, 19))
+        self.assertEqual(self._score(overdue), (25, ["Payment overdue"]))
+        resp = self.client.get(reverse("assets:loan_list"), {"sort": "risk_score"})
+        self.assertEqual([loan.name for loan in resp.context["loans"]], ["Late", "Fine"])
+        # Unchanged scores aren't rewritten: reads only, no UPDATE
+        with self.assertNumQueries(6):
+            risk.rebuild(today=date(2026, 10, 19))
+
+
+class LoanQueryGuardTests(QueryGuardMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        for i in range(8):
+            lender = Stakeholder.objects.create(name=f"Guard Lender {i}", entity_type="firm")
+            cls.loan = Loan.objects.create(name=f"Guard Loan {i}", lender=lender)
+
+    def test_list_no_n_plus_one(self):
+        with self.assertNoNPlusOne():
+            resp = self.client.get(reverse("assets:loan_list"))
+        self.assertContains(resp, "Guard Lender 7")
+
+    def test_list_partial_no_n_plus_one(self):
+        with self.assertNoNPlusOne():
+            resp = self.client.get(reverse("assets:loan_list"), {"q": "Guard"}, HTTP_HX_REQUEST="true")
+        self.assertContains(resp, "Guard Lender 7")
+
+    def test_detail_no_n_plus_one(self):
+        with self.assertNoNPlusOne():
+            resp = self.client.get(reverse("assets:loan_detail", args=[self.loan.pk]))
+        self.assertEqual(resp.status_code, 200)
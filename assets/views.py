@@ -1,4 +1,7 @@
+from decimal import Decimal, InvalidOperation
+
 from django.contrib import messages
+from django.http import Http404
 from django.shortcuts import get_object_or_404, redirect, render
 from django.urls import reverse_lazy
 from django.views.generic import CreateView, DeleteView, DetailView, ListView, UpdateView
@@ -47,9 +50,24 @@ def export_loan_csv(request):
     return do_export(qs, fields, "loans")
 
 
+REALESTATE_PDF_PLAN = {
+    "select_related": ["stakeholder"],
+    "prefetch_related": ["cash_flow_entries"],
+}
+
+INVESTMENT_PDF_PLAN = {
+    "select_related": ["stakeholder"],
+}
+
+LOAN_PDF_PLAN = {
+    "select_related": ["lender"],
+    "prefetch_related": ["cash_flow_entries"],
+}
+
+
 def export_pdf_realestate_detail(request, pk):
-    from blaine.pdf_export import render_pdf
-    p = get_object_or_404(RealEstate, pk=pk)
+    from blaine.pdf_export import get_pdf_object, render_pdf
+    p = get_pdf_object(RealEstate, pk, REALESTATE_PDF_PLAN)
     sections = [
         {"heading": "Property Information", "type": "info", "rows": [
             ("Address", p.address),
@@ -70,12 +88,12 @@ def export_pdf_realestate_detail(request, pk):
                          "rows": [[e.date.strftime("%b %d, %Y"), e.description, e.get_entry_type_display(),
                                    f"{'+'if e.entry_type == 'inflow' else '-'}${e.amount:,.0f}"] for e in entries]})
     return render_pdf(request, f"property-{p.pk}", p.name,
-                      f"Real Estate — {p.get_status_display()}", sections)
+                      f"Real Estate — {p.get_status_display()}", sections, cache_for=p)
 
 
 def export_pdf_investment_detail(request, pk):
-    from blaine.pdf_export import render_pdf
-    inv = get_object_or_404(Investment, pk=pk)
+    from blaine.pdf_export import get_pdf_object, render_pdf
+    inv = get_pdf_object(Investment, pk, INVESTMENT_PDF_PLAN)
     sections = [
         {"heading": "Investment Information", "type": "info", "rows": [
             ("Type", inv.investment_type or "N/A"),
@@ -87,12 +105,12 @@ def export_pdf_investment_detail(request, pk):
         sections[0]["rows"].append(("Stakeholder", inv.stakeholder.name))
     if inv.notes_text:
         sections.append({"heading": "Notes", "type": "text", "content": inv.notes_text})
-    return render_pdf(request, f"investment-{inv.pk}", inv.name, "Investment", sections)
+    return render_pdf(request, f"investment-{inv.pk}", inv.name, "Investment", sections, cache_for=inv)
 
 
 def export_pdf_loan_detail(request, pk):
-    from blaine.pdf_export import render_pdf
-    loan = get_object_or_404(Loan, pk=pk)
+    from blaine.pdf_export import get_pdf_object, render_pdf
+    loan = get_pdf_object(Loan, pk, LOAN_PDF_PLAN)
     sections = [
         {"heading": "Loan Information", "type": "info", "rows": [
             ("Original Amount", f"${loan.original_amount:,.0f}" if loan.original_amount else "N/A"),
@@ -118,7 +136,7 @@ def export_pdf_loan_detail(request, pk):
                          "rows": [[e.date.strftime("%b %d, %Y"), e.description, e.get_entry_type_display(),
                                    f"{'+'if e.entry_type == 'inflow' else '-'}${e.amount:,.0f}"] for e in entries]})
     return render_pdf(request, f"loan-{loan.pk}", loan.name,
-                      f"Loan — {loan.get_status_display()}", sections)
+                      f"Loan — {loan.get_status_display()}", sections, cache_for=loan)
 
 
 # --- Real Estate ---
@@ -142,7 +160,7 @@ class RealEstateListView(ListView):
         date_to = self.request.GET.get("date_to")
         if date_to:
             qs = qs.filter(acquisition_date__lte=date_to)
-        ALLOWED_SORTS = {"name", "status", "estimated_value", "acquisition_date"}
+        ALLOWED_SORTS = {"name", "status", "estimated_value", "acquisition_date", "risk_score"}
         sort = self.request.GET.get("sort", "")
         if sort in ALLOWED_SORTS:
             direction = "" if self.request.GET.get("dir") == "asc" else "-"
@@ -212,6 +230,21 @@ class RealEstateDeleteView(DeleteView):
         return super().form_valid(form)
 
 
+def value_history(request, kind, pk):
+    """HTMX partial: paginated field change log for one property, investment or loan."""
+    from django.core.paginator import Paginator
+
+    from .changes import TRACKED, describe, history
+
+    model = next(m for m, (k, _fields) in TRACKED.items() if k == kind)
+    page = Paginator(history(kind, pk), 20).get_page(request.GET.get("page"))
+    return render(request, "assets/partials/_value_history.html", {
+        "page_obj": page,
+        "rows": describe(model, page.object_list),
+        "history_url": request.path,
+    })
+
+
 # --- Investments ---
 class InvestmentListView(ListView):
     model = Investment
@@ -288,7 +321,7 @@ class LoanListView(ListView):
     paginate_by = 25
 
     def get_queryset(self):
-        qs = super().get_queryset()
+        qs = super().get_queryset().select_related("lender")
         q = self.request.GET.get("q", "").strip()
         if q:
             qs = qs.filter(name__icontains=q)
@@ -301,7 +334,7 @@ class LoanListView(ListView):
         date_to = self.request.GET.get("date_to")
         if date_to:
             qs = qs.filter(next_payment_date__lte=date_to)
-        ALLOWED_SORTS = {"name", "status", "current_balance", "next_payment_date"}
+        ALLOWED_SORTS = {"name", "status", "current_balance", "next_payment_date", "risk_score"}
         sort = self.request.GET.get("sort", "")
         if sort in ALLOWED_SORTS:
             direction = "" if self.request.GET.get("dir") == "asc" else "-"
@@ -367,6 +400,59 @@ class LoanDeleteView(DeleteView):
         return super().form_valid(form)
 
 
+def exposure(request):
+    """Exposure analytics page; each dimension loads as its own partial."""
+    from .exposure import DIMENSIONS
+
+    return render(request, "assets/exposure.html", {
+        "dimensions": [(name, label) for name, (label, _compute, _models) in DIMENSIONS.items()],
+    })
+
+
+def exposure_dimension(request, dimension):
+    """HTMX partial: one dimension's exposure table and concentration figures."""
+    from .exposure import DIMENSIONS, exposure as compute_exposure
+
+    if dimension not in DIMENSIONS:
+        raise Http404
+    return render(request, "assets/partials/_exposure.html", {
+        "dimension": dimension,
+        "label": DIMENSIONS[dimension][0],
+        "summary": compute_exposure(dimension),
+    })
+
+
+def _amount(value):
+    try:
+        amount = Decimal(value)
+    except (InvalidOperation, TypeError):
+        return 0
+    return amount if amount.is_finite() and amount > 0 else 0
+
+
+def loan_amortization(request, pk):
+    """HTMX partial: a loan's amortization schedule, with an optional extra-payment scenario."""
+    from .amortization import loan_schedule, schedule_rows
+
+    loan = get_object_or_404(Loan, pk=pk)
+    extra_monthly = _amount(request.GET.get("extra_monthly"))
+    lump_sum = _amount(request.GET.get("lump_sum"))
+    schedule = loan_schedule(loan)
+    scenario = loan_schedule(loan, extra_monthly, lump_sum) if schedule and (extra_monthly or lump_sum) else None
+    ctx = {
+        "loan": loan,
+        "schedule": schedule,
+        "scenario": scenario,
+        "extra_monthly": extra_monthly,
+        "lump_sum": lump_sum,
+        "rows": schedule_rows(scenario or schedule) if schedule else [],
+    }
+    if scenario:
+        ctx["interest_saved"] = schedule["total_interest"] - scenario["total_interest"]
+        ctx["months_saved"] = schedule["months"] - scenario["months"]
+    return render(request, "assets/partials/_amortization.html", ctx)
+
+
 def bulk_delete_realestate(request):
     if request.method == "POST":
         pks = request.POST.getlist("selected")
@@ -2,6 +2,7 @@
 ASGI config for blaine project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
+Served by uvicorn when the container runs with SERVER_MODE=asgi.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/6.0/howto/deployment/asgi/
@@ -0,0 +1,102 @@
+"""Versioned caching keyed by per-model change counters.
+
+Every model in the project apps has a version counter in the cache that
+post_save / post_delete / m2m_changed bump. ``cached()`` stores a computed
+value under a key built from the versions of the models it reads, so any
+write to one of those models makes the next read miss: invalidation is
+exact instead of waiting out a timeout.
+
+Writes inside a transaction bump again on commit, so a reader that rebuilt
+a value from the pre-commit data in between doesn't keep it. Values are
+never cached while the current connection is itself in a transaction
+(they could include rows that get rolled back).
+
+The counters only stay exact if every writing process shares the cache:
+the default file backend does on one host, redis across hosts; locmem is
+per process (see CACHE_BACKEND in settings).
+"""
+import hashlib
+import time
+
+from django.core.cache import cache
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
+from django.db import connection, transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
+
+TRACKED_APPS = {"stakeholders", "assets", "legal", "tasks", "cashflow", "notes", "dashboard"}
+
+_MISSING = object()
+
+
+def _version_key(label):
+    return f"model-version:{label}"
+
+
+def _label(model):
+    return model if isinstance(model, str) else model._meta.label_lower
+
+
+def model_versions(*models):
+    """Current version of each model, starting fresh counters where none exist."""
+    keys = {_version_key(_label(m)): _label(m) for m in models}
+    found = cache.get_many(keys)
+    for key in keys.keys() - found.keys():
+        # A clock-based start, so counters lost with the cache never repeat old keys
+        cache.add(key, time.time_ns(), timeout=None)
+        found[key] = cache.get(key)
+    return [found[key] for key in keys]
+
+
+def bump_version(model):
+    key = _version_key(_label(model))
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, time.time_ns(), timeout=None)
+
+
+def mark_changed(model):
+    """Invalidate cached values that read ``model``; for writes that bypass signals (update(), bulk_create())."""
+    bump_version(model)
+    if connection.in_atomic_block:
+        transaction.on_commit(lambda: bump_version(model))
+
+
+def _on_change(sender, **kwargs):
+    if sender._meta.app_label in TRACKED_APPS:
+        mark_changed(sender)
+
+
+def _on_m2m_change(sender, instance, action, model, **kwargs):
+    if action.startswith("post_"):
+        for changed in (type(instance), model):
+            if changed._meta.app_label in TRACKED_APPS:
+                mark_changed(changed)
+
+
+def connect_signals():
+    post_save.connect(_on_change, dispatch_uid="blaine.cache.post_save")
+    post_delete.connect(_on_change, dispatch_uid="blaine.cache.post_delete")
+    m2m_changed.connect(_on_m2m_change, dispatch_uid="blaine.cache.m2m_changed")
+
+
+def versioned_key(name, models, vary=()):
+    digest = hashlib.sha256(repr((model_versions(*models), [str(part) for part in vary])).encode())
+    return f"{name}:{digest.hexdigest()[:24]}"
+
+
+def cached(name, models, compute, vary=(), timeout=DEFAULT_TIMEOUT):
+    """Return ``compute()``, cached until any of ``models`` changes.
+
+    ``vary`` holds the other inputs of the computation (today's date, a pk…).
+    ``timeout`` defaults to the backend's TIMEOUT (CACHE_TIMEOUT), which
+    bounds staleness when counters are per process.
+    """
+    if connection.in_atomic_block:
+        return compute()
+    key = versioned_key(name, models, vary)
+    value = cache.get(key, _MISSING)
+    if value is _MISSING:
+        value = compute()
+        cache.set(key, value, timeout)
+    return value
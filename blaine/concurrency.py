@@ -0,0 +1,56 @@
+"""Concurrent ORM work for async views.
+
+``gather_queries`` runs independent queries at the same time, each on a
+worker thread with its own database connection (SQLite in WAL mode allows
+concurrent readers). QuerySets are evaluated in place, so callers and
+templates get the same QuerySet objects back with their result cache
+filled, and ``.exists()``/iteration/``|length`` issue no further queries.
+
+Execute wrappers installed by the request's middleware (QueryRecorder,
+profiling) are carried over to the worker connections so query counts and
+DB timings still cover the whole request.
+"""
+import asyncio
+from contextlib import ExitStack
+
+from asgiref.sync import sync_to_async
+from django.db import close_old_connections, connection, connections
+from django.db.models import QuerySet
+
+
+def _evaluate(item):
+    if isinstance(item, QuerySet):
+        len(item)  # fills the result cache
+        return item
+    return item()
+
+
+def _evaluate_off_thread(item, wrappers):
+    try:
+        with ExitStack() as stack:
+            for alias, funcs in wrappers.items():
+                for func in funcs:
+                    stack.enter_context(connections[alias].execute_wrapper(func))
+            return _evaluate(item)
+    finally:
+        close_old_connections()
+
+
+def _caller_state():
+    wrappers = {conn.alias: list(conn.execute_wrappers) for conn in connections.all()}
+    return connection.in_atomic_block, wrappers
+
+
+async def gather_queries(*items):
+    """Evaluate QuerySets / call zero-argument callables concurrently; results in order.
+
+    When the caller's connection is inside a transaction (TestCase,
+    ATOMIC_REQUESTS, an outer atomic block) other connections can't see its
+    uncommitted rows, so the work runs sequentially on that connection instead.
+    """
+    in_transaction, wrappers = await sync_to_async(_caller_state)()
+    if in_transaction:
+        return [await sync_to_async(_evaluate)(item) for item in items]
+    return await asyncio.gather(*(
+        sync_to_async(_evaluate_off_thread, thread_sensitive=False)(item, wrappers) for item in items
+    ))
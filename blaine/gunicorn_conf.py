@@ -0,0 +1,83 @@
+"""Gunicorn settings for the container (``gunicorn -c python:blaine.gunicorn_conf``).
+
+gthread workers, so one slow request (PDF export, SMTP test) ties up a
+thread rather than a whole worker. The worker count follows the CPUs
+available to the container (cgroup quota or affinity) and is capped by its
+memory limit; each value can be overridden with a GUNICORN_* variable.
+The app is preloaded in the master so workers share its memory
+copy-on-write, and workers are recycled after max_requests (with jitter so
+they don't all restart at once).
+"""
+import math
+import os
+
+
+def _env_int(name, default):
+    value = os.environ.get(name)
+    return int(value) if value else default
+
+
+def cpu_count():
+    """CPUs this process may use, honouring a cgroup v2 CPU quota."""
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:
+        cpus = os.cpu_count() or 1
+    try:
+        with open("/sys/fs/cgroup/cpu.max") as fh:
+            quota, period = fh.read().split()
+        if quota != "max":
+            cpus = min(cpus, max(1, math.ceil(int(quota) / int(period))))
+    except (OSError, ValueError):
+        pass
+    return cpus
+
+
+def memory_limit_mb():
+    """Memory available to the container in MB (cgroup limit, else physical RAM), or None."""
+    for path in ("/sys/fs/cgroup/memory.max", "/sys/fs/cgroup/memory/memory.limit_in_bytes"):
+        try:
+            with open(path) as fh:
+                value = fh.read().strip()
+        except OSError:
+            continue
+        # cgroup v1 reports "no limit" as a huge number
+        if value != "max" and int(value) < 1 << 60:
+            return int(value) // (1024 * 1024)
+    try:
+        return os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES") // (1024 * 1024)
+    except (AttributeError, ValueError, OSError):
+        return None
+
+
+def auto_workers(cpus, memory_mb, worker_memory_mb):
+    """2 x CPUs + 1, limited to what fits in memory (at least one worker)."""
+    workers = 2 * cpus + 1
+    if memory_mb:
+        workers = min(workers, memory_mb // worker_memory_mb)
+    return max(1, workers)
+
+
+# Resident size of one worker, used to cap the worker count
+worker_memory_mb = _env_int("GUNICORN_WORKER_MEMORY_MB", 150)
+
+bind = os.environ.get("GUNICORN_BIND", "0.0.0.0:8000")
+worker_class = "gthread"
+workers = _env_int("GUNICORN_WORKERS", auto_workers(cpu_count(), memory_limit_mb(), worker_memory_mb))
+threads = _env_int("GUNICORN_THREADS", 4)
+preload_app = os.environ.get("GUNICORN_PRELOAD", "true").lower() in ("true", "1", "yes")
+max_requests = _env_int("GUNICORN_MAX_REQUESTS", 1000)
+max_requests_jitter = _env_int("GUNICORN_MAX_REQUESTS_JITTER", 100)
+# PDF exports can take a while on large datasets
+timeout = _env_int("GUNICORN_TIMEOUT", 60)
+graceful_timeout = 30
+keepalive = 5
+
+
+def post_fork(server, worker):
+    # Never share a database connection opened in the master while preloading
+    if not server.cfg.preload_app:
+        return
+    from django.db import connections
+
+    connections.close_all()
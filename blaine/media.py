@@ -0,0 +1,150 @@
+"""Serving MEDIA_ROOT files (evidence, attachments, reports).
+
+Replaces django.views.static.serve with:
+
+- conditional GET: ETag / Last-Modified, answered with 304 (or 412) by
+  django.utils.cache.get_conditional_response;
+- single-range requests (``Range: bytes=...``, honouring ``If-Range``) so
+  audio/video evidence can be seeked without downloading it whole;
+- streaming in fixed-size blocks. Full responses use FileResponse, which
+  the WSGI server can hand to ``wsgi.file_wrapper`` (sendfile in gunicorn);
+- an offload mode for when a reverse proxy sits in front: with
+  MEDIA_SERVE_MODE=x-accel (nginx) or x-sendfile (Apache, lighttpd, Caddy
+  plugins) the response only carries a header naming the file, and the proxy
+  sends it, ranges and all, without holding a worker.
+"""
+import mimetypes
+import re
+from pathlib import Path
+
+from django.conf import settings
+from django.core.exceptions import SuspiciousFileOperation
+from django.http import FileResponse, Http404, HttpResponse, StreamingHttpResponse
+from django.utils._os import safe_join
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, parse_http_date_safe, quote_etag
+from django.views.decorators.http import require_safe
+
+BLOCK_SIZE = 64 * 1024
+
+_RANGE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+def parse_range(header, size):
+    """Return (start, end) inclusive for a single byte range, None to send the whole file.
+
+    Raises ValueError when the range can't be satisfied (416).
+    Multi-range requests are answered with the whole file, which RFC 9110 allows.
+    """
+    match = _RANGE.match(header.replace(" ", ""))
+    if not match:
+        return None
+    first, last = match.groups()
+    if not first and not last:
+        return None
+    if not first:
+        # Suffix range: the final N bytes
+        length = int(last)
+        if length == 0:
+            raise ValueError("empty suffix range")
+        return max(size - length, 0), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or start > end:
+        raise ValueError("range not satisfiable")
+    return start, end
+
+
+def _if_range_matches(request, etag, last_modified):
+    if_range = request.headers.get("If-Range")
+    if not if_range:
+        return True
+    if if_range.startswith("W/"):
+        return False  # If-Range needs a strong comparison (RFC 9110 §13.1.5)
+    if if_range.startswith('"'):
+        return if_range == etag
+    return parse_http_date_safe(if_range) == last_modified
+
+
+def _iter_range(path, start, length):
+    with open(path, "rb") as fh:
+        fh.seek(start)
+        while length > 0:
+            chunk = fh.read(min(BLOCK_SIZE, length))
+            if not chunk:
+                break
+            length -= len(chunk)
+            yield chunk
+
+
+def _offload_response(path, relative):
+    response = HttpResponse()
+    if settings.MEDIA_SERVE_MODE == "x-accel":
+        response["X-Accel-Redirect"] = settings.MEDIA_ACCEL_PREFIX.rstrip("/") + "/" + relative.lstrip("/")
+    else:
+        response["X-Sendfile"] = str(path)
+    # Let the proxy work out the type from the file itself
+    del response["Content-Type"]
+    return response
+
+
+@require_safe
+def serve_media(request, path):
+    """GET/HEAD view for files under MEDIA_ROOT."""
+    try:
+        full_path = Path(safe_join(settings.MEDIA_ROOT, path))
+    except SuspiciousFileOperation:
+        raise Http404("Invalid path.")
+    try:
+        stat = full_path.stat()
+    except OSError:
+        raise Http404("File not found.")
+    if not full_path.is_file():
+        raise Http404("File not found.")
+
+    etag = quote_etag(f"{stat.st_size:x}-{stat.st_mtime_ns:x}")
+    last_modified = int(stat.st_mtime)
+    not_modified = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if not_modified is not None:
+        return not_modified
+
+    if settings.MEDIA_SERVE_MODE in ("x-accel", "x-sendfile"):
+        response = _offload_response(full_path, path)
+    else:
+        response = _stream_response(request, full_path, stat.st_size, etag, last_modified)
+
+    response["ETag"] = etag
+    response["Last-Modified"] = http_date(last_modified)
+    # Private documents: browsers may keep them but must revalidate (a cheap 304)
+    response["Cache-Control"] = "private, no-cache"
+    return response
+
+
+def _stream_response(request, full_path, size, etag, last_modified):
+    content_type, encoding = mimetypes.guess_type(full_path.name)
+    content_type = content_type or "application/octet-stream"
+
+    byte_range = None
+    range_header = request.headers.get("Range")
+    if range_header and _if_range_matches(request, etag, last_modified):
+        try:
+            byte_range = parse_range(range_header, size)
+        except ValueError:
+            response = HttpResponse(status=416)
+            response["Content-Range"] = f"bytes */{size}"
+            return response
+
+    if byte_range is None:
+        response = FileResponse(open(full_path, "rb"), content_type=content_type)
+        response.block_size = BLOCK_SIZE
+    else:
+        start, end = byte_range
+        length = end - start + 1
+        stream = _iter_range(full_path, start, length) if request.method != "HEAD" else iter(())
+        response = StreamingHttpResponse(stream, status=206, content_type=content_type)
+        response["Content-Range"] = f"bytes {start}-{end}/{size}"
+        response["Content-Length"] = str(length)
+    if encoding:
+        response["Content-Encoding"] = encoding
+    response["Accept-Ranges"] = "bytes"
+    return response
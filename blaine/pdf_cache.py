@@ -0,0 +1,57 @@
+"""On-disk cache for detail-page PDFs.
+
+Files are keyed by (model, pk, updated_at) plus a digest of the report
+content, so edits to child records (contact logs, evidence, follow-ups...)
+that don't touch the parent's ``updated_at`` still produce a fresh PDF.
+Writing a new version removes older files for the same object.
+"""
+import hashlib
+import os
+import tempfile
+from pathlib import Path
+
+from django.conf import settings
+
+
+def _cache_dir():
+    return Path(settings.PDF_CACHE_DIR)
+
+
+def _object_prefix(obj):
+    return f"{obj._meta.label_lower}-{obj.pk}-"
+
+
+def cache_path_for(obj, title, subtitle, sections):
+    """Return the cache file path for this object's current report content."""
+    updated_at = getattr(obj, "updated_at", None)
+    stamp = f"{updated_at.timestamp():.6f}" if updated_at else "0"
+    digest = hashlib.sha256(repr((title, subtitle, sections)).encode()).hexdigest()[:16]
+    return _cache_dir() / f"{_object_prefix(obj)}{stamp}-{digest}.pdf"
+
+
+def read_cached_pdf(path):
+    """Return cached PDF bytes, or None on a miss."""
+    try:
+        return path.read_bytes()
+    except OSError:
+        return None
+
+
+def write_cached_pdf(path, content):
+    """Atomically write a PDF to the cache and drop stale versions of it.
+
+    Cache failures are never fatal; the caller already has the bytes.
+    """
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        with os.fdopen(fd, "wb") as fh:
+            fh.write(content)
+        os.replace(tmp, path)
+    except OSError:
+        return
+    prefix = path.name.rsplit("-", 2)[0] + "-"
+    for stale in path.parent.glob(f"{prefix}*.pdf"):
+        if stale != path:
+            stale.unlink(missing_ok=True)
+
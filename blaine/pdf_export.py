@@ -1,6 +1,10 @@
+import functools
+import tempfile
 from io import BytesIO
 
-from django.http import HttpResponse
+from django.conf import settings
+from django.http import FileResponse, HttpResponse
+from django.shortcuts import get_object_or_404, redirect
 from django.utils import timezone
 from reportlab.lib import colors
 from reportlab.lib.pagesizes import letter
@@ -15,8 +19,12 @@ from reportlab.platypus import (
 )
 
 
+@functools.cache
 def _get_styles():
-    """Return custom styles for PDF reports."""
+    """Return custom styles for PDF reports.
+
+    Built once per process; the returned sheet is shared and must not be mutated.
+    """
     base = getSampleStyleSheet()
     base.add(ParagraphStyle(
         "SectionHead",
@@ -64,27 +72,48 @@ TABLE_STYLE = TableStyle([
 ])
 
 
-def render_pdf(request, filename, title, subtitle="", sections=None):
-    """Render a PDF report using reportlab.
+DOC_TEMPLATE_KWARGS = {
+    "pagesize": letter,
+    "leftMargin": 0.75 * inch,
+    "rightMargin": 0.75 * inch,
+    "topMargin": 0.75 * inch,
+    "bottomMargin": 0.75 * inch,
+}
 
-    Args:
-        request: Django HttpRequest
-        filename: output filename (without .pdf extension)
-        title: report title string
-        subtitle: optional subtitle string
-        sections: list of section dicts, each with:
-            - "heading": section title (str)
-            - "type": "info" | "table" | "text"
-            - for "info": "rows" = list of (label, value) tuples
-            - for "table": "headers" = list of str, "rows" = list of lists
-            - for "text": "content" = str
+
+def _pdf_response(content, filename):
+    response = HttpResponse(content, content_type="application/pdf")
+    response["Content-Disposition"] = f'attachment; filename="{filename}.pdf"'
+    return response
+
+
+def get_pdf_object(model, pk, plan):
+    """Fetch a single object for a PDF export with its prefetch plan applied.
+
+    ``plan`` is a dict declared next to each exporter:
+        - "select_related": forward FKs rendered in the report
+        - "prefetch_related": reverse/M2M relations (str or Prefetch); filtered
+          relations use Prefetch(..., to_attr=...) so the exporter never
+          issues its own query
+    Raises Http404 if the object does not exist.
     """
-    buf = BytesIO()
-    doc = SimpleDocTemplate(
-        buf, pagesize=letter,
-        leftMargin=0.75 * inch, rightMargin=0.75 * inch,
-        topMargin=0.75 * inch, bottomMargin=0.75 * inch,
+    qs = model.objects.select_related(*plan.get("select_related", ())).prefetch_related(
+        *plan.get("prefetch_related", ()),
     )
+    return get_object_or_404(qs, pk=pk)
+
+
+def count_table_rows(sections):
+    """Return the total number of table rows across ``sections``."""
+    return sum(len(s.get("rows", [])) for s in (sections or []) if s.get("type") == "table")
+
+
+def build_pdf(target, title, subtitle="", sections=None):
+    """Lay out a report and write it to ``target`` (a path or file-like object).
+
+    See render_pdf for the ``sections`` format.
+    """
+    doc = SimpleDocTemplate(target, **DOC_TEMPLATE_KWARGS)
     styles = _get_styles()
     story = []
 
@@ -136,6 +165,87 @@ def render_pdf(request, filename, title, subtitle="", sections=None):
 
     doc.build(story)
 
-    response = HttpResponse(buf.getvalue(), content_type="application/pdf")
-    response["Content-Disposition"] = f'attachment; filename="{filename}.pdf"'
-    return response
+
+def _queue_if_large(filename, title, subtitle, sections, cache_path=None):
+    """Hand reports over PDF_ASYNC_ROW_THRESHOLD rows to the qcluster.
+
+    Returns a redirect to the report status page, or None to render inline.
+    """
+    threshold = settings.PDF_ASYNC_ROW_THRESHOLD
+    if not threshold or count_table_rows(sections) <= threshold:
+        return None
+    from dashboard.reports import queue_pdf_report
+
+    report = queue_pdf_report(filename, title, subtitle, sections, cache_path)
+    return redirect(report)
+
+
+def render_pdf(request, filename, title, subtitle="", sections=None, cache_for=None):
+    """Render a PDF report using reportlab.
+
+    Args:
+        request: Django HttpRequest
+        filename: output filename (without .pdf extension)
+        title: report title string
+        subtitle: optional subtitle string
+        sections: list of section dicts, each with:
+            - "heading": section title (str)
+            - "type": "info" | "table" | "text"
+            - for "info": "rows" = list of (label, value) tuples
+            - for "table": "headers" = list of str, "rows" = list of lists
+            - for "text": "content" = str
+        cache_for: optional model instance; when given, the rendered PDF is
+            cached on disk (see blaine.pdf_cache) and reused until the
+            instance or the report content changes.
+
+    Reports with more than settings.PDF_ASYNC_ROW_THRESHOLD table rows are
+    handed to a django-q2 worker (see dashboard.reports) and the response is
+    a redirect to the report's status page instead of the PDF itself.
+    """
+    cache_path = None
+    if cache_for is not None:
+        from blaine.pdf_cache import cache_path_for, read_cached_pdf
+
+        cache_path = cache_path_for(cache_for, title, subtitle, sections)
+        cached = read_cached_pdf(cache_path)
+        if cached is not None:
+            return _pdf_response(cached, filename)
+
+    queued = _queue_if_large(filename, title, subtitle, sections, cache_path)
+    if queued is not None:
+        return queued
+
+    buf = BytesIO()
+    build_pdf(buf, title, subtitle, sections)
+    content = buf.getvalue()
+
+    if cache_path is not None:
+        from blaine.pdf_cache import write_cached_pdf
+
+        write_cached_pdf(cache_path, content)
+
+    return _pdf_response(content, filename)
+
+
+def stream_pdf(request, filename, title, subtitle="", sections=None):
+    """Render a multi-page report to a temporary file and stream it back.
+
+    Used for large documents such as the portfolio report: reportlab writes
+    straight to disk and the response is read back in chunks, so the PDF is
+    never held in memory as a single bytes object. Takes the same
+    ``sections`` as render_pdf and honours PDF_ASYNC_ROW_THRESHOLD, but is
+    not cached.
+    """
+    queued = _queue_if_large(filename, title, subtitle, sections)
+    if queued is not None:
+        return queued
+
+    tmp = tempfile.TemporaryFile(suffix=".pdf")
+    try:
+        build_pdf(tmp, title, subtitle, sections)
+    except Exception:
+        tmp.close()
+        raise
+    tmp.seek(0)
+    return FileResponse(tmp, as_attachment=True, filename=f"{filename}.pdf",
+                        content_type="application/pdf")
@@ -0,0 +1,175 @@
+"""Opt-in per-request profiling (``PERF_PROFILING=true``).
+
+Each request is split into DB time (all queries), template time (top-level
+template renders, minus the queries they trigger) and Python time (the
+rest). The breakdown is sent as a ``Server-Timing`` header and appended to a
+bounded in-process ring buffer that the /debug/perf/ page summarises as
+p50/p95/p99 per URL name. A sampled fraction of requests also runs under
+cProfile; samples slower than ``PERF_SLOW_MS`` are dumped to
+``PERF_PROFILE_DIR`` for ``python -m pstats`` / snakeviz.
+
+The buffer is per process, so with several gunicorn workers each page load
+shows one worker's window.
+"""
+import cProfile
+import contextvars
+import math
+import random
+import threading
+import time
+from collections import deque
+from contextlib import ExitStack
+from datetime import datetime
+from pathlib import Path
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.template.backends.django import Template
+
+_current = contextvars.ContextVar("perf_timings", default=None)
+_samples = deque(maxlen=1000)
+_profile_lock = threading.Lock()
+_original_render = None
+
+
+class RequestTimings:
+    """Accumulated seconds for one request."""
+
+    def __init__(self):
+        self.db = 0.0
+        self.queries = 0
+        self.template = 0.0
+        self.rendering = False
+
+    def record_query(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db += time.perf_counter() - start
+            self.queries += 1
+
+
+def _timed_render(self, context=None, request=None):
+    timings = _current.get()
+    if timings is None or timings.rendering:
+        return _original_render(self, context, request)
+    timings.rendering = True
+    db_before = timings.db
+    start = time.perf_counter()
+    try:
+        return _original_render(self, context, request)
+    finally:
+        timings.template += time.perf_counter() - start - (timings.db - db_before)
+        timings.rendering = False
+
+
+def _install_template_timer():
+    global _original_render
+    if _original_render is None:
+        _original_render = Template.render
+        Template.render = _timed_render
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def perf_summary():
+    """Return per-URL-name stats (milliseconds) for the current ring buffer, slowest p95 first."""
+    by_view = {}
+    for sample in list(_samples):
+        by_view.setdefault(sample["view"], []).append(sample)
+
+    rows = []
+    for view, samples in by_view.items():
+        totals = sorted(s["total"] for s in samples)
+        count = len(samples)
+        rows.append({
+            "view": view,
+            "count": count,
+            "p50": percentile(totals, 50),
+            "p95": percentile(totals, 95),
+            "p99": percentile(totals, 99),
+            "db": sum(s["db"] for s in samples) / count,
+            "queries": sum(s["queries"] for s in samples) / count,
+            "template": sum(s["template"] for s in samples) / count,
+            "python": sum(s["python"] for s in samples) / count,
+        })
+    rows.sort(key=lambda r: -r["p95"])
+    return rows
+
+
+def recent_profiles():
+    """Saved cProfile dumps, newest first."""
+    directory = Path(settings.PERF_PROFILE_DIR)
+    if not directory.is_dir():
+        return []
+    return sorted(directory.glob("*.prof"), key=lambda p: p.stat().st_mtime, reverse=True)
+
+
+def _save_profile(profiler, view, total_ms):
+    directory = Path(settings.PERF_PROFILE_DIR)
+    directory.mkdir(parents=True, exist_ok=True)
+    safe_view = view.replace(":", "-").replace("/", "-")
+    profiler.dump_stats(directory / f"{datetime.now():%Y%m%d-%H%M%S-%f}-{safe_view}-{total_ms:.0f}ms.prof")
+    for stale in recent_profiles()[settings.PERF_PROFILE_KEEP:]:
+        stale.unlink(missing_ok=True)
+
+
+class ProfilingMiddleware:
+    """Record timings for every request; see the module docstring."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if not settings.PERF_PROFILING:
+            raise MiddlewareNotUsed
+        global _samples
+        if _samples.maxlen != settings.PERF_BUFFER_SIZE:
+            _samples = deque(_samples, maxlen=settings.PERF_BUFFER_SIZE)
+        _install_template_timer()
+
+    def __call__(self, request):
+        timings = RequestTimings()
+        token = _current.set(timings)
+        profiler = None
+        if random.random() < settings.PERF_PROFILE_SAMPLE_RATE and _profile_lock.acquire(blocking=False):
+            profiler = cProfile.Profile()
+        start = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                for conn in connections.all():
+                    stack.enter_context(conn.execute_wrapper(timings.record_query))
+                if profiler:
+                    profiler.enable()
+                try:
+                    response = self.get_response(request)
+                finally:
+                    if profiler:
+                        profiler.disable()
+            total = time.perf_counter() - start
+        finally:
+            _current.reset(token)
+            if profiler:
+                _profile_lock.release()
+
+        match = request.resolver_match
+        view = match.view_name if match else "<unresolved>"
+        db_ms, template_ms, total_ms = timings.db * 1000, timings.template * 1000, total * 1000
+        python_ms = max(total_ms - db_ms - template_ms, 0.0)
+        _samples.append({
+            "view": view, "total": total_ms, "db": db_ms, "queries": timings.queries,
+            "template": template_ms, "python": python_ms,
+        })
+        response["Server-Timing"] = (
+            f'db;dur={db_ms:.1f};desc="{timings.queries} queries", tpl;dur={template_ms:.1f}, '
+            f"app;dur={python_ms:.1f}, total;dur={total_ms:.1f}"
+        )
+        if profiler and total_ms >= settings.PERF_SLOW_MS:
+            _save_profile(profiler, view, total_ms)
+        return response
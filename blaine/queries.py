@@ -0,0 +1,89 @@
+"""Per-request query recording and N+1 detection.
+
+``QueryRecorder`` hooks every database connection with an execute wrapper
+and groups the executed SQL by shape (the parameterised statement, with
+``IN (...)`` lists collapsed). The same shape running many times inside one
+request is almost always a related object being fetched row by row, i.e.
+a missing ``select_related``/``prefetch_related``.
+"""
+import logging
+import re
+from collections import Counter
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+_IN_LIST = re.compile(r"IN \((?:%s, )*%s\)")
+
+
+class NPlusOneError(Exception):
+    """Raised when a request repeats one query shape too many times."""
+
+
+def query_shape(sql):
+    return _IN_LIST.sub("IN (...)", sql)
+
+
+class QueryRecorder:
+    """Context manager that records the SQL executed on every connection."""
+
+    def __init__(self):
+        self.queries = []
+        self._stack = None
+
+    def __enter__(self):
+        self._stack = ExitStack()
+        for conn in connections.all():
+            self._stack.enter_context(conn.execute_wrapper(self._record))
+        return self
+
+    def __exit__(self, *exc):
+        self._stack.close()
+
+    def _record(self, execute, sql, params, many, context):
+        self.queries.append(sql)
+        return execute(sql, params, many, context)
+
+    @property
+    def count(self):
+        return len(self.queries)
+
+    def repeated(self, threshold):
+        """Return {shape: count} for shapes executed at least ``threshold`` times."""
+        counts = Counter(query_shape(sql) for sql in self.queries)
+        return {shape: n for shape, n in counts.items() if n >= threshold}
+
+
+def describe_repeated(repeated):
+    return "\n".join(f"  {n}x {shape}" for shape, n in sorted(repeated.items(), key=lambda i: -i[1]))
+
+
+class QueryCountMiddleware:
+    """Count queries per request and flag N+1 patterns.
+
+    ``settings.QUERY_GUARD`` selects the mode: "" disables the middleware,
+    "warn" logs repeated query shapes, "raise" raises NPlusOneError.
+    Every recorded response carries an ``X-Query-Count`` header.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if getattr(settings, "QUERY_GUARD", "") not in ("warn", "raise"):
+            raise MiddlewareNotUsed
+
+    def __call__(self, request):
+        with QueryRecorder() as recorder:
+            response = self.get_response(request)
+        response["X-Query-Count"] = str(recorder.count)
+
+        repeated = recorder.repeated(settings.QUERY_GUARD_THRESHOLD)
+        if repeated:
+            message = f"Possible N+1 on {request.path} ({recorder.count} queries):\n{describe_repeated(repeated)}"
+            if settings.QUERY_GUARD == "raise":
+                raise NPlusOneError(message)
+            logger.warning(message)
+        return response
@@ -13,6 +13,8 @@ https://docs.djangoproject.com/en/6.0/ref/settings/
 import os
 from pathlib import Path
 
+from django.core.exceptions import ImproperlyConfigured
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -58,6 +60,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'blaine.profiling.ProfilingMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -66,8 +69,22 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'blaine.queries.QueryCountMiddleware',
 ]
 
+# N+1 guard (see blaine.queries): "" off, "warn" logs, "raise" raises NPlusOneError.
+# A request running the same query shape QUERY_GUARD_THRESHOLD+ times is flagged.
+QUERY_GUARD = os.environ.get('QUERY_GUARD', 'warn' if DEBUG else '').lower()
+QUERY_GUARD_THRESHOLD = int(os.environ.get('QUERY_GUARD_THRESHOLD', 5))
+
+# Per-request profiling (see blaine.profiling): Server-Timing header and /debug/perf/.
+PERF_PROFILING = os.environ.get('PERF_PROFILING', 'false').lower() in ('true', '1', 'yes')
+PERF_BUFFER_SIZE = int(os.environ.get('PERF_BUFFER_SIZE', 1000))  # requests kept for percentiles
+PERF_PROFILE_SAMPLE_RATE = float(os.environ.get('PERF_PROFILE_SAMPLE_RATE', 0.05))  # fraction run under cProfile
+PERF_SLOW_MS = float(os.environ.get('PERF_SLOW_MS', 500))  # sampled requests slower than this are dumped
+PERF_PROFILE_DIR = Path(os.environ.get('PERF_PROFILE_DIR', BASE_DIR / 'perf_profiles'))
+PERF_PROFILE_KEEP = int(os.environ.get('PERF_PROFILE_KEEP', 50))
+
 ROOT_URLCONF = 'blaine.urls'
 
 TEMPLATES = [
@@ -91,14 +108,59 @@ WSGI_APPLICATION = 'blaine.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/6.0/ref/settings/#databases
 
+# Gunicorn workers and the qcluster (ORM broker) write to the same SQLite file
+# concurrently. These pragmas run on every new connection: WAL lets readers
+# proceed during writes, busy_timeout makes writers wait instead of failing with
+# "database is locked", and IMMEDIATE transactions take the write lock up front
+# so a read->write upgrade can't deadlock. Override any value via env.
+SQLITE_PRAGMAS = {
+    'journal_mode': os.environ.get('SQLITE_JOURNAL_MODE', 'WAL'),
+    'synchronous': os.environ.get('SQLITE_SYNCHRONOUS', 'NORMAL'),
+    'busy_timeout': int(os.environ.get('SQLITE_BUSY_TIMEOUT', 5000)),  # ms
+    'mmap_size': int(os.environ.get('SQLITE_MMAP_SIZE', 128 * 1024 * 1024)),  # bytes
+    'cache_size': int(os.environ.get('SQLITE_CACHE_SIZE', -20000)),  # negative = KiB
+    'temp_store': os.environ.get('SQLITE_TEMP_STORE', 'MEMORY'),
+}
+
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': Path(os.environ.get('DATABASE_PATH', BASE_DIR / 'db.sqlite3')),
+        'OPTIONS': {
+            'init_command': ';'.join(f'PRAGMA {name}={value}' for name, value in SQLITE_PRAGMAS.items()),
+            'transaction_mode': os.environ.get('SQLITE_TRANSACTION_MODE', 'IMMEDIATE'),
+        },
     }
 }
 
 
+# Cache
+# https://docs.djangoproject.com/en/6.0/topics/cache/
+
+# The version counters in blaine.cache must be shared by every process that
+# writes (gunicorn workers, the qcluster) for invalidation to stay exact, so
+# the default is the file backend (shared on one host); use redis across
+# hosts. locmem is per process: only for a single process, e.g. runserver.
+CACHE_BACKEND = os.environ.get('CACHE_BACKEND', 'file').lower()
+_CACHE_BACKENDS = {
+    'locmem': ('django.core.cache.backends.locmem.LocMemCache', 'blaine'),
+    'file': ('django.core.cache.backends.filebased.FileBasedCache', str(BASE_DIR / 'cache')),
+    'redis': ('django.core.cache.backends.redis.RedisCache', 'redis://127.0.0.1:6379/1'),
+}
+if CACHE_BACKEND not in _CACHE_BACKENDS:
+    raise ImproperlyConfigured(
+        f"Unknown CACHE_BACKEND {CACHE_BACKEND!r}; choose one of {', '.join(sorted(_CACHE_BACKENDS))}."
+    )
+
+CACHES = {
+    'default': {
+        'BACKEND': _CACHE_BACKENDS[CACHE_BACKEND][0],
+        'LOCATION': os.environ.get('CACHE_LOCATION', _CACHE_BACKENDS[CACHE_BACKEND][1]),
+        'TIMEOUT': int(os.environ.get('CACHE_TIMEOUT', 300)),  # seconds
+        'KEY_PREFIX': 'blaine',
+    }
+}
+
 # Password validation
 # https://docs.djangoproject.com/en/6.0/ref/settings/#auth-password-validators
 
@@ -163,6 +225,25 @@ if not DEBUG:
 MEDIA_URL = 'media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# How blaine.media sends files: "django" streams them from the worker;
+# behind a reverse proxy, "x-accel" (nginx, internal location at
+# MEDIA_ACCEL_PREFIX aliased to MEDIA_ROOT) or "x-sendfile" (Apache/lighttpd)
+# hands the transfer to the proxy.
+MEDIA_SERVE_MODE = os.environ.get('MEDIA_SERVE_MODE', 'django').lower()
+MEDIA_ACCEL_PREFIX = os.environ.get('MEDIA_ACCEL_PREFIX', '/protected-media/')
+
+# Rendered detail-page PDFs are cached here (see blaine.pdf_cache)
+PDF_CACHE_DIR = Path(os.environ.get('PDF_CACHE_DIR', MEDIA_ROOT / 'pdf_cache'))
+
+# PDF reports with more table rows than this are generated by the qcluster
+# into MEDIA_ROOT/reports/ instead of inside the request. 0 disables.
+PDF_ASYNC_ROW_THRESHOLD = int(os.environ.get('PDF_ASYNC_ROW_THRESHOLD', 1000))
+# Seconds a queued report may stay pending/running before it's given up on
+PDF_REPORT_TIMEOUT = int(os.environ.get('PDF_REPORT_TIMEOUT', 600))
+
+# Tests write uploads and PDFs to a temporary MEDIA_ROOT
+TEST_RUNNER = 'blaine.testing.TempMediaRunner'
+
 # Default primary key field type
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
@@ -0,0 +1,49 @@
+"""Test helpers shared across apps."""
+import shutil
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+
+from django.conf import settings
+from django.test.runner import DiscoverRunner
+from django.test.utils import override_settings
+
+from .queries import QueryRecorder, describe_repeated
+
+
+class QueryGuardMixin:
+    """TestCase mixin adding an N+1 assertion built on QueryRecorder."""
+
+    @contextmanager
+    def assertNoNPlusOne(self, threshold=None):
+        threshold = threshold or settings.QUERY_GUARD_THRESHOLD
+        with QueryRecorder() as recorder:
+            yield recorder
+        repeated = recorder.repeated(threshold)
+        if repeated:
+            self.fail(f"Repeated query shapes ({recorder.count} queries):\n{describe_repeated(repeated)}")
+
+
+class TempMediaRunner(DiscoverRunner):
+    """Runs the suite with MEDIA_ROOT (and the PDF cache under it) in a throwaway directory.
+
+    Uploads, generated reports and cached PDFs written by tests never land
+    in the project's media tree. A file-based cache moves there too, so one
+    run never reads values (or version counters) left by another.
+    """
+
+    def setup_test_environment(self, **kwargs):
+        super().setup_test_environment(**kwargs)
+        self._media_root = Path(tempfile.mkdtemp(prefix="blaine-test-media-"))
+        overrides = {"MEDIA_ROOT": self._media_root, "PDF_CACHE_DIR": self._media_root / "pdf_cache"}
+        if settings.CACHE_BACKEND == "file":
+            overrides["CACHES"] = {
+                "default": {**settings.CACHES["default"], "LOCATION": str(self._media_root / "cache")},
+            }
+        self._media_override = override_settings(**overrides)
+        self._media_override.enable()
+
+    def teardown_test_environment(self, **kwargs):
+        self._media_override.disable()
+        shutil.rmtree(self._media_root, ignore_errors=True)
+        super().teardown_test_environment(**kwargs)
@@ -1,9 +1,29 @@
+import re
+import threading
+from datetime import date, timedelta
+from decimal import Decimal
+from unittest import mock
+
+from asgiref.sync import async_to_sync
 from django import forms
-from django.test import SimpleTestCase, TestCase, RequestFactory
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connection, transaction
+from django.http import Http404, HttpResponse
+from django.test import SimpleTestCase, TestCase, TransactionTestCase, RequestFactory, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
 
 from .export import export_csv
 from .forms import TailwindFormMixin
+from .media import serve_media
+from . import profiling
+from .cache import cached, model_versions
+from .concurrency import gather_queries
 from .pdf_export import render_pdf
+from .queries import NPlusOneError, QueryCountMiddleware, QueryRecorder
 
 from stakeholders.models import Stakeholder
 
@@ -146,3 +166,581 @@ class RenderPdfTests(TestCase):
     def test_subtitle_included(self):
         resp = render_pdf(self.request, "test", "Title", subtitle="Sub", sections=[])
         self.assertEqual(resp["Content-Type"], "application/pdf")
+
+
+class PdfStyleCacheTests(SimpleTestCase):
+    def test_styles_built_once(self):
+        from .pdf_export import _get_styles
+        self.assertIs(_get_styles(), _get_styles())
+        self.assertIn("SectionHead", _get_styles())
+
+
+class PdfDiskCacheTests(TestCase):
+    def setUp(self):
+        import tempfile
+        from pathlib import Path
+
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.cache_dir = Path(tmp.name)
+        override = self.settings(PDF_CACHE_DIR=self.cache_dir)
+        override.enable()
+        self.addCleanup(override.disable)
+        self.request = RequestFactory().get("/")
+        self.stakeholder = Stakeholder.objects.create(name="Cached")
+
+    def _render(self, sections):
+        return render_pdf(self.request, "test", "Title", sections=sections,
+                          cache_for=self.stakeholder)
+
+    def test_cache_hit_reuses_file(self):
+        sections = [{"heading": "Text", "type": "text", "content": "Hello"}]
+        first = self._render(sections)
+        files = list(self.cache_dir.glob("*.pdf"))
+        self.assertEqual(len(files), 1)
+        with mock.patch("blaine.pdf_export.SimpleDocTemplate") as doc:
+            second = self._render(sections)
+            doc.assert_not_called()
+        self.assertEqual(first.content, second.content)
+        self.assertIn("test.pdf", second["Content-Disposition"])
+
+    def test_content_change_replaces_cached_file(self):
+        self._render([{"heading": "Text", "type": "text", "content": "Old"}])
+        old = list(self.cache_dir.glob("*.pdf"))
+        self._render([{"heading": "Text", "type": "text", "content": "New"}])
+        new = list(self.cache_dir.glob("*.pdf"))
+        self.assertEqual(len(new), 1)
+        self.assertNotEqual(old, new)
+
+    def test_updated_at_changes_key(self):
+        sections = [{"heading": "Text", "type": "text", "content": "Same"}]
+        self._render(sections)
+        old = list(self.cache_dir.glob("*.pdf"))
+        self.stakeholder.save()
+        self._render(sections)
+        new = list(self.cache_dir.glob("*.pdf"))
+        self.assertEqual(len(new), 1)
+        self.assertNotEqual(old, new)
+
+    def test_no_cache_without_instance(self):
+        render_pdf(self.request, "test", "Title", sections=[])
+        self.assertEqual(list(self.cache_dir.glob("*.pdf")), [])
+
+
+# --- SQLite Tuning Tests ---
+
+class SQLiteConcurrencyTests(SimpleTestCase):
+    """Web-style and queue-style writers hammer one SQLite file in parallel.
+
+    Uses a throwaway on-disk database with the production OPTIONS (the test
+    database is in-memory, where WAL and locking behave differently).
+    """
+    THREADS_PER_ROLE = 4
+    ITERATIONS = 25
+
+    alias = "sqlite_stress"
+
+    @classmethod
+    def setUpClass(cls):
+        import copy
+        import tempfile
+        from pathlib import Path
+
+        from django.db import connections
+
+        from dashboard.models import Notification
+        from django_q.models import OrmQ
+
+        super().setUpClass()
+        tmp = tempfile.TemporaryDirectory()
+        cls.addClassCleanup(tmp.cleanup)
+        db_settings = copy.deepcopy(connections.settings["default"])
+        db_settings["NAME"] = str(Path(tmp.name) / "stress.sqlite3")
+        db_settings["OPTIONS"] = copy.deepcopy(settings.DATABASES["default"]["OPTIONS"])
+        connections.settings[cls.alias] = db_settings
+        cls.addClassCleanup(connections.settings.pop, cls.alias)
+        # Registered after setUpClass validation, so allow it explicitly
+        cls.databases = {cls.alias}
+
+        with connections[cls.alias].schema_editor() as editor:
+            editor.create_model(Notification)
+            editor.create_model(OrmQ)
+        cls.addClassCleanup(connections[cls.alias].close)
+
+    def test_pragmas_applied(self):
+        from django.db import connections
+
+        with connections[self.alias].cursor() as cursor:
+            cursor.execute("PRAGMA journal_mode")
+            self.assertEqual(cursor.fetchone()[0].lower(), settings.SQLITE_PRAGMAS["journal_mode"].lower())
+            cursor.execute("PRAGMA busy_timeout")
+            self.assertEqual(cursor.fetchone()[0], settings.SQLITE_PRAGMAS["busy_timeout"])
+            cursor.execute("PRAGMA temp_store")
+            self.assertEqual(cursor.fetchone()[0], 2)  # MEMORY
+
+    def test_parallel_web_and_queue_writes(self):
+        from django.db import connections
+
+        from dashboard.models import Notification
+        from django_q.models import OrmQ
+
+        alias = self.alias
+        errors = []
+        start = threading.Barrier(self.THREADS_PER_ROLE * 2)
+
+        def web_writer(n):
+            # Mirrors a request: insert, then read-modify-write in one transaction
+            try:
+                start.wait()
+                for i in range(self.ITERATIONS):
+                    with transaction.atomic(using=alias):
+                        Notification.objects.using(alias).create(message=f"web {n}-{i}")
+                        Notification.objects.using(alias).filter(is_read=False).count()
+                        Notification.objects.using(alias).filter(message=f"web {n}-{i}").update(is_read=True)
+            except Exception as e:
+                errors.append(e)
+            finally:
+                connections[alias].close()
+
+        def queue_writer(n):
+            # Mirrors the django-q ORM broker: enqueue, lock, acknowledge (delete)
+            try:
+                start.wait()
+                for i in range(self.ITERATIONS):
+                    with transaction.atomic(using=alias):
+                        task = OrmQ.objects.using(alias).create(key="stress", payload=f"{n}-{i}",
+                                                                lock=timezone.now())
+                    with transaction.atomic(using=alias):
+                        OrmQ.objects.using(alias).filter(pk=task.pk).update(lock=timezone.now())
+                    OrmQ.objects.using(alias).filter(pk=task.pk).delete()
+            except Exception as e:
+                errors.append(e)
+            finally:
+                connections[alias].close()
+
+        threads = [threading.Thread(target=web_writer, args=(n,)) for n in range(self.THREADS_PER_ROLE)]
+        threads += [threading.Thread(target=queue_writer, args=(n,)) for n in range(self.THREADS_PER_ROLE)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        self.assertEqual(errors, [])
+        self.assertEqual(
+            Notification.objects.using(alias).filter(is_read=True).count(),
+            self.THREADS_PER_ROLE * self.ITERATIONS,
+        )
+        self.assertFalse(OrmQ.objects.using(alias).exists())
+
+
+# --- Query plan tests ---
+
+class QueryPlanTests(TestCase):
+    """Every list/dashboard query must be served by an index, never a bare table scan.
+
+    Each URL is requested with the filters and sorts the list views expose; every
+    captured SELECT is run through EXPLAIN QUERY PLAN and a plain ``SCAN <table>``
+    (no index) fails the test. Free-text ``q`` search is LIKE '%...%' and
+    deliberately not covered.
+    """
+
+    FULL_SCAN = re.compile(r"^SCAN (\w+)$")
+
+    @classmethod
+    def setUpTestData(cls):
+        from assets.models import Investment, Loan, RealEstate
+        from cashflow.models import CashFlowEntry
+        from legal.models import LegalMatter
+        from notes.models import Note
+        from tasks.models import Task
+
+        today = date.today()
+        lender = Stakeholder.objects.create(name="Lender", entity_type="firm")
+        prop = RealEstate.objects.create(name="Lot 1", status="owned", estimated_value=Decimal("100000"))
+        Investment.objects.create(name="Fund", current_value=Decimal("5000"))
+        Loan.objects.create(name="Mortgage", lender=lender, status="active",
+                            current_balance=Decimal("50000"), monthly_payment=Decimal("900"),
+                            next_payment_date=today + timedelta(days=3))
+        matter = LegalMatter.objects.create(title="Case", status="active", filing_date=today,
+                                            next_hearing_date=today + timedelta(days=5))
+        matter.related_properties.add(prop)
+        Task.objects.create(title="Call", due_date=today - timedelta(days=1), related_stakeholder=lender)
+        CashFlowEntry.objects.create(description="Rent", amount=Decimal("1000"), entry_type="inflow",
+                                     date=today)
+        Note.objects.create(title="Memo", content="x", date=timezone.now())
+
+    def assertIndexedQueries(self, url):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200, url)
+        with connection.cursor() as cursor:
+            for query in ctx.captured_queries:
+                sql = query["sql"]
+                if not sql.lstrip().upper().startswith("SELECT"):
+                    continue
+                cursor.execute(f"EXPLAIN QUERY PLAN {sql}")
+                for row in cursor.fetchall():
+                    detail = row[-1]
+                    if self.FULL_SCAN.match(detail) and not detail.startswith("SCAN django_"):
+                        self.fail(f"{url}: full table scan ({detail}) in\n{sql}")
+
+    def test_dashboard(self):
+        today = date.today()
+        from dashboard.panels import PANELS
+
+        for name in PANELS:
+            self.assertIndexedQueries(reverse("dashboard:panel", args=[name]))
+        self.assertIndexedQueries(reverse("dashboard:timeline"))
+        self.assertIndexedQueries(
+            f"{reverse('dashboard:calendar_events')}?start={today - timedelta(days=7)}"
+            f"&end={today + timedelta(days=35)}"
+        )
+
+    def test_task_list(self):
+        base = reverse("tasks:list")
+        for params in ["", "?status=not_started", "?status=not_started&status=in_progress",
+                       "?priority=high", "?date_from=2025-01-01&date_to=2025-12-31",
+                       "?sort=due_date&dir=asc", "?sort=priority", "?sort=status", "?sort=created_at"]:
+            self.assertIndexedQueries(base + params)
+
+    def test_cashflow_list(self):
+        base = reverse("cashflow:list")
+        for params in ["", "?type=inflow", "?projected=actual", "?projected=projected",
+                       "?date_from=2025-01-01&date_to=2025-12-31", "?sort=amount", "?sort=date&dir=asc"]:
+            self.assertIndexedQueries(base + params)
+        self.assertIndexedQueries(reverse("cashflow:chart_data"))
+
+    def test_legal_list(self):
+        base = reverse("legal:list")
+        for params in ["", "?status=active", "?date_from=2025-01-01",
+                       "?hearing_date_from=2025-01-01&hearing_date_to=2025-12-31",
+                       "?sort=filing_date", "?sort=next_hearing_date&dir=asc"]:
+            self.assertIndexedQueries(base + params)
+
+    def test_asset_lists(self):
+        base = reverse("assets:loan_list")
+        for params in ["", "?status=active", "?sort=next_payment_date&dir=asc",
+                       "?date_from=2025-01-01&date_to=2025-12-31"]:
+            self.assertIndexedQueries(base + params)
+        self.assertIndexedQueries(reverse("assets:realestate_list") + "?status=owned")
+        self.assertIndexedQueries(reverse("assets:investment_list"))
+
+    def test_stakeholder_and_note_lists(self):
+        self.assertIndexedQueries(reverse("stakeholders:list"))
+        self.assertIndexedQueries(reverse("stakeholders:list") + "?type=firm")
+        self.assertIndexedQueries(reverse("notes:list"))
+        self.assertIndexedQueries(reverse("notes:list") + "?type=general&date_from=2025-01-01")
+
+
+# --- N+1 guard tests ---
+
+class QueryCountMiddlewareTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        for i in range(6):
+            Stakeholder.objects.create(name=f"Guard {i}")
+
+    def _n_plus_one_view(self, request):
+        for pk in Stakeholder.objects.values_list("pk", flat=True):
+            Stakeholder.objects.get(pk=pk)
+        return HttpResponse("ok")
+
+    def test_recorder_groups_query_shapes(self):
+        with QueryRecorder() as recorder:
+            self._n_plus_one_view(None)
+            list(Stakeholder.objects.filter(pk__in=[1, 2]))
+            list(Stakeholder.objects.filter(pk__in=[1, 2, 3]))
+        self.assertEqual(recorder.count, 9)
+        self.assertEqual(list(recorder.repeated(5).values()), [6])
+        self.assertEqual(len(recorder.repeated(2)), 2)  # IN lists of any length share a shape
+
+    @override_settings(QUERY_GUARD="raise", QUERY_GUARD_THRESHOLD=5)
+    def test_raise_mode(self):
+        middleware = QueryCountMiddleware(self._n_plus_one_view)
+        with self.assertRaisesMessage(NPlusOneError, "6x SELECT"):
+            middleware(RequestFactory().get("/"))
+
+    @override_settings(QUERY_GUARD="warn", QUERY_GUARD_THRESHOLD=5)
+    def test_warn_mode_sets_header(self):
+        middleware = QueryCountMiddleware(self._n_plus_one_view)
+        with self.assertLogs("blaine.queries", "WARNING"):
+            response = middleware(RequestFactory().get("/"))
+        self.assertEqual(response["X-Query-Count"], "7")
+
+    @override_settings(QUERY_GUARD="")
+    def test_disabled(self):
+        with self.assertRaises(MiddlewareNotUsed):
+            QueryCountMiddleware(self._n_plus_one_view)
+
+
+# --- Profiling tests ---
+
+@override_settings(PERF_PROFILING=True, PERF_PROFILE_SAMPLE_RATE=0)
+class ProfilingMiddlewareTests(TestCase):
+    def setUp(self):
+        profiling._samples.clear()
+
+    def test_server_timing_header(self):
+        resp = self.client.get(reverse("dashboard:index"))
+        timing = resp["Server-Timing"]
+        for metric in ("db;dur=", "queries", "tpl;dur=", "app;dur=", "total;dur="):
+            self.assertIn(metric, timing)
+
+    def test_breakdown_recorded_per_url_name(self):
+        for _ in range(3):
+            self.client.get(reverse("stakeholders:list"))
+        row = next(r for r in profiling.perf_summary() if r["view"] == "stakeholders:list")
+        self.assertEqual(row["count"], 3)
+        self.assertGreater(row["queries"], 0)
+        self.assertGreater(row["template"], 0)
+        self.assertLessEqual(row["p50"], row["p95"])
+        self.assertLessEqual(row["p95"], row["p99"])
+
+    @override_settings(PERF_BUFFER_SIZE=5)
+    def test_ring_buffer_is_bounded(self):
+        profiling._samples = profiling.deque(maxlen=1000)
+        for _ in range(8):
+            self.client.get(reverse("notes:list"))
+        self.assertEqual(len(profiling._samples), 5)
+
+    def test_debug_page(self):
+        self.client.get(reverse("tasks:list"))
+        resp = self.client.get(reverse("dashboard:perf_debug"))
+        self.assertContains(resp, "tasks:list")
+
+    @override_settings(PERF_PROFILING=False)
+    def test_debug_page_disabled(self):
+        resp = self.client.get(reverse("dashboard:perf_debug"))
+        self.assertEqual(resp.status_code, 404)
+
+    def test_slow_request_profile_saved(self):
+        import tempfile
+        from pathlib import Path
+
+        with tempfile.TemporaryDirectory() as tmp:
+            with override_settings(PERF_PROFILE_SAMPLE_RATE=1, PERF_SLOW_MS=0, PERF_PROFILE_DIR=tmp,
+                                   PERF_PROFILE_KEEP=2):
+                for _ in range(3):
+                    self.client.get(reverse("legal:list"))
+            profiles = list(Path(tmp).glob("*legal-list-*.prof"))
+            self.assertEqual(len(profiles), 2)
+
+    def test_percentile(self):
+        values = list(range(1, 101))
+        self.assertEqual(profiling.percentile(values, 50), 50)
+        self.assertEqual(profiling.percentile(values, 99), 99)
+        self.assertEqual(profiling.percentile([], 95), 0.0)
+
+
+class GatherQueriesTests(TransactionTestCase):
+    """gather_queries needs committed rows (worker threads use their own connections)."""
+
+    def setUp(self):
+        for name in ("Alpha", "Beta", "Gamma"):
+            Stakeholder.objects.create(name=name)
+
+    def test_querysets_evaluated_in_place(self):
+        qs = Stakeholder.objects.order_by("name")
+        names = lambda: list(Stakeholder.objects.values_list("name", flat=True).order_by("-name"))
+        result_qs, result_names = async_to_sync(gather_queries)(qs, names)
+        self.assertIs(result_qs, qs)
+        self.assertEqual(result_names, ["Gamma", "Beta", "Alpha"])
+        with self.assertNumQueries(0):
+            self.assertEqual([s.name for s in qs], ["Alpha", "Beta", "Gamma"])
+
+    def test_runs_on_worker_threads(self):
+        barrier = threading.Barrier(2, timeout=5)
+
+        def wait_for_other():
+            # Only passes if both callables are running at the same time
+            barrier.wait()
+            return Stakeholder.objects.count()
+
+        self.assertEqual(async_to_sync(gather_queries)(wait_for_other, wait_for_other), [3, 3])
+
+    def test_recorder_sees_worker_queries(self):
+        with QueryRecorder() as recorder:
+            async_to_sync(gather_queries)(Stakeholder.objects.all(), Stakeholder.objects.filter(name="Beta"))
+        self.assertEqual(recorder.count, 2)
+
+    def test_sequential_inside_transaction(self):
+        with transaction.atomic():
+            Stakeholder.objects.create(name="Uncommitted")
+            in_atomic, matches = async_to_sync(gather_queries)(
+                lambda: connection.in_atomic_block,
+                Stakeholder.objects.filter(name="Uncommitted"),
+            )
+        self.assertIs(in_atomic, True)
+        self.assertEqual(len(matches), 1)
+
+
+class GunicornConfTests(SimpleTestCase):
+    def test_auto_workers_cpu_bound(self):
+        from . import gunicorn_conf
+
+        self.assertEqual(gunicorn_conf.auto_workers(cpus=2, memory_mb=8192, worker_memory_mb=150), 5)
+
+    def test_auto_workers_memory_bound(self):
+        from . import gunicorn_conf
+
+        self.assertEqual(gunicorn_conf.auto_workers(cpus=8, memory_mb=512, worker_memory_mb=150), 3)
+        self.assertEqual(gunicorn_conf.auto_workers(cpus=8, memory_mb=100, worker_memory_mb=150), 1)
+        self.assertEqual(gunicorn_conf.auto_workers(cpus=1, memory_mb=None, worker_memory_mb=150), 3)
+
+    def test_env_overrides(self):
+        import importlib
+
+        from . import gunicorn_conf
+
+        env = {"GUNICORN_WORKERS": "7", "GUNICORN_THREADS": "2", "GUNICORN_PRELOAD": "false",
+               "GUNICORN_MAX_REQUESTS": "50"}
+        with mock.patch.dict("os.environ", env):
+            conf = importlib.reload(gunicorn_conf)
+        self.addCleanup(importlib.reload, gunicorn_conf)
+        self.assertEqual((conf.workers, conf.threads, conf.preload_app, conf.max_requests), (7, 2, False, 50))
+        self.assertEqual(conf.worker_class, "gthread")
+
+
+class VersionedCacheTests(TransactionTestCase):
+    """Outside a transaction, as in production (values are never cached inside one)."""
+
+    def setUp(self):
+        cache.clear()
+        self.calls = 0
+
+    def compute(self):
+        self.calls += 1
+        return list(Stakeholder.objects.values_list("name", flat=True))
+
+    def test_cached_until_model_changes(self):
+        self.assertEqual(cached("names", [Stakeholder], self.compute), [])
+        self.assertEqual(cached("names", [Stakeholder], self.compute), [])
+        self.assertEqual(self.calls, 1)
+        s = Stakeholder.objects.create(name="Ada")
+        self.assertEqual(cached("names", [Stakeholder], self.compute), ["Ada"])
+        s.delete()
+        self.assertEqual(cached("names", [Stakeholder], self.compute), [])
+        self.assertEqual(self.calls, 3)
+
+    def test_unrelated_model_keeps_entry(self):
+        from notes.models import Note
+
+        cached("names", [Stakeholder], self.compute)
+        Note.objects.create(title="n", content="c", date=timezone.now())
+        cached("names", [Stakeholder], self.compute)
+        self.assertEqual(self.calls, 1)
+
+    def test_vary_on(self):
+        cached("names", [Stakeholder], self.compute, vary=["a"])
+        cached("names", [Stakeholder], self.compute, vary=["b"])
+        self.assertEqual(self.calls, 2)
+
+    def test_m2m_change_bumps_both_models(self):
+        from assets.models import RealEstate
+        from legal.models import LegalMatter
+
+        matter = LegalMatter.objects.create(title="Dispute")
+        prop = RealEstate.objects.create(name="Lot", address="1 Main")
+        before = model_versions(LegalMatter, RealEstate)
+        matter.related_properties.add(prop)
+        after = model_versions(LegalMatter, RealEstate)
+        self.assertNotEqual(before[0], after[0])
+        self.assertNotEqual(before[1], after[1])
+
+    def test_not_cached_inside_transaction(self):
+        with transaction.atomic():
+            cached("names", [Stakeholder], self.compute)
+            cached("names", [Stakeholder], self.compute)
+        self.assertEqual(self.calls, 2)
+
+    def test_bumped_again_on_commit(self):
+        with transaction.atomic():
+            Stakeholder.objects.create(name="Ada")
+            during = model_versions(Stakeholder)
+        self.assertNotEqual(model_versions(Stakeholder), during)
+
+    def test_chart_data_invalidated_by_new_entry(self):
+        from cashflow.models import CashFlowEntry
+
+        url = reverse("cashflow:chart_data")
+        self.assertEqual(self.client.get(url).json()["categories"]["labels"], [])
+        with self.assertNumQueries(0):
+            self.client.get(url)
+        CashFlowEntry.objects.create(description="Rent", amount=100, entry_type="inflow", category="rent",
+                                     date=timezone.localdate())
+        self.assertEqual(self.client.get(url).json()["categories"]["labels"], ["rent"])
+
+
+class MediaServingTests(TestCase):
+    def setUp(self):
+        import tempfile
+        from pathlib import Path
+
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.root = Path(tmp.name)
+        (self.root / "evidence").mkdir()
+        self.content = bytes(range(256)) * 40
+        (self.root / "evidence" / "clip.mp4").write_bytes(self.content)
+        settings_override = override_settings(MEDIA_ROOT=self.root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.url = "/media/evidence/clip.mp4"
+
+    def test_full_download(self):
+        resp = self.client.get(self.url)
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(b"".join(resp.streaming_content), self.content)
+        self.assertEqual(resp["Content-Type"], "video/mp4")
+        self.assertEqual(resp["Accept-Ranges"], "bytes")
+        self.assertIn("ETag", resp)
+
+    def test_range_request(self):
+        resp = self.client.get(self.url, HTTP_RANGE="bytes=100-199")
+        self.assertEqual(resp.status_code, 206)
+        self.assertEqual(resp["Content-Range"], f"bytes 100-199/{len(self.content)}")
+        self.assertEqual(resp["Content-Length"], "100")
+        self.assertEqual(b"".join(resp.streaming_content), self.content[100:200])
+
+    def test_suffix_and_open_ranges(self):
+        resp = self.client.get(self.url, HTTP_RANGE="bytes=-10")
+        self.assertEqual(b"".join(resp.streaming_content), self.content[-10:])
+        resp = self.client.get(self.url, HTTP_RANGE="bytes=10000-")
+        self.assertEqual(b"".join(resp.streaming_content), self.content[10000:])
+
+    def test_unsatisfiable_range(self):
+        resp = self.client.get(self.url, HTTP_RANGE=f"bytes={len(self.content)}-")
+        self.assertEqual(resp.status_code, 416)
+        self.assertEqual(resp["Content-Range"], f"bytes */{len(self.content)}")
+
+    def test_stale_if_range_sends_whole_file(self):
+        resp = self.client.get(self.url, HTTP_RANGE="bytes=0-9", HTTP_IF_RANGE='"stale"')
+        self.assertEqual(resp.status_code, 200)
+
+    def test_if_range_matches_strong_etag_only(self):
+        etag = self.client.get(self.url)["ETag"]
+        self.assertEqual(self.client.get(self.url, HTTP_RANGE="bytes=0-9", HTTP_IF_RANGE=etag).status_code, 206)
+        resp = self.client.get(self.url, HTTP_RANGE="bytes=0-9", HTTP_IF_RANGE=f"W/{etag}")
+        self.assertEqual(resp.status_code, 200)
+
+    def test_conditional_get(self):
+        etag = self.client.get(self.url)["ETag"]
+        resp = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(resp.status_code, 304)
+
+    def test_missing_and_traversal(self):
+        self.assertEqual(self.client.get("/media/evidence/nope.mp4").status_code, 404)
+        with self.assertRaises(Http404):
+            serve_media(RequestFactory().get("/"), "../outside.txt")
+        self.assertEqual(self.client.post(self.url).status_code, 405)
+
+    def test_x_accel_redirect(self):
+        with override_settings(MEDIA_SERVE_MODE="x-accel", MEDIA_ACCEL_PREFIX="/protected-media/"):
+            resp = self.client.get(self.url)
+        self.assertEqual(resp["X-Accel-Redirect"], "/protected-media/evidence/clip.mp4")
+        self.assertEqual(resp.content, b"")
+
+    def test_x_sendfile(self):
+        with override_settings(MEDIA_SERVE_MODE="x-sendfile"):
+            resp = self.client.get(self.url)
+        self.assertEqual(resp["X-Sendfile"], str(self.root / "evidence" / "clip.mp4"))
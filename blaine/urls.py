@@ -1,7 +1,7 @@
-from django.conf import settings
 from django.contrib import admin
 from django.urls import include, path, re_path
-from django.views.static import serve
+
+from .media import serve_media
 
 urlpatterns = [
     path('admin/', admin.site.urls),
@@ -12,6 +12,7 @@ urlpatterns = [
     path('tasks/', include('tasks.urls')),
     path('cashflow/', include('cashflow.urls')),
     path('notes/', include('notes.urls')),
-    # Serve media files unconditionally (single-user app, no Nginx needed)
-    re_path(r'^media/(?P<path>.*)$', serve, {'document_root': settings.MEDIA_ROOT}),
+    # Serve media files unconditionally (single-user app, no Nginx needed);
+    # Range/conditional GET and proxy offload in blaine.media
+    re_path(r'^media/(?P<path>.*)$', serve_media),
 ]
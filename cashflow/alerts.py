@@ -5,6 +5,7 @@ from django.db.models import Q, Sum
 from django.utils import timezone
 
 from assets.models import Loan
+from cashflow.forecast import loan_outflows
 from cashflow.models import CashFlowEntry
 
 
@@ -52,7 +53,8 @@ def get_liquidity_alerts():
                        f"across {count} loan{'s' if count != 1 else ''}.",
         })
 
-    # 3. Projected shortfall — projected outflows exceed projected inflows for next 30 days
+    # 3. Projected shortfall — projected outflows (plus scheduled loan payments
+    #    not already entered) exceed projected inflows for next 30 days
     projected_entries = CashFlowEntry.objects.filter(
         date__gte=today,
         date__lte=upcoming_cutoff,
@@ -62,7 +64,8 @@ def get_liquidity_alerts():
         inflows=Sum("amount", filter=Q(entry_type="inflow"), default=Decimal("0")),
         outflows=Sum("amount", filter=Q(entry_type="outflow"), default=Decimal("0")),
     )
-    proj_net = proj_totals["inflows"] - proj_totals["outflows"]
+    loan_payments = sum(Decimal(str(amount)) for _day, amount, _loan in loan_outflows(today, upcoming_cutoff))
+    proj_net = proj_totals["inflows"] - proj_totals["outflows"] - loan_payments
     if proj_net < 0:
         alerts.append({
             "level": "warning",
@@ -0,0 +1,48 @@
+"""Cash flow forecast: projected entries plus scheduled loan payments.
+
+Loan payments come from the amortization schedules (assets.amortization).
+A loan that already has projected entries in the window is left to those
+entries, so payments someone forecast by hand aren't counted twice.
+"""
+from datetime import timedelta
+
+from django.db.models import Sum
+
+from assets.amortization import add_months, projected_payments
+from cashflow.models import CashFlowEntry
+
+
+def loan_outflows(start, end):
+    """[(date, amount, loan pk)] of scheduled loan payments not already forecast as entries."""
+    covered = CashFlowEntry.objects.filter(
+        is_projected=True, date__gte=start, date__lte=end, related_loan__isnull=False,
+    ).order_by().values_list("related_loan_id", flat=True).distinct()
+    return projected_payments(start, end, exclude=set(covered))
+
+
+def monthly_forecast(today, months=12):
+    """Projected inflows, outflows and loan payments per month, this month first."""
+    month_start = today.replace(day=1)
+    end = add_months(month_start, months) - timedelta(days=1)
+    month_starts = [add_months(month_start, i) for i in range(months)]
+    totals = {m: {"inflow": 0.0, "outflow": 0.0, "loan": 0.0} for m in month_starts}
+
+    # Daily totals bucketed here: grouping by the plain date column walks the
+    # (is_projected, date) index, where TruncMonth would call a function per row
+    daily = (
+        CashFlowEntry.objects.filter(is_projected=True, date__gte=today, date__lte=end)
+        .values("date", "entry_type")
+        .annotate(total=Sum("amount"))
+        .order_by()
+    )
+    for row in daily:
+        totals[row["date"].replace(day=1)][row["entry_type"]] += float(row["total"])
+    for day, amount, _loan in loan_outflows(today, end):
+        totals[day.replace(day=1)]["loan"] += amount
+
+    return {
+        "labels": [m.strftime("%b %Y") for m in month_starts],
+        "inflows": [round(totals[m]["inflow"], 2) for m in month_starts],
+        "outflows": [round(totals[m]["outflow"], 2) for m in month_starts],
+        "loan_payments": [round(totals[m]["loan"], 2) for m in month_starts],
+    }
@@ -0,0 +1,35 @@
+# Generated by Django 6.0.2 on 2026-10-19 08:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('assets', '0002_list_view_indexes'),
+        ('cashflow', '0001_initial'),
+        ('stakeholders', '0002_list_view_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='cashflowentry',
+            index=models.Index(fields=['date'], name='cashflow_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='cashflowentry',
+            index=models.Index(fields=['entry_type', 'is_projected', 'date', 'amount'], name='cashflow_type_proj_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='cashflowentry',
+            index=models.Index(fields=['is_projected', 'date'], name='cashflow_proj_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='cashflowentry',
+            index=models.Index(fields=['amount'], name='cashflow_amount_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='cashflowentry',
+            index=models.Index(fields=['is_projected', 'category', 'amount'], name='cashflow_proj_cat_idx'),
+        ),
+    ]
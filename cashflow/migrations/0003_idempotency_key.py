@@ -0,0 +1,18 @@
+# Generated by Django 6.0.2 on 2026-10-19 10:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cashflow', '0002_list_view_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='cashflowentry',
+            name='idempotency_key',
+            field=models.CharField(blank=True, editable=False, max_length=64, null=True, unique=True),
+        ),
+    ]
@@ -27,6 +27,8 @@ class CashFlowEntry(models.Model):
         null=True, blank=True, related_name="cash_flow_entries",
     )
     notes_text = models.TextField(blank=True)
+    # Set by automated postings (e.g. "loan:12:2026-10-01") so a rerun can't post twice
+    idempotency_key = models.CharField(max_length=64, unique=True, null=True, blank=True, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
 
     def __str__(self):
@@ -38,3 +40,12 @@ class CashFlowEntry(models.Model):
     class Meta:
         verbose_name_plural = "Cash flow entries"
         ordering = ["-date"]
+        indexes = [
+            models.Index(fields=["date"], name="cashflow_date_idx"),
+            models.Index(fields=["entry_type", "is_projected", "date", "amount"],
+                         name="cashflow_type_proj_date_idx"),
+            models.Index(fields=["is_projected", "date"], name="cashflow_proj_date_idx"),
+            models.Index(fields=["amount"], name="cashflow_amount_idx"),
+            # Covers the chart's category breakdown (GROUP BY category)
+            models.Index(fields=["is_projected", "category", "amount"], name="cashflow_proj_cat_idx"),
+        ]
@@ -165,6 +165,19 @@ class ChartDataTests(TestCase):
         self.assertIn("labels", data["categories"])
         self.assertIn("values", data["categories"])
 
+    def test_forecast_includes_loan_payments(self):
+        today = timezone.localdate()
+        Loan.objects.create(
+            name="Car", status="active", current_balance=Decimal("2500"), interest_rate=Decimal("0"),
+            monthly_payment=Decimal("1000"), next_payment_date=today.replace(day=1) + timedelta(days=40),
+        )
+        forecast = json.loads(self.client.get(reverse("cashflow:chart_data")).content)["forecast"]
+        self.assertEqual(len(forecast["labels"]), 12)
+        self.assertEqual(forecast["labels"][0], today.strftime("%b %Y"))
+        self.assertEqual(forecast["inflows"][0], 1000.0)  # the projected entry dated today
+        self.assertEqual(sum(forecast["loan_payments"]), 2500.0)
+        self.assertEqual(forecast["loan_payments"][0], 0)
+
 
 class LiquidityAlertTests(TestCase):
     def test_net_negative_flow(self):
@@ -220,6 +233,27 @@ class LiquidityAlertTests(TestCase):
         warnings = [a for a in alerts if a["title"] == "Large Upcoming Payments"]
         self.assertEqual(len(warnings), 0)
 
+    def test_scheduled_loan_payments_count_toward_shortfall(self):
+        today = timezone.localdate()
+        loan = Loan.objects.create(
+            name="Mortgage", status="active", current_balance=Decimal("100000"), interest_rate=Decimal("6"),
+            monthly_payment=Decimal("2000"), next_payment_date=today + timedelta(days=10),
+        )
+        CashFlowEntry.objects.create(
+            description="Rent", amount=Decimal("1500"), entry_type="inflow",
+            date=today + timedelta(days=5), is_projected=True,
+        )
+        alerts = get_liquidity_alerts()
+        self.assertEqual(len([a for a in alerts if a["title"] == "Projected Shortfall"]), 1)
+
+        # A payment already forecast as an entry isn't counted twice
+        CashFlowEntry.objects.create(
+            description="Mortgage", amount=Decimal("1000"), entry_type="outflow",
+            date=today + timedelta(days=10), is_projected=True, related_loan=loan,
+        )
+        alerts = get_liquidity_alerts()
+        self.assertEqual(len([a for a in alerts if a["title"] == "Projected Shortfall"]), 0)
+
     def test_projected_shortfall(self):
         today = timezone.localdate()
         CashFlowEntry.objects.create(
@@ -9,13 +9,22 @@ from django.urls import reverse_lazy
 from django.utils import timezone
 from django.views.generic import CreateView, DeleteView, ListView, UpdateView
 
+from assets.models import Loan
+
 from .forms import CashFlowEntryForm
 from .models import CashFlowEntry
 
 
 def chart_data(request):
     """JSON endpoint for Chart.js — monthly trend and category breakdown."""
+    from blaine.cache import cached
+
     today = timezone.localdate()
+    data = cached("cashflow:chart_data", [CashFlowEntry, Loan], lambda: _chart_data(today), vary=[today])
+    return JsonResponse(data)
+
+
+def _chart_data(today):
     six_months_ago = today.replace(day=1)
     for _ in range(5):
         six_months_ago = (six_months_ago - __import__('datetime').timedelta(days=1)).replace(day=1)
@@ -50,10 +59,14 @@ def chart_data(request):
     cat_labels = [c["category"] for c in categories]
     cat_values = [float(c["total"]) for c in categories]
 
-    return JsonResponse({
+    from .forecast import monthly_forecast
+
+    return {
         "monthly": {"labels": month_labels, "inflows": inflows, "outflows": outflows},
         "categories": {"labels": cat_labels, "values": cat_values},
-    })
+        # Next 12 months: projected entries plus amortized loan payments
+        "forecast": monthly_forecast(today),
+    }
 
 
 def export_csv(request):
@@ -3,3 +3,10 @@ from django.apps import AppConfig
 
 class DashboardConfig(AppConfig):
     name = 'dashboard'
+
+    def ready(self):
+        from blaine.cache import connect_signals
+        from dashboard import deadlines
+
+        connect_signals()
+        deadlines.connect_signals()
@@ -0,0 +1,159 @@
+"""Maintenance and queries for the Deadline projection.
+
+Task, Loan, LegalMatter and ContactLog saves/deletes re-project that one
+object (post_save / post_delete, connected in DashboardConfig.ready), so
+the table always mirrors the open obligations. Code that writes those
+models in bulk (``QuerySet.update``, ``bulk_create``) must call
+``sync_objects`` or ``rebuild`` itself; ``manage.py rebuild_deadlines``
+re-projects everything.
+"""
+from datetime import timedelta
+
+from django.db import transaction
+from django.urls import reverse
+from django.utils import timezone
+
+from blaine.cache import mark_changed
+
+HORIZONS = (7, 14, 30)
+DEFAULT_HORIZON = 30
+
+# source model label -> deadline kinds it produces
+SOURCE_KINDS = {
+    "tasks.task": ("task", "reminder"),
+    "assets.loan": ("payment", "maturity"),
+    "legal.legalmatter": ("hearing",),
+    "stakeholders.contactlog": ("contact",),
+}
+
+
+def _task_rows(task):
+    if task.status == "complete":
+        return []
+    url = reverse("tasks:detail", kwargs={"pk": task.pk})
+    common = {"object_id": task.pk, "title": task.title, "priority": task.priority,
+              "stakeholder_id": task.related_stakeholder_id, "url": url}
+    rows = []
+    if task.due_date:
+        rows.append({"kind": "task", "date": task.due_date, **common})
+    if task.reminder_date:
+        rows.append({"kind": "reminder", "date": timezone.localdate(task.reminder_date),
+                     "at": task.reminder_date, **common})
+    return rows
+
+
+def _loan_rows(loan):
+    if loan.status != "active":
+        return []
+    url = reverse("assets:loan_detail", kwargs={"pk": loan.pk})
+    common = {"object_id": loan.pk, "title": loan.name, "stakeholder_id": loan.lender_id, "url": url}
+    rows = []
+    if loan.next_payment_date:
+        rows.append({"kind": "payment", "date": loan.next_payment_date, **common})
+    if loan.maturity_date:
+        rows.append({"kind": "maturity", "date": loan.maturity_date, **common})
+    return rows
+
+
+def _hearing_rows(matter):
+    if matter.status == "resolved" or not matter.next_hearing_date:
+        return []
+    return [{"kind": "hearing", "date": matter.next_hearing_date, "object_id": matter.pk,
+             "title": matter.title, "url": reverse("legal:detail", kwargs={"pk": matter.pk})}]
+
+
+def _contact_rows(log):
+    if not log.follow_up_needed or not log.follow_up_date:
+        return []
+    return [{"kind": "contact", "date": log.follow_up_date, "object_id": log.pk,
+             "stakeholder_id": log.stakeholder_id,
+             "url": reverse("stakeholders:detail", kwargs={"pk": log.stakeholder_id})}]
+
+
+PROJECTIONS = {
+    "tasks.task": _task_rows,
+    "assets.loan": _loan_rows,
+    "legal.legalmatter": _hearing_rows,
+    "stakeholders.contactlog": _contact_rows,
+}
+
+
+def _deadline_model(models=None):
+    if models is not None:
+        return models["dashboard.deadline"]
+    from dashboard.models import Deadline
+
+    return Deadline
+
+
+def sync_objects(model, objects):
+    """Re-project the given source objects (e.g. after a bulk update)."""
+    Deadline = _deadline_model()
+    label = model._meta.label_lower
+    objects = list(objects)
+    with transaction.atomic():
+        Deadline.objects.filter(kind__in=SOURCE_KINDS[label], object_id__in=[o.pk for o in objects]).delete()
+        Deadline.objects.bulk_create(
+            Deadline(**row) for obj in objects for row in PROJECTIONS[label](obj)
+        )
+    mark_changed(Deadline)
+
+
+def remove_objects(model, pks):
+    Deadline = _deadline_model()
+    Deadline.objects.filter(kind__in=SOURCE_KINDS[model._meta.label_lower], object_id__in=pks).delete()
+    mark_changed(Deadline)
+
+
+def rebuild(models=None, batch_size=1000):
+    """Rebuild the whole projection. ``models`` maps labels to model classes."""
+    if models is None:
+        from django.apps import apps
+
+        models = {label: apps.get_model(label) for label in [*SOURCE_KINDS, "dashboard.deadline"]}
+    Deadline = _deadline_model(models)
+    with transaction.atomic():
+        Deadline.objects.all().delete()
+        count = 0
+        for label, project in PROJECTIONS.items():
+            rows = [Deadline(**row) for obj in models[label].objects.order_by().iterator() for row in project(obj)]
+            Deadline.objects.bulk_create(rows, batch_size=batch_size)
+            count += len(rows)
+    mark_changed("dashboard.deadline")
+    return count
+
+
+def _on_save(sender, instance, **kwargs):
+    sync_objects(sender, [instance])
+
+
+def _on_delete(sender, instance, **kwargs):
+    remove_objects(sender, [instance.pk])
+
+
+def connect_signals():
+    from django.apps import apps
+    from django.db.models.signals import post_delete, post_save
+
+    for label in SOURCE_KINDS:
+        model = apps.get_model(label)
+        post_save.connect(_on_save, sender=model, dispatch_uid=f"deadlines.save.{label}")
+        post_delete.connect(_on_delete, sender=model, dispatch_uid=f"deadlines.delete.{label}")
+
+
+def upcoming(days=DEFAULT_HORIZON, start=None, kinds=None):
+    """Deadlines from ``start`` (default today) through ``days`` days ahead, in date order."""
+    start = start or timezone.localdate()
+    return between(start, start + timedelta(days=days), kinds)
+
+
+def between(start=None, end=None, kinds=None):
+    """Deadlines with start <= date <= end (either bound optional), in date order."""
+    qs = _deadline_model().objects.select_related("stakeholder")
+    if start:
+        qs = qs.filter(date__gte=start)
+    if end:
+        qs = qs.filter(date__lte=end)
+    if kinds:
+        qs = qs.filter(kind__in=kinds)
+    return qs
@@ -0,0 +1,84 @@
+"""
+Benchmark stakeholder PDF export latency with a large contact log.
+Usage: python manage.py benchmark_pdf [--logs 500] [--runs 5]
+
+All benchmark rows are created inside a transaction that is rolled back.
+"""
+import statistics
+import tempfile
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.test import RequestFactory, override_settings
+from django.utils import timezone
+
+from blaine.pdf_export import _get_styles
+from stakeholders.models import ContactLog, Stakeholder
+from stakeholders.views import export_pdf_detail
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = "Time stakeholder PDF export: cold, warm styles, and disk cache hit"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--logs", type=int, default=500, help="Contact logs on the stakeholder")
+        parser.add_argument("--runs", type=int, default=5, help="Timed runs per scenario")
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                self._run(options["logs"], options["runs"])
+                raise _Rollback
+        except _Rollback:
+            pass
+
+    def _run(self, log_count, runs):
+        now = timezone.now()
+        stakeholder = Stakeholder.objects.create(name="Benchmark Stakeholder", entity_type="contact")
+        ContactLog.objects.bulk_create([
+            ContactLog(stakeholder=stakeholder, date=now, method="call",
+                       summary=f"Benchmark contact log entry {i}", follow_up_needed=i % 3 == 0)
+            for i in range(log_count)
+        ])
+        request = RequestFactory().get("/")
+
+        def timed(setup=None):
+            samples = []
+            for _ in range(runs):
+                with tempfile.TemporaryDirectory() as cache_dir:
+                    with override_settings(PDF_CACHE_DIR=cache_dir):
+                        if setup:
+                            setup()
+                        start = time.perf_counter()
+                        export_pdf_detail(request, stakeholder.pk)
+                        samples.append((time.perf_counter() - start) * 1000)
+            return samples
+
+        def cache_hit():
+            samples = []
+            with tempfile.TemporaryDirectory() as cache_dir:
+                with override_settings(PDF_CACHE_DIR=cache_dir):
+                    export_pdf_detail(request, stakeholder.pk)
+                    for _ in range(runs):
+                        start = time.perf_counter()
+                        export_pdf_detail(request, stakeholder.pk)
+                        samples.append((time.perf_counter() - start) * 1000)
+            return samples
+
+        results = [
+            ("before (styles rebuilt, no cache)", timed(setup=_get_styles.cache_clear)),
+            ("after, cache miss (shared styles)", timed()),
+            ("after, cache hit", cache_hit()),
+        ]
+
+        self.stdout.write(f"Stakeholder PDF with {log_count} contact logs, {runs} run(s) each:")
+        for label, samples in results:
+            self.stdout.write(
+                f"  {label:<36} median {statistics.median(samples):8.1f} ms"
+                f"   min {min(samples):8.1f} ms"
+            )
@@ -0,0 +1,112 @@
+"""
+Run every container startup step in one process.
+Usage: python manage.py bootstrap [--force]
+
+Replaces separate migrate / collectstatic / createsuperuser / setup_schedules /
+load_sample_data invocations, each of which paid a full Django boot.
+migrate is skipped when the migration plan is empty, and collectstatic when
+a fingerprint of the source static files (path, size, mtime) matches the one
+saved by the previous run. Sample data is loaded only when
+LOAD_SAMPLE_DATA=true and the database has no stakeholders.
+"""
+import hashlib
+import io
+import os
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.staticfiles.finders import get_finders
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.migrations.executor import MigrationExecutor
+
+FINGERPRINT_FILE = ".static-fingerprint"
+
+
+def pending_migrations(database=DEFAULT_DB_ALIAS):
+    """Return the unapplied migration plan (empty when the schema is current)."""
+    executor = MigrationExecutor(connections[database])
+    return executor.migration_plan(executor.loader.graph.leaf_nodes())
+
+
+def static_fingerprint():
+    """Digest of every file collectstatic would copy, plus the storage backend."""
+    digest = hashlib.sha256(repr(settings.STORAGES.get("staticfiles")).encode())
+    entries = []
+    for finder in get_finders():
+        for path, storage in finder.list(["CVS", ".*", "*~"]):
+            stat = os.stat(storage.path(path))
+            entries.append(f"{path}\0{stat.st_size}\0{stat.st_mtime_ns}")
+    for entry in sorted(entries):
+        digest.update(entry.encode())
+    return digest.hexdigest()
+
+
+class Command(BaseCommand):
+    help = "Run all startup steps (migrate, collectstatic, superuser, schedules, sample data) in one process"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--force", action="store_true", help="Run migrate and collectstatic unconditionally")
+
+    def handle(self, *args, **options):
+        self.force = options["force"]
+        started = time.perf_counter()
+        for label, step in [
+            ("migrate", self._migrate),
+            ("collectstatic", self._collectstatic),
+            ("createsuperuser", self._superuser),
+            ("setup_schedules", self._schedules),
+            ("sample data", self._sample_data),
+        ]:
+            start = time.perf_counter()
+            result = step()
+            self.stdout.write(f"  {label:<16} {(time.perf_counter() - start) * 1000:8.0f} ms  {result}")
+        self.stdout.write(self.style.SUCCESS(f"Bootstrap finished in {time.perf_counter() - started:.2f}s."))
+
+    def _migrate(self):
+        plan = pending_migrations()
+        if not plan and not self.force:
+            return "up to date, skipped"
+        call_command("migrate", interactive=False, verbosity=0)
+        return f"applied {len(plan)} migration(s)"
+
+    def _collectstatic(self):
+        marker = Path(settings.STATIC_ROOT) / FINGERPRINT_FILE
+        fingerprint = static_fingerprint()
+        if not self.force and marker.exists() and marker.read_text() == fingerprint:
+            return "unchanged, skipped"
+        call_command("collectstatic", interactive=False, verbosity=0)
+        marker.write_text(fingerprint)
+        return "collected"
+
+    def _superuser(self):
+        from django.contrib.auth import get_user_model
+
+        username = os.environ.get("DJANGO_SUPERUSER_USERNAME")
+        if not username:
+            return "DJANGO_SUPERUSER_USERNAME not set, skipped"
+        User = get_user_model()
+        if User.objects.filter(**{User.USERNAME_FIELD: username}).exists():
+            return "exists, skipped"
+        try:
+            call_command("createsuperuser", interactive=False, verbosity=0)
+        except CommandError as e:
+            return f"skipped ({e})"
+        return "created"
+
+    def _schedules(self):
+        call_command("setup_schedules", stdout=io.StringIO())
+        return "registered"
+
+    def _sample_data(self):
+        if os.environ.get("LOAD_SAMPLE_DATA", "").lower() != "true":
+            return "LOAD_SAMPLE_DATA not set, skipped"
+        from dashboard.sample_data import load_sample_data
+        from stakeholders.models import Stakeholder
+
+        if Stakeholder.objects.exists():
+            return "already loaded, skipped"
+        counts = load_sample_data(log=lambda msg: None)
+        return f"loaded {sum(counts.values())} rows"
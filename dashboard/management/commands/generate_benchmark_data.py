@@ -0,0 +1,380 @@
+"""
+Generate a large, seeded synthetic dataset for load testing.
+Usage: python manage.py generate_benchmark_data [--scale 1.0] [--seed 42] [--clear]
+
+At --scale 1 this creates roughly 10k stakeholders, 100k relationships,
+1M cash flow entries and 200k notes (see VOLUMES). Rows are built in memory
+and written with bulk_create in batches inside one transaction; the same
+seed and scale always produce the same data.
+"""
+import random
+import time
+from datetime import date, datetime, time as dtime, timedelta
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+
+from assets import risk
+from assets.models import Investment, Loan, RealEstate, ValueChange
+from blaine.cache import mark_changed
+from cashflow.models import CashFlowEntry
+from dashboard import deadlines, networth
+from dashboard.models import AssetSnapshot, Deadline, NetWorthSnapshot, Notification
+from legal.models import Evidence, LegalMatter
+from notes.models import Attachment, Note
+from stakeholders.models import ContactLog, Relationship, Stakeholder
+from tasks.models import FollowUp, Task
+
+# Rows per model at --scale 1
+VOLUMES = {
+    "stakeholders": 10_000,
+    "relationships": 100_000,
+    "contact_logs": 50_000,
+    "properties": 1_000,
+    "investments": 1_000,
+    "loans": 1_000,
+    "legal_matters": 2_000,
+    "evidence": 5_000,
+    "tasks": 20_000,
+    "follow_ups": 10_000,
+    "cash_flow": 1_000_000,
+    "notes": 200_000,
+    "net_worth_days": 3_650,
+}
+
+FIRST_NAMES = ["Alex", "Jordan", "Morgan", "Taylor", "Casey", "Riley", "Jamie", "Avery", "Quinn", "Drew",
+               "Harper", "Reese", "Rowan", "Sage", "Emerson", "Parker", "Hayden", "Kendall", "Logan", "Blake"]
+LAST_NAMES = ["Reed", "Liu", "Driscoll", "Cobb", "Vasquez", "Whitfield", "Holston", "Patel", "Huang", "Moreno",
+              "Calloway", "Park", "Nguyen", "Okafor", "Schmidt", "Rossi", "Kowalski", "Haddad", "Silva", "Brennan"]
+ORG_SUFFIXES = ["LLC", "Group", "Partners", "Holdings", "& Associates", "Capital", "Advisory", "Law"]
+STREETS = ["Oak Ave", "Elm St", "Magnolia Blvd", "Cedar Ln", "Pine Rd", "Maple Dr", "Birch Way", "Willow Ct"]
+CITIES = ["Austin, TX", "Houston, TX", "Dallas, TX", "Denver, CO", "Phoenix, AZ", "Tampa, FL"]
+RELATIONSHIP_TYPES = ["colleague", "business associate", "referral partner", "contractor", "counsel", "lender"]
+CATEGORIES = ["Rent", "Mortgage", "Legal Fees", "Insurance", "Taxes", "Repairs", "Utilities", "Dividends",
+              "Consulting", "Payroll"]
+WORDS = ["property", "closing", "payment", "hearing", "motion", "appraisal", "invoice", "lease", "escrow",
+         "deposition", "settlement", "inspection", "refinance", "tenant", "filing", "review"]
+
+
+def _through_models(model):
+    return [field.remote_field.through for field in model._meta.many_to_many]
+
+
+def _choice_values(choices):
+    return [value for value, _label in choices]
+
+
+class Command(BaseCommand):
+    help = "Generate a large seeded synthetic dataset for benchmarking"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--scale", type=float, default=1.0, help="Multiplier applied to VOLUMES")
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument("--batch-size", type=int, default=5000)
+        parser.add_argument("--clear", action="store_true", help="Delete existing data first")
+
+    def handle(self, *args, **options):
+        if Stakeholder.objects.exists() and not options["clear"]:
+            raise CommandError("Database already has data; pass --clear to replace it.")
+
+        self.rng = random.Random(options["seed"])
+        self.batch_size = options["batch_size"]
+        self.today = date.today()
+        self.counts = {key: max(1, int(n * options["scale"])) for key, n in VOLUMES.items()}
+
+        self.changed = set()
+        started = time.perf_counter()
+        with transaction.atomic():
+            if options["clear"]:
+                self._step("Clearing existing data", self._clear)
+            self._step("Stakeholders", self._stakeholders)
+            self._step("Relationships", self._relationships)
+            self._step("Contact logs", self._contact_logs)
+            self._step("Properties, investments, loans", self._assets)
+            self._step("Legal matters and evidence", self._legal)
+            self._step("Tasks and follow-ups", self._tasks)
+            self._step("Cash flow entries", self._cash_flow)
+            self._step("Notes", self._notes)
+            self._step("Deadline index", deadlines.rebuild)
+            self._step("Risk scores", risk.rebuild)
+            self._step("Net worth history", self._net_worth_history)
+        # bulk writes skip the signals that version the caches
+        for model in self.changed:
+            mark_changed(model)
+        self.stdout.write(self.style.SUCCESS(f"Done in {time.perf_counter() - started:.1f}s."))
+
+    def _step(self, label, func):
+        start = time.perf_counter()
+        created = func()
+        suffix = f" ({created:,} rows)" if created else ""
+        self.stdout.write(f"  {label:<32} {time.perf_counter() - start:7.1f}s{suffix}")
+
+    # --- helpers ---
+
+    def _written(self, model):
+        """Note a model written without signals, for mark_changed at the end."""
+        if model._meta.auto_created:  # an m2m through table versions both sides
+            self.changed.update(field.related_model for field in model._meta.fields if field.is_relation)
+        else:
+            self.changed.add(model)
+
+    def _batched(self, model, rows, **kwargs):
+        """bulk_create an iterable of unsaved instances in batch_size chunks."""
+        self._written(model)
+        batch, total = [], 0
+        for obj in rows:
+            batch.append(obj)
+            if len(batch) >= self.batch_size:
+                model.objects.bulk_create(batch, batch_size=self.batch_size, **kwargs)
+                total += len(batch)
+                batch = []
+        if batch:
+            model.objects.bulk_create(batch, batch_size=self.batch_size, **kwargs)
+            total += len(batch)
+        return total
+
+    def _day(self, back=730, ahead=90):
+        return self.today + timedelta(days=self.rng.randint(-back, ahead))
+
+    def _moment(self, back=730, ahead=0):
+        day = self._day(back, ahead)
+        return timezone.make_aware(datetime.combine(day, dtime(self.rng.randint(7, 19), self.rng.randint(0, 59))))
+
+    def _sentence(self, words=8):
+        return " ".join(self.rng.choice(WORDS) for _ in range(words)).capitalize() + "."
+
+    def _money(self, low, high):
+        return Decimal(self.rng.randint(low * 100, high * 100)) / 100
+
+    def _pks(self, model):
+        return list(model.objects.values_list("pk", flat=True))
+
+    def _clear(self):
+        # Raw deletes, children first: the project's post_delete receivers
+        # (cache versions, deadlines, risk) would otherwise make Django fetch
+        # and delete every row one signal at a time. Value history, asset
+        # snapshots and notifications point at rows by id, so they go too.
+        for model in (ValueChange, AssetSnapshot, Notification, *_through_models(Note), Attachment, Note, NetWorthSnapshot, CashFlowEntry, FollowUp, Task,
+                      *_through_models(LegalMatter), Evidence, LegalMatter, Loan, Investment, RealEstate,
+                      ContactLog, Relationship, Deadline, Stakeholder):
+            model.objects.all()._raw_delete(model.objects.db)
+            self._written(model)
+
+    # --- generators ---
+
+    def _stakeholders(self):
+        types = _choice_values(Stakeholder.ENTITY_TYPE_CHOICES)
+        rng = self.rng
+
+        def rows():
+            for i in range(self.counts["stakeholders"]):
+                first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+                yield Stakeholder(
+                    name=f"{first} {last} {i}", entity_type=rng.choice(types),
+                    email=f"{first.lower()}.{last.lower()}{i}@example.com",
+                    phone=f"555-{rng.randint(100, 999)}-{rng.randint(1000, 9999)}",
+                    organization=f"{last} {rng.choice(ORG_SUFFIXES)}" if rng.random() < 0.6 else "",
+                    trust_rating=rng.randint(1, 5), risk_rating=rng.randint(1, 5),
+                    notes_text=self._sentence(12),
+                )
+
+        created = self._batched(Stakeholder, rows())
+        self.stakeholder_ids = self._pks(Stakeholder)
+        return created
+
+    def _relationships(self):
+        ids, rng = self.stakeholder_ids, self.rng
+
+        def rows():
+            for _ in range(self.counts["relationships"]):
+                a, b = rng.sample(ids, 2) if len(ids) > 1 else (ids[0], ids[0])
+                yield Relationship(from_stakeholder_id=a, to_stakeholder_id=b,
+                                   relationship_type=rng.choice(RELATIONSHIP_TYPES),
+                                   description=self._sentence(6))
+
+        return self._batched(Relationship, rows(), ignore_conflicts=True)
+
+    def _contact_logs(self):
+        methods = _choice_values(ContactLog.METHOD_CHOICES)
+        rng = self.rng
+
+        def rows():
+            for _ in range(self.counts["contact_logs"]):
+                follow_up = rng.random() < 0.2
+                yield ContactLog(stakeholder_id=rng.choice(self.stakeholder_ids), date=self._moment(),
+                                 method=rng.choice(methods), summary=self._sentence(15),
+                                 follow_up_needed=follow_up, follow_up_date=self._day(30, 30) if follow_up else None)
+
+        return self._batched(ContactLog, rows())
+
+    def _assets(self):
+        rng = self.rng
+        property_statuses = _choice_values(RealEstate.STATUS_CHOICES)
+        loan_statuses = _choice_values(Loan.STATUS_CHOICES)
+
+        created = self._batched(RealEstate, (
+            RealEstate(name=f"{rng.randint(100, 9999)} {rng.choice(STREETS)} #{i}",
+                       address=f"{rng.randint(100, 9999)} {rng.choice(STREETS)}, {rng.choice(CITIES)}",
+                       jurisdiction=rng.choice(CITIES), property_type=rng.choice(["Residential", "Commercial"]),
+                       estimated_value=self._money(80_000, 2_500_000), acquisition_date=self._day(3650, 0),
+                       status=rng.choices(property_statuses, weights=[80, 5, 10, 5])[0],
+                       stakeholder_id=rng.choice(self.stakeholder_ids))
+            for i in range(self.counts["properties"])
+        ))
+        self.property_ids = self._pks(RealEstate)
+        created += self._batched(Investment, (
+            Investment(name=f"Investment {i}", investment_type=rng.choice(["Stocks", "Bonds", "Fund", "Private"]),
+                       institution=f"{rng.choice(LAST_NAMES)} {rng.choice(ORG_SUFFIXES)}",
+                       current_value=self._money(1_000, 1_000_000), stakeholder_id=rng.choice(self.stakeholder_ids))
+            for i in range(self.counts["investments"])
+        ))
+
+        def loans():
+            for i in range(self.counts["loans"]):
+                original = self._money(20_000, 1_500_000)
+                yield Loan(name=f"Loan {i}", lender_id=rng.choice(self.stakeholder_ids),
+                           original_amount=original, current_balance=(original * Decimal(rng.random())).quantize(Decimal("0.01")),
+                           interest_rate=Decimal(rng.randint(300, 1200)) / 100,
+                           monthly_payment=self._money(300, 12_000), next_payment_date=self._day(10, 60),
+                           maturity_date=self._day(0, 3650),
+                           collateral_property_id=rng.choice(self.property_ids) if rng.random() < 0.6 else None,
+                           status=rng.choices(loan_statuses, weights=[80, 10, 5, 5])[0])
+
+        created += self._batched(Loan, loans())
+        self.loan_ids = self._pks(Loan)
+        return created
+
+    def _legal(self):
+        rng = self.rng
+        types = _choice_values(LegalMatter.MATTER_TYPE_CHOICES)
+        statuses = _choice_values(LegalMatter.STATUS_CHOICES)
+        matters = [
+            LegalMatter(title=f"Matter {i}: {self._sentence(3)}", case_number=f"{rng.randint(2015, 2026)}-CV-{i:05d}",
+                        matter_type=rng.choice(types), status=rng.choice(statuses),
+                        jurisdiction=rng.choice(CITIES), court="District Court",
+                        filing_date=self._day(1460, 0),
+                        next_hearing_date=self._day(30, 120) if rng.random() < 0.5 else None,
+                        description=self._sentence(20))
+            for i in range(self.counts["legal_matters"])
+        ]
+        created = self._batched(LegalMatter, matters)
+        self.matter_ids = self._pks(LegalMatter)
+
+        through = LegalMatter.related_stakeholders.through
+        created += self._batched(through, (
+            through(legalmatter_id=pk, stakeholder_id=s)
+            for pk in self.matter_ids for s in set(rng.sample(self.stakeholder_ids, min(3, len(self.stakeholder_ids))))
+        ))
+        through = LegalMatter.attorneys.through
+        created += self._batched(through, (
+            through(legalmatter_id=pk, stakeholder_id=rng.choice(self.stakeholder_ids)) for pk in self.matter_ids
+        ))
+        through = LegalMatter.related_properties.through
+        created += self._batched(through, (
+            through(legalmatter_id=pk, realestate_id=rng.choice(self.property_ids))
+            for pk in self.matter_ids if rng.random() < 0.4
+        ))
+        created += self._batched(Evidence, (
+            Evidence(legal_matter_id=rng.choice(self.matter_ids), title=f"Exhibit {i}",
+                     description=self._sentence(10), evidence_type=rng.choice(["Document", "Photo", "Email"]),
+                     date_obtained=self._day(1000, 0))
+            for i in range(self.counts["evidence"])
+        ))
+        return created
+
+    def _tasks(self):
+        rng = self.rng
+        statuses = _choice_values(Task.STATUS_CHOICES)
+        priorities = _choice_values(Task.PRIORITY_CHOICES)
+        methods = _choice_values(FollowUp.METHOD_CHOICES)
+
+        def tasks():
+            for i in range(self.counts["tasks"]):
+                status = rng.choices(statuses, weights=[30, 20, 10, 40])[0]
+                yield Task(title=f"Task {i}: {self._sentence(4)}", description=self._sentence(12),
+                           due_date=self._day(180, 120), status=status, priority=rng.choice(priorities),
+                           related_stakeholder_id=rng.choice(self.stakeholder_ids) if rng.random() < 0.7 else None,
+                           related_legal_matter_id=rng.choice(self.matter_ids) if rng.random() < 0.3 else None,
+                           related_property_id=rng.choice(self.property_ids) if rng.random() < 0.2 else None,
+                           completed_at=self._moment(180) if status == "complete" else None)
+
+        created = self._batched(Task, tasks())
+        task_ids = self._pks(Task)
+
+        def follow_ups():
+            for _ in range(self.counts["follow_ups"]):
+                responded = rng.random() < 0.6
+                outreach = self._moment(120)
+                yield FollowUp(task_id=rng.choice(task_ids), stakeholder_id=rng.choice(self.stakeholder_ids),
+                               outreach_date=outreach, method=rng.choice(methods), response_received=responded,
+                               response_date=outreach + timedelta(days=rng.randint(1, 10)) if responded else None)
+
+        created += self._batched(FollowUp, follow_ups())
+        self.task_ids = task_ids
+        return created
+
+    def _cash_flow(self):
+        rng = self.rng
+
+        def rows():
+            for i in range(self.counts["cash_flow"]):
+                entry_type = "inflow" if rng.random() < 0.45 else "outflow"
+                day = self._day(1825, 180)
+                yield CashFlowEntry(
+                    description=f"{rng.choice(CATEGORIES)} {i}", amount=self._money(10, 25_000),
+                    entry_type=entry_type, category=rng.choice(CATEGORIES), date=day,
+                    is_projected=day > self.today or rng.random() < 0.05,
+                    related_stakeholder_id=rng.choice(self.stakeholder_ids) if rng.random() < 0.3 else None,
+                    related_property_id=rng.choice(self.property_ids) if rng.random() < 0.3 else None,
+                    related_loan_id=rng.choice(self.loan_ids) if rng.random() < 0.1 else None,
+                )
+
+        return self._batched(CashFlowEntry, rows())
+
+    def _net_worth_history(self):
+        """Daily totals as a random walk ending at today's live values."""
+        rng = self.rng
+        live = networth.current_totals()
+        assets, liabilities = float(live["total_assets"]), float(live["total_liabilities"])
+        days = self.counts["net_worth_days"]
+        rows = []
+        for back in range(days):
+            rows.append(NetWorthSnapshot(
+                date=self.today - timedelta(days=back),
+                total_assets=Decimal(f"{assets:.2f}"), total_liabilities=Decimal(f"{liabilities:.2f}"),
+                net_worth=Decimal(f"{assets:.2f}") - Decimal(f"{liabilities:.2f}"),
+            ))
+            assets = max(assets * (1 + rng.gauss(-0.0003, 0.004)), 0)
+            liabilities = max(liabilities * (1 + rng.gauss(0.0002, 0.001)), 0)
+        return self._batched(NetWorthSnapshot, reversed(rows))
+
+    def _notes(self):
+        rng = self.rng
+        types = _choice_values(Note.NOTE_TYPE_CHOICES)
+        participants = Note.participants.through
+        related = Note.related_stakeholders.through
+        for model in (Note, participants, related):
+            self._written(model)
+        created = 0
+        remaining = self.counts["notes"]
+        while remaining:
+            size = min(self.batch_size, remaining)
+            remaining -= size
+            notes = Note.objects.bulk_create([
+                Note(title=self._sentence(4), content=self._sentence(40), date=self._moment(),
+                     note_type=rng.choice(types))
+                for _ in range(size)
+            ])
+            participants.objects.bulk_create(
+                [participants(note_id=n.pk, stakeholder_id=rng.choice(self.stakeholder_ids)) for n in notes],
+                ignore_conflicts=True,
+            )
+            related.objects.bulk_create(
+                [related(note_id=n.pk, stakeholder_id=rng.choice(self.stakeholder_ids))
+                 for n in notes if rng.random() < 0.5],
+                ignore_conflicts=True,
+            )
+            created += size
+        return created
@@ -0,0 +1,180 @@
+"""
+Compare server setups under concurrent load and write a JSON report.
+Usage: python manage.py load_test [--servers wsgi gthread asgi] [--pages fanout|all] [--concurrency 16]
+                                 [--duration 10] [--output load.json]
+
+Each server setup is started as a real subprocess on a free local port
+against the current database, then hammered by --concurrency client threads
+(one keep-alive HTTP connection each) cycling through the pages for
+--duration seconds: the fan-out pages by default, or every run_benchmarks
+target (lists, exports, PDFs) with --pages all. Reports throughput and p50/p95/p99 latency per setup
+and per page. Run generate_benchmark_data first for meaningful numbers.
+"""
+import http.client
+import json
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.urls import reverse
+from django.utils import timezone
+
+from blaine.profiling import percentile
+from dashboard.panels import PANELS
+
+# {port} and {workers} are filled in per run; "wsgi" is the old sync-worker setup
+SERVERS = {
+    "wsgi": ["-m", "gunicorn", "blaine.wsgi:application", "--bind", "127.0.0.1:{port}",
+             "--workers", "{workers}"],
+    "gthread": ["-m", "gunicorn", "blaine.wsgi:application", "-c", "python:blaine.gunicorn_conf",
+                "--bind", "127.0.0.1:{port}", "--workers", "{workers}"],
+    "asgi": ["-m", "uvicorn", "blaine.asgi:application", "--host", "127.0.0.1", "--port", "{port}",
+             "--workers", "{workers}", "--no-access-log"],
+}
+
+
+def load_targets():
+    """(name, path) pairs for the pages that fan out over several models, plus the dashboard panels."""
+    today = timezone.localdate()
+    calendar = f"?start={today - timedelta(days=7)}&end={today + timedelta(days=35)}"
+    return [
+        ("dashboard", reverse("dashboard:index")),
+        ("search", reverse("dashboard:search") + "?q=Reed"),
+        ("timeline", reverse("dashboard:timeline")),
+        ("calendar_events", reverse("dashboard:calendar_events") + calendar),
+        *((f"panel_{name}", reverse("dashboard:panel", args=[name])) for name in PANELS),
+    ]
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _wait_until_up(port, process, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise CommandError(f"Server exited during startup (code {process.returncode})")
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=0.5):
+                return
+        except OSError:
+            time.sleep(0.1)
+    raise CommandError(f"Server did not start listening on port {port} within {timeout}s")
+
+
+def _client(port, targets, stop_at, results, errors, offset=0):
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+    i = offset
+    while time.monotonic() < stop_at:
+        name, path = targets[i % len(targets)]
+        i += 1
+        start = time.perf_counter()
+        try:
+            conn.request("GET", path)
+            response = conn.getresponse()
+            response.read()
+            ok = response.status == 200
+        except (OSError, http.client.HTTPException):
+            conn.close()
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+            ok = False
+        if ok:
+            results.append((name, (time.perf_counter() - start) * 1000))
+        else:
+            errors.append(name)
+    conn.close()
+
+
+def _latency_stats(samples):
+    samples = sorted(samples)
+    return {
+        "requests": len(samples),
+        "p50_ms": round(percentile(samples, 50), 2),
+        "p95_ms": round(percentile(samples, 95), 2),
+        "p99_ms": round(percentile(samples, 99), 2),
+    }
+
+
+def run_load(port, targets, concurrency, duration, warmup=2.0):
+    """Drive the server on ``port`` and return throughput and latency stats."""
+    _client(port, targets, time.monotonic() + warmup, [], [])
+    results, errors = [], []
+    stop_at = time.monotonic() + duration
+    threads = [
+        threading.Thread(target=_client, args=(port, targets, stop_at, results, errors, n))
+        for n in range(concurrency)
+    ]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    report = _latency_stats([ms for _name, ms in results])
+    report["errors"] = len(errors)
+    report["throughput_rps"] = round(len(results) / elapsed, 1)
+    report["pages"] = {
+        name: _latency_stats([ms for n, ms in results if n == name]) for name, _path in targets
+    }
+    return report
+
+
+class Command(BaseCommand):
+    help = "Load-test server setups (sync WSGI, gthread, ASGI) and write a JSON report"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--servers", nargs="*", choices=sorted(SERVERS), default=list(SERVERS))
+        parser.add_argument("--pages", choices=["fanout", "all"], default="fanout",
+                            help="Fan-out pages only, or every run_benchmarks target")
+        parser.add_argument("--concurrency", type=int, default=16, help="Concurrent client connections")
+        parser.add_argument("--duration", type=float, default=10, help="Seconds of measured load per server")
+        parser.add_argument("--workers", type=int, default=2, help="Worker processes per server")
+        parser.add_argument("--output", help="Write the JSON report to this path")
+
+    def handle(self, *args, **options):
+        if options["pages"] == "all":
+            from dashboard.management.commands.run_benchmarks import benchmark_targets
+
+            targets = benchmark_targets()
+        else:
+            targets = load_targets()
+        env = {**os.environ, "QUERY_GUARD": "", "PERF_PROFILING": "false"}
+        env.setdefault("DATABASE_PATH", str(settings.DATABASES["default"]["NAME"]))
+        results = {}
+        for name in options["servers"]:
+            port = _free_port()
+            argv = [arg.format(port=port, workers=options["workers"]) for arg in SERVERS[name]]
+            process = subprocess.Popen([sys.executable, *argv], cwd=settings.BASE_DIR, env=env,
+                                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            try:
+                _wait_until_up(port, process)
+                results[name] = run_load(port, targets, options["concurrency"], options["duration"])
+            finally:
+                process.terminate()
+                process.wait(timeout=30)
+            r = results[name]
+            self.stdout.write(f"  {name:<6} {r['throughput_rps']:8.1f} req/s  p50 {r['p50_ms']:7.1f}"
+                              f"  p95 {r['p95_ms']:7.1f}  p99 {r['p99_ms']:7.1f} ms  errors {r['errors']}")
+
+        report = {
+            "generated_at": timezone.now().isoformat(timespec="seconds"),
+            "concurrency": options["concurrency"],
+            "duration_s": options["duration"],
+            "workers": options["workers"],
+            "pages": options["pages"],
+            "results": results,
+        }
+        if options["output"]:
+            with open(options["output"], "w") as fh:
+                json.dump(report, fh, indent=2, sort_keys=True)
+            self.stdout.write(self.style.SUCCESS(f"Report written to {options['output']}"))
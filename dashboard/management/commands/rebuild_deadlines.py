@@ -0,0 +1,18 @@
+"""
+Rebuild the Deadline index from tasks, loans, legal matters and contact logs.
+Usage: python manage.py rebuild_deadlines
+
+Saves and deletes keep the index current; run this after writing those
+models in bulk outside the app (raw SQL, loaddata, a restored backup).
+"""
+from django.core.management.base import BaseCommand
+
+from dashboard import deadlines
+
+
+class Command(BaseCommand):
+    help = "Rebuild the unified deadline index"
+
+    def handle(self, *args, **options):
+        count = deadlines.rebuild()
+        self.stdout.write(self.style.SUCCESS(f"Indexed {count} deadlines."))
@@ -0,0 +1,19 @@
+"""
+Recompute the stored risk scores of every property and loan.
+Usage: python manage.py rescore_risk
+
+Saves and deletes keep the scores current and the daily schedule catches
+payments that have become overdue; run this after writing properties,
+loans, legal matters or cash flow in bulk outside the app.
+"""
+from django.core.management.base import BaseCommand
+
+from assets import risk
+
+
+class Command(BaseCommand):
+    help = "Recompute property and loan risk scores"
+
+    def handle(self, *args, **options):
+        changed = risk.rebuild()
+        self.stdout.write(self.style.SUCCESS(f"Updated {changed} risk score(s)."))
@@ -0,0 +1,164 @@
+"""
+Time the main pages against the current database and write a JSON report.
+Usage: python manage.py run_benchmarks [--runs 5] [--output report.json] [--compare previous.json]
+
+Run generate_benchmark_data first for meaningful numbers. Requests go
+through the full middleware stack in-process (django.test.Client), so the
+timings exclude network and WSGI server overhead. Reports from two commits
+can be compared with --compare.
+"""
+import json
+import statistics
+import subprocess
+import tempfile
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.test import Client, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from assets.exposure import DIMENSIONS
+from assets.models import Investment, Loan, RealEstate
+from blaine.profiling import percentile
+from blaine.queries import QueryRecorder
+from cashflow.models import CashFlowEntry
+from dashboard.panels import PANELS
+from legal.models import LegalMatter
+from notes.models import Note
+from stakeholders.models import ContactLog, Relationship, Stakeholder
+from tasks.models import FollowUp, Task
+
+DATASET_MODELS = [Stakeholder, Relationship, ContactLog, RealEstate, Investment, Loan, LegalMatter, Task,
+                  FollowUp, CashFlowEntry, Note]
+
+
+def benchmark_targets():
+    """(name, url) pairs covering the dashboard, lists with filters, search, charts and exports."""
+    today = timezone.localdate()
+    calendar = f"?start={today - timedelta(days=7)}&end={today + timedelta(days=35)}"
+    targets = [
+        ("dashboard", reverse("dashboard:index")),
+        ("search", reverse("dashboard:search") + "?q=Reed"),
+        ("timeline", reverse("dashboard:timeline")),
+        ("calendar_events", reverse("dashboard:calendar_events") + calendar),
+        ("cashflow_chart_data", reverse("cashflow:chart_data")),
+        ("net_worth_history", reverse("dashboard:net_worth_history")),
+        ("stakeholder_list", reverse("stakeholders:list")),
+        ("stakeholder_list_type", reverse("stakeholders:list") + "?type=attorney&sort=trust_rating"),
+        ("task_list", reverse("tasks:list")),
+        ("task_list_filtered", reverse("tasks:list") + "?status=not_started&status=in_progress&priority=high"),
+        ("task_list_search", reverse("tasks:list") + "?q=hearing"),
+        ("cashflow_list", reverse("cashflow:list")),
+        ("cashflow_list_filtered", reverse("cashflow:list") + f"?type=outflow&projected=actual"
+                                                               f"&date_from={today - timedelta(days=90)}"),
+        ("cashflow_list_sort_amount", reverse("cashflow:list") + "?sort=amount"),
+        ("legal_list", reverse("legal:list")),
+        ("legal_list_filtered", reverse("legal:list") + "?status=active&sort=next_hearing_date&dir=asc"),
+        ("note_list", reverse("notes:list")),
+        ("note_list_filtered", reverse("notes:list") + "?type=meeting"),
+        ("realestate_list", reverse("assets:realestate_list")),
+        ("investment_list", reverse("assets:investment_list")),
+        ("loan_list", reverse("assets:loan_list")),
+        ("loan_list_filtered", reverse("assets:loan_list") + "?status=active&sort=next_payment_date&dir=asc"),
+        ("stakeholder_export_csv", reverse("stakeholders:export_csv")),
+        ("task_export_csv", reverse("tasks:export_csv")),
+        ("legal_export_csv", reverse("legal:export_csv")),
+    ]
+    targets += [(f"panel_{name}", reverse("dashboard:panel", args=[name])) for name in PANELS]
+    targets += [(f"exposure_{name}", reverse("assets:exposure_dimension", args=[name])) for name in DIMENSIONS]
+    stakeholder = Stakeholder.objects.order_by("pk").first()
+    other = Stakeholder.objects.order_by("-pk").first()
+    if stakeholder:
+        targets.append(("stakeholder_detail", reverse("stakeholders:detail", args=[stakeholder.pk])))
+        targets.append(("stakeholder_graph", reverse("stakeholders:graph_data", args=[stakeholder.pk])
+                        + "?depth=2&layout=force"))
+        targets.append(("stakeholder_connections", reverse("stakeholders:connections_data",
+                                                           args=[stakeholder.pk, other.pk]) + "?max_length=4"))
+        targets.append(("stakeholder_export_pdf", reverse("stakeholders:export_pdf", args=[stakeholder.pk])))
+    return targets
+
+
+def _git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=settings.BASE_DIR, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+def _consume(response):
+    if response.streaming:
+        for _chunk in response.streaming_content:
+            pass
+        response.close()
+
+
+class Command(BaseCommand):
+    help = "Benchmark the main pages and write a JSON report"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--runs", type=int, default=5, help="Timed runs per page (after one warm-up)")
+        parser.add_argument("--output", help="Write the JSON report to this path")
+        parser.add_argument("--compare", help="Print the change against an earlier report")
+        parser.add_argument("--only", nargs="*", help="Only run these benchmark names")
+
+    def handle(self, *args, **options):
+        runs = options["runs"]
+        client = Client()
+        results = {}
+        # Throwaway PDF cache so benchmark runs never touch the real one
+        with tempfile.TemporaryDirectory() as cache_dir, override_settings(
+            ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, "testserver"], PDF_CACHE_DIR=cache_dir,
+        ):
+            for name, url in benchmark_targets():
+                if options["only"] and name not in options["only"]:
+                    continue
+                _consume(client.get(url))  # warm-up
+                samples = []
+                for _ in range(runs):
+                    with QueryRecorder() as recorder:
+                        start = time.perf_counter()
+                        response = client.get(url)
+                        _consume(response)
+                        samples.append((time.perf_counter() - start) * 1000)
+                samples.sort()
+                results[name] = {
+                    "url": url,
+                    "status": response.status_code,
+                    "queries": recorder.count,
+                    "median_ms": round(statistics.median(samples), 2),
+                    "p95_ms": round(percentile(samples, 95), 2),
+                    "min_ms": round(samples[0], 2),
+                }
+                r = results[name]
+                self.stdout.write(f"  {name:<28} {r['median_ms']:9.1f} ms median  {r['queries']:4d} queries"
+                                  f"  [{r['status']}]")
+
+        report = {
+            "commit": _git_commit(),
+            "generated_at": timezone.now().isoformat(timespec="seconds"),
+            "runs": runs,
+            "dataset": {model._meta.label: model.objects.count() for model in DATASET_MODELS},
+            "results": results,
+        }
+        if options["output"]:
+            with open(options["output"], "w") as fh:
+                json.dump(report, fh, indent=2, sort_keys=True)
+            self.stdout.write(self.style.SUCCESS(f"Report written to {options['output']}"))
+        if options["compare"]:
+            self._compare(options["compare"], report)
+
+    def _compare(self, path, report):
+        with open(path) as fh:
+            previous = json.load(fh)
+        self.stdout.write(f"\nChange vs {previous.get('commit') or path} (median):")
+        for name, result in report["results"].items():
+            before = previous["results"].get(name)
+            if not before:
+                continue
+            change = (result["median_ms"] - before["median_ms"]) / before["median_ms"] * 100 if before["median_ms"] else 0
+            self.stdout.write(f"  {name:<28} {before['median_ms']:9.1f} -> {result['median_ms']:9.1f} ms"
+                              f"  ({change:+.0f}%)")
@@ -1,10 +1,12 @@
-"""Register Django-Q2 scheduled tasks for notifications."""
+"""Register Django-Q2 scheduled tasks for notifications, loan payments and snapshots."""
 from django.core.management.base import BaseCommand
 from django_q.models import Schedule
 
+RETIRED = ["Post Loan Payments", "Score Asset Risk", "Snapshot Net Worth"]
+
 
 class Command(BaseCommand):
-    help = "Register scheduled notification tasks in Django-Q2"
+    help = "Register scheduled notification, loan payment and snapshot tasks in Django-Q2"
 
     def handle(self, *args, **options):
         schedules = [
@@ -25,8 +27,18 @@ class Command(BaseCommand):
                 "schedule_type": Schedule.DAILY,
                 "minutes": 0,
             },
+            {
+                # Payments, then risk scores, then the net worth snapshot, in one task
+                "name": "Daily Portfolio Update",
+                "func": "dashboard.networth.daily_update",
+                "schedule_type": Schedule.DAILY,
+                "minutes": 0,
+            },
         ]
 
+        # Superseded by "Daily Portfolio Update", which runs them in order
+        Schedule.objects.filter(name__in=RETIRED).delete()
+
         for sched in schedules:
             obj, created = Schedule.objects.update_or_create(
                 name=sched["name"],
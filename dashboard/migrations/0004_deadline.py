@@ -0,0 +1,99 @@
+# Generated by Django 6.0.2 on 2026-10-19 08:34
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.utils import timezone
+
+
+# A frozen copy of the dashboard.deadlines projection as of this migration,
+# reading historical models only. ``url`` is left empty (no URLconf during
+# migrate); Deadline.get_absolute_url fills it in and rebuild_deadlines
+# stores it.
+
+def _task_rows(task):
+    if task.status == "complete":
+        return []
+    common = {"object_id": task.pk, "title": task.title, "priority": task.priority,
+              "stakeholder_id": task.related_stakeholder_id}
+    rows = []
+    if task.due_date:
+        rows.append({"kind": "task", "date": task.due_date, **common})
+    if task.reminder_date:
+        rows.append({"kind": "reminder", "date": timezone.localdate(task.reminder_date),
+                     "at": task.reminder_date, **common})
+    return rows
+
+
+def _loan_rows(loan):
+    if loan.status != "active":
+        return []
+    common = {"object_id": loan.pk, "title": loan.name, "stakeholder_id": loan.lender_id}
+    rows = []
+    if loan.next_payment_date:
+        rows.append({"kind": "payment", "date": loan.next_payment_date, **common})
+    if loan.maturity_date:
+        rows.append({"kind": "maturity", "date": loan.maturity_date, **common})
+    return rows
+
+
+def _hearing_rows(matter):
+    if matter.status == "resolved" or not matter.next_hearing_date:
+        return []
+    return [{"kind": "hearing", "date": matter.next_hearing_date, "object_id": matter.pk, "title": matter.title}]
+
+
+def _contact_rows(log):
+    if not log.follow_up_needed or not log.follow_up_date:
+        return []
+    return [{"kind": "contact", "date": log.follow_up_date, "object_id": log.pk,
+             "stakeholder_id": log.stakeholder_id}]
+
+
+PROJECTIONS = {
+    ("tasks", "Task"): _task_rows,
+    ("assets", "Loan"): _loan_rows,
+    ("legal", "LegalMatter"): _hearing_rows,
+    ("stakeholders", "ContactLog"): _contact_rows,
+}
+
+
+def backfill(apps, schema_editor):
+    Deadline = apps.get_model("dashboard", "Deadline")
+    for (app_label, model_name), project in PROJECTIONS.items():
+        source = apps.get_model(app_label, model_name)
+        rows = [Deadline(url="", **row) for obj in source.objects.order_by().iterator() for row in project(obj)]
+        Deadline.objects.bulk_create(rows, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('assets', '0002_list_view_indexes'),
+        ('dashboard', '0003_generatedreport'),
+        ('legal', '0003_list_view_indexes'),
+        ('stakeholders', '0002_list_view_indexes'),
+        ('tasks', '0002_list_view_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Deadline',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('at', models.DateTimeField(blank=True, null=True)),
+                ('kind', models.CharField(choices=[('task', 'Task'), ('reminder', 'Reminder'), ('payment', 'Payment'), ('maturity', 'Maturity'), ('hearing', 'Hearing'), ('contact', 'Follow-up')], max_length=10)),
+                ('object_id', models.PositiveBigIntegerField()),
+                ('title', models.CharField(blank=True, max_length=255)),
+                ('priority', models.CharField(blank=True, max_length=10)),
+                ('url', models.CharField(max_length=255)),
+                ('stakeholder', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='stakeholders.stakeholder')),
+            ],
+            options={
+                'ordering': ['date', 'kind'],
+                'indexes': [models.Index(fields=['date', 'kind'], name='deadline_date_idx'), models.Index(fields=['kind', 'at'], name='deadline_kind_at_idx')],
+                'constraints': [models.UniqueConstraint(fields=('kind', 'object_id'), name='deadline_unique_source')],
+            },
+        ),
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
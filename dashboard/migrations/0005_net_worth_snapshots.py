@@ -0,0 +1,40 @@
+# Generated by Django 6.0.2 on 2026-10-19 09:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0004_deadline'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='NetWorthSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(unique=True)),
+                ('total_assets', models.DecimalField(decimal_places=2, max_digits=16)),
+                ('total_liabilities', models.DecimalField(decimal_places=2, max_digits=16)),
+                ('net_worth', models.DecimalField(decimal_places=2, max_digits=16)),
+            ],
+            options={
+                'ordering': ['date'],
+            },
+        ),
+        migrations.CreateModel(
+            name='AssetSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('kind', models.CharField(choices=[('property', 'Property'), ('investment', 'Investment'), ('loan', 'Loan')], max_length=10)),
+                ('object_id', models.PositiveBigIntegerField()),
+                ('value', models.DecimalField(decimal_places=2, max_digits=14)),
+            ],
+            options={
+                'ordering': ['kind', 'object_id', 'date'],
+                'constraints': [models.UniqueConstraint(fields=('kind', 'object_id', 'date'), name='assetsnapshot_unique_day')],
+            },
+        ),
+    ]
@@ -1,4 +1,5 @@
 from django.db import models
+from django.urls import reverse
 
 
 class Notification(models.Model):
@@ -56,3 +57,147 @@ class EmailSettings(models.Model):
     def is_configured(self):
         """True when minimum SMTP fields are populated."""
         return bool(self.smtp_host and self.from_email and self.admin_email)
+
+
+class GeneratedReport(models.Model):
+    """A PDF report rendered in the background by the qcluster."""
+
+    STATUS_CHOICES = [
+        ("pending", "Pending"),
+        ("running", "Running"),
+        ("done", "Done"),
+        ("failed", "Failed"),
+    ]
+
+    title = models.CharField(max_length=255)
+    filename = models.CharField(max_length=255)
+    cache_key = models.CharField(max_length=255, blank=True, db_index=True)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default="pending")
+    file = models.FileField(upload_to="reports/", blank=True)
+    error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    completed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+
+    def __str__(self):
+        return self.title
+
+    def get_absolute_url(self):
+        return reverse("dashboard:report_detail", kwargs={"pk": self.pk})
+
+
+class Deadline(models.Model):
+    """Projection of every dated obligation, maintained by dashboard.deadlines.
+
+    One row per open task due date / reminder, active loan payment / maturity,
+    unresolved hearing and pending contact follow-up, so any horizon is a
+    single range query on ``date``.
+    """
+
+    KIND_CHOICES = [
+        ("task", "Task"),
+        ("reminder", "Reminder"),
+        ("payment", "Payment"),
+        ("maturity", "Maturity"),
+        ("hearing", "Hearing"),
+        ("contact", "Follow-up"),
+    ]
+
+    date = models.DateField()
+    # Exact time, for reminders
+    at = models.DateTimeField(null=True, blank=True)
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES)
+    object_id = models.PositiveBigIntegerField()
+    title = models.CharField(max_length=255, blank=True)
+    priority = models.CharField(max_length=10, blank=True)
+    stakeholder = models.ForeignKey(
+        "stakeholders.Stakeholder", on_delete=models.SET_NULL,
+        null=True, blank=True, related_name="+",
+    )
+    url = models.CharField(max_length=255)
+
+    class Meta:
+        ordering = ["date", "kind"]
+        constraints = [
+            models.UniqueConstraint(fields=["kind", "object_id"], name="deadline_unique_source"),
+        ]
+        indexes = [
+            models.Index(fields=["date", "kind"], name="deadline_date_idx"),
+            models.Index(fields=["kind", "at"], name="deadline_kind_at_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.label} ({self.date})"
+
+    # kind -> (URL name of the source's page, field holding its pk)
+    SOURCE_URLS = {
+        "task": ("tasks:detail", "object_id"),
+        "reminder": ("tasks:detail", "object_id"),
+        "payment": ("assets:loan_detail", "object_id"),
+        "maturity": ("assets:loan_detail", "object_id"),
+        "hearing": ("legal:detail", "object_id"),
+        "contact": ("stakeholders:detail", "stakeholder_id"),
+    }
+
+    def get_absolute_url(self):
+        """The stored ``url``, or the source's page for rows backfilled without one."""
+        if self.url:
+            return self.url
+        name, field = self.SOURCE_URLS[self.kind]
+        return reverse(name, kwargs={"pk": getattr(self, field)})
+
+    @property
+    def label(self):
+        """Display title; contact follow-ups are named after the stakeholder."""
+        if self.kind == "contact":
+            return f"Contact: {self.stakeholder.name if self.stakeholder else 'Unknown'}"
+        if self.kind == "task":
+            return self.title
+        return f"{self.get_kind_display()}: {self.title}"
+
+
+class NetWorthSnapshot(models.Model):
+    """Daily net worth totals, written by dashboard.networth.take_snapshot."""
+
+    date = models.DateField(unique=True)
+    total_assets = models.DecimalField(max_digits=16, decimal_places=2)
+    total_liabilities = models.DecimalField(max_digits=16, decimal_places=2)
+    net_worth = models.DecimalField(max_digits=16, decimal_places=2)
+
+    class Meta:
+        ordering = ["date"]
+
+    def __str__(self):
+        return f"{self.date}: {self.net_worth}"
+
+
+class AssetSnapshot(models.Model):
+    """Value of one property, investment or loan from ``date`` on.
+
+    Only changes are stored: a row means the value differed from the
+    asset's previous row, so an asset whose value never moves costs one
+    row rather than one per day. An asset that is sold / paid off (or
+    deleted) gets a final row of 0.
+    """
+
+    KIND_CHOICES = [
+        ("property", "Property"),
+        ("investment", "Investment"),
+        ("loan", "Loan"),
+    ]
+
+    date = models.DateField()
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES)
+    object_id = models.PositiveBigIntegerField()
+    value = models.DecimalField(max_digits=14, decimal_places=2)
+
+    class Meta:
+        ordering = ["kind", "object_id", "date"]
+        constraints = [
+            models.UniqueConstraint(fields=["kind", "object_id", "date"], name="assetsnapshot_unique_day"),
+        ]
+
+    def __str__(self):
+        return f"{self.get_kind_display()} #{self.object_id} {self.date}: {self.value}"
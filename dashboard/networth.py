@@ -0,0 +1,151 @@
+"""Net worth: live totals, daily snapshots and the downsampled history chart.
+
+``take_snapshot`` runs daily from the qcluster, as the last step of
+``daily_update`` (see setup_schedules). It
+writes one NetWorthSnapshot row per day and an AssetSnapshot row for each
+property, investment or loan whose value changed since its last row.
+Re-running it on the same day replaces that day's rows.
+
+``history`` serves years of daily totals to Chart.js. It downsamples with
+Largest-Triangle-Three-Buckets, which keeps the peaks and troughs a plain
+every-Nth sample would drop.
+"""
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import OuterRef, Subquery, Sum
+from django.utils import timezone
+
+from assets import payments, risk
+from assets.models import Investment, Loan, RealEstate
+from blaine.cache import mark_changed
+
+from .models import AssetSnapshot, NetWorthSnapshot
+
+DEFAULT_POINTS = 200
+MAX_POINTS = 1000
+# chart range -> days of history (None: everything)
+RANGES = {"1y": 365, "5y": 5 * 365, "all": None}
+
+
+def _holdings():
+    """kind -> (queryset, value field, counts as a liability)."""
+    return {
+        "property": (RealEstate.objects.exclude(status="sold"), "estimated_value", False),
+        "investment": (Investment.objects.all(), "current_value", False),
+        "loan": (Loan.objects.filter(status="active"), "current_balance", True),
+    }
+
+
+def current_totals():
+    """Live totals for the net worth panel: one aggregate per asset class."""
+    total_assets = total_liabilities = 0
+    for qs, field, liability in _holdings().values():
+        total = qs.aggregate(total=Sum(field))["total"] or 0
+        if liability:
+            total_liabilities += total
+        else:
+            total_assets += total
+    return {
+        "total_assets": total_assets,
+        "total_liabilities": total_liabilities,
+        "net_worth": total_assets - total_liabilities,
+    }
+
+
+def _latest_values(before):
+    """(kind, object_id) -> value of each asset's last row dated before ``before``."""
+    rows = AssetSnapshot.objects.filter(date__lt=before)
+    last_date = rows.filter(kind=OuterRef("kind"), object_id=OuterRef("object_id")).order_by("-date")
+    latest = rows.filter(date=Subquery(last_date.values("date")[:1]))
+    return {(kind, object_id): value for kind, object_id, value in latest.values_list("kind", "object_id", "value")}
+
+
+def take_snapshot(day=None):
+    """Record today's (or ``day``'s) totals and per-asset changes; safe to re-run."""
+    day = day or timezone.localdate()
+    current = {}
+    totals = {"total_assets": Decimal(0), "total_liabilities": Decimal(0)}
+    for kind, (qs, field, liability) in _holdings().items():
+        for pk, value in qs.values_list("pk", field):
+            value = value or Decimal(0)
+            current[(kind, pk)] = value
+            totals["total_liabilities" if liability else "total_assets"] += value
+    totals["net_worth"] = totals["total_assets"] - totals["total_liabilities"]
+
+    with transaction.atomic():
+        NetWorthSnapshot.objects.update_or_create(date=day, defaults=totals)
+        AssetSnapshot.objects.filter(date=day).delete()
+        previous = _latest_values(day)
+        # Assets gone from the holdings (sold, paid off, deleted) drop to 0
+        for key, value in previous.items():
+            if key not in current and value:
+                current[key] = Decimal(0)
+        AssetSnapshot.objects.bulk_create(
+            AssetSnapshot(date=day, kind=kind, object_id=pk, value=value)
+            for (kind, pk), value in current.items()
+            if previous.get((kind, pk)) != value
+        )
+    mark_changed(AssetSnapshot)
+    return f"Net worth snapshot for {day}: {totals['net_worth']}."
+
+
+def daily_update(today=None):
+    """The nightly job: post due loan payments, re-score risk, then take the snapshot.
+
+    One schedule runs the three in order, so neither the risk scores nor
+    the snapshot ever see the day's balances before its payments are posted.
+    """
+    today = today or timezone.localdate()
+    posted = payments.post_due_payments(today)
+    rescored = risk.rebuild(today=today)
+    return f"{posted} {rescored} risk score(s) changed. {take_snapshot(today)}"
+
+
+def lttb(points, threshold):
+    """Indices of ``threshold`` points chosen from (x, y) ``points`` by LTTB.
+
+    The first and last points are always kept; each bucket in between
+    contributes the point forming the largest triangle with the point kept
+    from the previous bucket and the average of the next bucket.
+    """
+    n = len(points)
+    if threshold >= n or threshold < 3:
+        return list(range(n))
+    every = (n - 2) / (threshold - 2)
+    kept = [0]
+    a = 0
+    for i in range(threshold - 2):
+        start = int(i * every) + 1
+        end = int((i + 1) * every) + 1
+        next_end = min(int((i + 2) * every) + 1, n)
+        next_bucket = points[end:next_end] or points[-1:]
+        avg_x = sum(p[0] for p in next_bucket) / len(next_bucket)
+        avg_y = sum(p[1] for p in next_bucket) / len(next_bucket)
+        ax, ay = points[a]
+        best, best_area = start, -1.0
+        for j in range(start, end):
+            x, y = points[j]
+            area = abs((ax - avg_x) * (y - ay) - (ax - x) * (avg_y - ay))
+            if area > best_area:
+                best, best_area = j, area
+        kept.append(best)
+        a = best
+    kept.append(n - 1)
+    return kept
+
+
+def history(start=None, points=DEFAULT_POINTS):
+    """Chart.js series of daily totals since ``start``, downsampled to ``points``."""
+    rows = NetWorthSnapshot.objects.order_by("date")
+    if start:
+        rows = rows.filter(date__gte=start)
+    rows = list(rows.values_list("date", "total_assets", "total_liabilities", "net_worth"))
+    keep = lttb([(row[0].toordinal(), float(row[3])) for row in rows], points)
+    rows = [rows[i] for i in keep]
+    return {
+        "labels": [row[0].isoformat() for row in rows],
+        "assets": [float(row[1]) for row in rows],
+        "liabilities": [float(row[2]) for row in rows],
+        "net_worth": [float(row[3]) for row in rows],
+    }
@@ -0,0 +1,212 @@
+"""Dashboard panels.
+
+The dashboard page is only a shell; each panel is fetched by HTMX from
+``dashboard:panel`` (on load, or when scrolled into view for the ones
+below the fold), so the page paints at once and a slow panel never holds
+up the others. Each panel's rendered HTML is cached through
+``blaine.cache.cached``, keyed on the versions of the models it reads and
+today's date, with its own TTL as an upper bound: short for panels that
+change with the clock (stale follow-ups, liquidity alerts), long otherwise.
+"""
+from datetime import timedelta
+
+from django.db.models import Q, Sum
+from django.http import Http404
+from django.template.loader import render_to_string
+from django.utils import timezone
+
+from assets import risk
+from assets.models import Investment, Loan, RealEstate
+from cashflow.models import CashFlowEntry
+from legal.models import LegalMatter
+from stakeholders.models import Stakeholder
+from tasks.models import FollowUp, Task
+
+from . import deadlines, networth
+from .models import Deadline, NetWorthSnapshot
+from .views import TIMELINE_MODELS, get_activity_timeline
+
+
+ASSET_RISK_LIMIT = 10
+
+
+def _alerts(today):
+    from cashflow.alerts import get_liquidity_alerts
+
+    return {"liquidity_alerts": get_liquidity_alerts()}
+
+
+def _net_worth(today):
+    return {"net_worth": networth.current_totals()}
+
+
+def _net_worth_history(today):
+    return {"has_history": NetWorthSnapshot.objects.exists(), "ranges": list(networth.RANGES)}
+
+
+def _cashflow(today):
+    """Actual and projected inflows/outflows for the current month."""
+    # (date range rather than date__month so the date indexes apply)
+    month_start = today.replace(day=1)
+    next_month_start = (month_start + timedelta(days=32)).replace(day=1)
+    current_month_entries = CashFlowEntry.objects.filter(
+        date__gte=month_start,
+        date__lt=next_month_start,
+    )
+
+    actual_inflows = current_month_entries.filter(
+        entry_type="inflow", is_projected=False,
+    ).aggregate(total=Sum("amount"))["total"] or 0
+
+    actual_outflows = current_month_entries.filter(
+        entry_type="outflow", is_projected=False,
+    ).aggregate(total=Sum("amount"))["total"] or 0
+
+    projected_inflows = current_month_entries.filter(
+        entry_type="inflow", is_projected=True,
+    ).aggregate(total=Sum("amount"))["total"] or 0
+
+    projected_outflows = current_month_entries.filter(
+        entry_type="outflow", is_projected=True,
+    ).aggregate(total=Sum("amount"))["total"] or 0
+
+    return {"cashflow": {
+        "actual_inflows": actual_inflows,
+        "actual_outflows": actual_outflows,
+        "projected_inflows": projected_inflows,
+        "projected_outflows": projected_outflows,
+    }}
+
+
+def _overdue_tasks(today):
+    # Overdue tasks: due before today and not complete
+    return {"overdue_tasks": Task.objects.filter(
+        due_date__lt=today,
+    ).exclude(
+        status="complete",
+    ).select_related("related_stakeholder")}
+
+
+def _active_legal_matters(today):
+    return {"active_legal_matters": LegalMatter.objects.filter(
+        Q(status="active") | Q(status="pending"),
+    )}
+
+
+def _recent_activity(today):
+    return {"recent_activity": get_activity_timeline(limit=10)}
+
+
+def _stale_followups(today):
+    # Stale follow-ups: no response received and outreach_date > 3 days ago
+    return {"stale_followups": FollowUp.objects.filter(
+        response_received=False,
+        outreach_date__lt=timezone.now() - timedelta(days=3),
+    ).select_related("task", "stakeholder")}
+
+
+def _upcoming_deadlines(today, days):
+    """Everything due in the next ``days`` days, from the unified deadline index."""
+    return {
+        "upcoming_deadlines": list(deadlines.upcoming(days, today)),
+        "days": days,
+        "horizons": deadlines.HORIZONS,
+    }
+
+
+def _asset_risk(today):
+    # Top-N on the stored scores (assets.risk), read straight off the risk_score indexes
+    at_risk_properties = list(
+        RealEstate.objects.filter(risk_score__gte=risk.ALERT_SCORE).order_by("-risk_score")[:ASSET_RISK_LIMIT]
+    )
+    at_risk_loans = list(
+        Loan.objects.filter(risk_score__gte=risk.ALERT_SCORE).order_by("-risk_score")[:ASSET_RISK_LIMIT]
+    )
+    return {
+        "at_risk_properties": at_risk_properties,
+        "at_risk_loans": at_risk_loans,
+        "has_asset_risks": bool(at_risk_properties or at_risk_loans),
+    }
+
+
+# name -> template, context builder, models read (invalidation), TTL in seconds,
+# and optional query parameters: name -> (allowed values, default)
+PANELS = {
+    "alerts": {
+        "template": "partials/_alerts.html", "context": _alerts,
+        "models": [CashFlowEntry, Loan], "ttl": 300,
+    },
+    "net_worth": {
+        "template": "dashboard/partials/_net_worth.html", "context": _net_worth,
+        "models": [RealEstate, Investment, Loan], "ttl": 3600,
+    },
+    "net_worth_history": {
+        "template": "dashboard/partials/_net_worth_history.html", "context": _net_worth_history,
+        "models": [NetWorthSnapshot], "ttl": 3600,
+    },
+    "cashflow": {
+        "template": "dashboard/partials/_cashflow_summary.html", "context": _cashflow,
+        "models": [CashFlowEntry], "ttl": 3600,
+    },
+    "overdue_tasks": {
+        "template": "dashboard/partials/_overdue_tasks.html", "context": _overdue_tasks,
+        "models": [Task, Stakeholder], "ttl": 3600,
+    },
+    "active_legal_matters": {
+        "template": "dashboard/partials/_active_legal_matters.html", "context": _active_legal_matters,
+        "models": [LegalMatter], "ttl": 3600,
+    },
+    "recent_activity": {
+        "template": "dashboard/partials/_recent_activity.html", "context": _recent_activity,
+        "models": TIMELINE_MODELS, "ttl": 3600,
+    },
+    "stale_followups": {
+        "template": "dashboard/partials/_stale_followups.html", "context": _stale_followups,
+        "models": [FollowUp, Task, Stakeholder], "ttl": 300,
+    },
+    "upcoming_deadlines": {
+        "template": "dashboard/partials/_upcoming_deadlines.html", "context": _upcoming_deadlines,
+        "models": [Deadline, Stakeholder], "ttl": 3600,
+        "params": {"days": (deadlines.HORIZONS, deadlines.DEFAULT_HORIZON)},
+    },
+    "asset_risk": {
+        "template": "dashboard/partials/_asset_risk.html", "context": _asset_risk,
+        "models": [RealEstate, Loan], "ttl": 3600,
+    },
+}
+
+# Page order; "revealed" panels sit below the fold and load when scrolled to
+LAYOUT = {
+    "top": [("alerts", "load"), ("net_worth", "load"), ("cashflow", "load")],
+    "grid": [("overdue_tasks", "load"), ("active_legal_matters", "load"),
+             ("recent_activity", "load"), ("stale_followups", "load")],
+    "bottom": [("net_worth_history", "revealed"), ("upcoming_deadlines", "revealed"),
+               ("asset_risk", "revealed")],
+}
+
+
+def _panel_params(request, panel):
+    """The panel's query parameters, falling back to the default for anything not allowed."""
+    params = {}
+    for param, (allowed, default) in panel.get("params", {}).items():
+        value = request.GET.get(param, "")
+        params[param] = int(value) if value.isdigit() and int(value) in allowed else default
+    return params
+
+
+def render_panel(request, name):
+    """Rendered HTML for one panel, from the cache when its models haven't changed."""
+    from blaine.cache import cached
+
+    panel = PANELS.get(name)
+    if panel is None:
+        raise Http404("Unknown dashboard panel.")
+    today = timezone.localdate()
+    params = _panel_params(request, panel)
+    return cached(
+        f"dashboard-panel:{name}",
+        panel["models"],
+        lambda: render_to_string(panel["template"], panel["context"](today, **params), request),
+        vary=[today, *params.values()],
+        timeout=panel["ttl"],
+    )
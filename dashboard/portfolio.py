@@ -0,0 +1,120 @@
+"""Consolidated portfolio report: every asset, liability and active matter in one PDF.
+
+Each section is fetched with a single bulk query (``values_list`` with the
+related names joined in), never through the per-entity detail exporters.
+"""
+from datetime import timedelta
+from decimal import Decimal
+
+from django.db.models import Sum
+from django.db.models.functions import TruncMonth
+
+from assets.amortization import add_months
+from assets.models import Investment, Loan, RealEstate
+from cashflow.models import CashFlowEntry
+from legal.models import LegalMatter
+
+
+def _money(value):
+    return f"${value:,.0f}" if value is not None else "-"
+
+
+def _date(value):
+    return value.strftime("%b %d, %Y") if value else "-"
+
+
+def portfolio_sections(today):
+    """Return render_pdf sections for the portfolio report as of ``today``."""
+    property_status = dict(RealEstate.STATUS_CHOICES)
+    loan_status = dict(Loan.STATUS_CHOICES)
+    matter_status = dict(LegalMatter.STATUS_CHOICES)
+    matter_type = dict(LegalMatter.MATTER_TYPE_CHOICES)
+
+    properties = list(RealEstate.objects.values_list(
+        "name", "jurisdiction", "property_type", "status", "estimated_value", "stakeholder__name",
+    ))
+    investments = list(Investment.objects.values_list(
+        "name", "investment_type", "institution", "current_value", "stakeholder__name",
+    ))
+    loans = list(Loan.objects.values_list(
+        "name", "lender__name", "status", "current_balance", "interest_rate",
+        "monthly_payment", "next_payment_date", "maturity_date",
+    ))
+    matters = list(LegalMatter.objects.filter(status__in=["active", "pending"]).values_list(
+        "title", "case_number", "matter_type", "status", "jurisdiction", "next_hearing_date",
+    ).order_by("next_hearing_date", "title"))
+
+    total_real_estate = sum((p[4] or 0 for p in properties if p[3] != "sold"), Decimal("0"))
+    total_investments = sum((i[3] or 0 for i in investments), Decimal("0"))
+    total_liabilities = sum((loan[3] or 0 for loan in loans if loan[2] == "active"), Decimal("0"))
+    total_assets = total_real_estate + total_investments
+
+    sections = [
+        {"heading": "Summary", "type": "info", "rows": [
+            ("Real Estate", _money(total_real_estate)),
+            ("Investments", _money(total_investments)),
+            ("Total Assets", _money(total_assets)),
+            ("Active Loan Balances", _money(total_liabilities)),
+            ("Net Worth", _money(total_assets - total_liabilities)),
+            ("Active Legal Matters", str(len(matters))),
+        ]},
+    ]
+    if properties:
+        sections.append({"heading": "Real Estate", "type": "table",
+                         "headers": ["Name", "Jurisdiction", "Type", "Status", "Est. Value", "Stakeholder"],
+                         "rows": [[name, jurisdiction or "-", ptype or "-", property_status.get(status, status),
+                                   _money(value), stakeholder or "-"]
+                                  for name, jurisdiction, ptype, status, value, stakeholder in properties]})
+    if investments:
+        sections.append({"heading": "Investments", "type": "table",
+                         "headers": ["Name", "Type", "Institution", "Current Value", "Stakeholder"],
+                         "rows": [[name, itype or "-", institution or "-", _money(value), stakeholder or "-"]
+                                  for name, itype, institution, value, stakeholder in investments]})
+    if loans:
+        sections.append({"heading": "Loans", "type": "table",
+                         "headers": ["Name", "Lender", "Status", "Balance", "Rate", "Payment", "Next Due", "Maturity"],
+                         "rows": [[name, lender or "-", loan_status.get(status, status), _money(balance),
+                                   f"{rate}%" if rate is not None else "-",
+                                   f"${payment:,.2f}" if payment is not None else "-",
+                                   _date(next_due), _date(maturity)]
+                                  for name, lender, status, balance, rate, payment, next_due, maturity in loans]})
+    if matters:
+        sections.append({"heading": "Active Legal Matters", "type": "table",
+                         "headers": ["Title", "Case #", "Type", "Status", "Jurisdiction", "Next Hearing"],
+                         "rows": [[title, case_number or "-", matter_type.get(mtype, mtype),
+                                   matter_status.get(status, status), jurisdiction or "-", _date(hearing)]
+                                  for title, case_number, mtype, status, jurisdiction, hearing in matters]})
+
+    sections.append(_cash_flow_section(today))
+    return sections
+
+
+def _cash_flow_section(today):
+    """Monthly actual and projected flows for the last 12 months and next 3."""
+    start = add_months(today.replace(day=1), -11)
+    end = add_months(today.replace(day=1), 4) - timedelta(days=1)
+    monthly = (
+        CashFlowEntry.objects.filter(date__gte=start, date__lte=end)
+        .annotate(month=TruncMonth("date"))
+        .values_list("month", "entry_type", "is_projected")
+        .annotate(total=Sum("amount"))
+        .order_by()
+    )
+    totals = {}
+    for month, entry_type, is_projected, total in monthly:
+        key = ("projected_" if is_projected else "") + entry_type
+        totals.setdefault(month, {})[key] = total
+
+    rows = []
+    month = start
+    while month <= end:
+        t = totals.get(month, {})
+        inflow = t.get("inflow", Decimal("0"))
+        outflow = t.get("outflow", Decimal("0"))
+        rows.append([month.strftime("%b %Y"), _money(inflow), _money(outflow), _money(inflow - outflow),
+                     _money(t.get("projected_inflow", Decimal("0"))),
+                     _money(t.get("projected_outflow", Decimal("0")))])
+        month = add_months(month, 1)
+    return {"heading": "Cash Flow Summary", "type": "table",
+            "headers": ["Month", "Inflows", "Outflows", "Net", "Proj. In", "Proj. Out"],
+            "rows": rows}
@@ -0,0 +1,74 @@
+"""Background PDF report generation via Django-Q2."""
+from datetime import timedelta
+from pathlib import Path
+
+from django.conf import settings
+from django.utils import timezone
+from django_q.tasks import async_task
+
+
+def queue_pdf_report(filename, title, subtitle, sections, cache_path=None):
+    """Return a GeneratedReport for this content, queueing a worker job if needed.
+
+    Identical content (same cache key) reuses a finished report, or one
+    pending or running for less than PDF_REPORT_TIMEOUT seconds, rather than
+    rendering the same PDF twice. Older in-flight reports (a stopped
+    qcluster, a worker that died mid-render) are marked failed and a fresh
+    job is queued.
+    """
+    from dashboard.models import GeneratedReport
+
+    cache_key = cache_path.name if cache_path else ""
+    if cache_key:
+        started_after = timezone.now() - timedelta(seconds=settings.PDF_REPORT_TIMEOUT)
+        GeneratedReport.objects.filter(
+            cache_key=cache_key, status__in=["pending", "running"], created_at__lt=started_after,
+        ).update(status="failed", error="Timed out waiting for the report worker", completed_at=timezone.now())
+        existing = GeneratedReport.objects.filter(
+            cache_key=cache_key, status__in=["pending", "running", "done"],
+        ).first()
+        if existing and (existing.status != "done" or _report_path(existing).exists()):
+            return existing
+
+    report = GeneratedReport.objects.create(title=title, filename=filename, cache_key=cache_key)
+    async_task(
+        "dashboard.reports.generate_pdf_report",
+        report.pk, subtitle, sections, str(cache_path) if cache_path else "",
+    )
+    return report
+
+
+def _report_path(report):
+    return Path(settings.MEDIA_ROOT) / report.file.name
+
+
+def generate_pdf_report(report_id, subtitle, sections, cache_path=""):
+    """Worker: render a queued report into MEDIA_ROOT/reports/."""
+    from blaine.pdf_cache import write_cached_pdf
+    from blaine.pdf_export import build_pdf
+    from dashboard.models import GeneratedReport
+
+    report = GeneratedReport.objects.get(pk=report_id)
+    report.status = "running"
+    report.save(update_fields=["status"])
+
+    name = f"reports/{report.filename}-{report.pk}.pdf"
+    path = Path(settings.MEDIA_ROOT) / name
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        build_pdf(str(path), report.title, subtitle, sections)
+    except Exception as e:
+        report.status = "failed"
+        report.error = str(e)
+        report.completed_at = timezone.now()
+        report.save(update_fields=["status", "error", "completed_at"])
+        return f"Failed to generate {name}: {e}"
+
+    if cache_path:
+        write_cached_pdf(Path(cache_path), path.read_bytes())
+
+    report.file.name = name
+    report.status = "done"
+    report.completed_at = timezone.now()
+    report.save(update_fields=["file", "status", "completed_at"])
+    return f"Generated {name}."
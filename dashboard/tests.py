@@ -1,20 +1,30 @@
 import json
-from datetime import timedelta
+import tempfile
+from datetime import date, timedelta
 from decimal import Decimal
-
-from django.test import TestCase
+from pathlib import Path
+from unittest import mock
+
+from asgiref.sync import async_to_sync
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from django.test import TestCase, TransactionTestCase, override_settings
 from django.urls import reverse
 from django.utils import timezone
 
-from assets.models import Investment, Loan, RealEstate
+from assets.models import Investment, Loan, RealEstate, ValueChange
 from cashflow.models import CashFlowEntry
 from legal.models import LegalMatter
 from notes.models import Note
-from stakeholders.models import ContactLog, Stakeholder
+from stakeholders.models import ContactLog, Relationship, Stakeholder
 from tasks.models import FollowUp, Task
 
-from .models import Notification
-from .views import _parse_date, get_activity_timeline
+from . import deadlines, networth
+from .models import AssetSnapshot, Deadline, GeneratedReport, NetWorthSnapshot, Notification
+from .reports import generate_pdf_report
+from .sample_data import load_sample_data
+from .views import _parse_date, aget_activity_timeline, get_activity_timeline
 
 
 class DashboardViewTests(TestCase):
@@ -22,20 +32,32 @@ class DashboardViewTests(TestCase):
         resp = self.client.get(reverse("dashboard:index"))
         self.assertEqual(resp.status_code, 200)
 
-    def test_context_keys(self):
+    def test_shell_links_every_panel(self):
+        from .panels import PANELS
+
         resp = self.client.get(reverse("dashboard:index"))
-        for key in ("overdue_tasks", "upcoming_tasks", "stale_followups",
-                     "recent_activity", "liquidity_alerts", "cashflow",
-                     "net_worth", "upcoming_deadlines"):
+        for name in PANELS:
+            self.assertContains(resp, reverse("dashboard:panel", args=[name]))
+
+    def test_panel_context_keys(self):
+        for name, key in (("overdue_tasks", "overdue_tasks"), ("stale_followups", "stale_followups"),
+                          ("recent_activity", "recent_activity"), ("alerts", "liquidity_alerts"),
+                          ("cashflow", "cashflow"), ("net_worth", "net_worth"),
+                          ("upcoming_deadlines", "upcoming_deadlines")):
+            resp = self.client.get(reverse("dashboard:panel", args=[name]))
+            self.assertEqual(resp.status_code, 200)
             self.assertIn(key, resp.context, f"Missing context key: {key}")
 
+    def test_unknown_panel(self):
+        self.assertEqual(self.client.get(reverse("dashboard:panel", args=["nope"])).status_code, 404)
+
     def test_overdue_tasks_in_context(self):
         Task.objects.create(
             title="Overdue",
             due_date=timezone.localdate() - timedelta(days=2),
             status="not_started",
         )
-        resp = self.client.get(reverse("dashboard:index"))
+        resp = self.client.get(reverse("dashboard:panel", args=["overdue_tasks"]))
         self.assertTrue(resp.context["overdue_tasks"].exists())
 
     def test_upcoming_tasks(self):
@@ -44,8 +66,8 @@ class DashboardViewTests(TestCase):
             due_date=timezone.localdate() + timedelta(days=3),
             status="not_started",
         )
-        resp = self.client.get(reverse("dashboard:index"))
-        self.assertTrue(resp.context["upcoming_tasks"].exists())
+        resp = self.client.get(reverse("dashboard:panel", args=["upcoming_deadlines"]))
+        self.assertContains(resp, "Soon")
 
     def test_stale_followups(self):
         s = Stakeholder.objects.create(name="Stale Person")
@@ -55,7 +77,7 @@ class DashboardViewTests(TestCase):
             outreach_date=timezone.now() - timedelta(days=5),
             method="email", response_received=False,
         )
-        resp = self.client.get(reverse("dashboard:index"))
+        resp = self.client.get(reverse("dashboard:panel", args=["stale_followups"]))
         self.assertTrue(resp.context["stale_followups"].exists())
 
     def test_cashflow_summary(self):
@@ -68,12 +90,29 @@ class DashboardViewTests(TestCase):
             description="Expense", amount=Decimal("1000"),
             entry_type="outflow", date=today, is_projected=False,
         )
-        resp = self.client.get(reverse("dashboard:index"))
+        resp = self.client.get(reverse("dashboard:panel", args=["cashflow"]))
         cf = resp.context["cashflow"]
         self.assertEqual(cf["actual_inflows"], Decimal("3000"))
         self.assertEqual(cf["actual_outflows"], Decimal("1000"))
 
 
+class DashboardPanelCacheTests(TransactionTestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_panel_cached_until_its_models_change(self):
+        url = reverse("dashboard:panel", args=["overdue_tasks"])
+        self.client.get(url)
+        with self.assertNumQueries(0):
+            self.client.get(url)
+        Task.objects.create(title="Late filing", due_date=timezone.localdate() - timedelta(days=1))
+        self.assertContains(self.client.get(url), "Late filing")
+        # Unrelated writes keep the cached fragment
+        Note.objects.create(title="n", content="c", date=timezone.now())
+        with self.assertNumQueries(0):
+            self.client.get(url)
+
+
 class GlobalSearchTests(TestCase):
     @classmethod
     def setUpTestData(cls):
@@ -169,6 +208,13 @@ class ActivityTimelineTests(TestCase):
         resp = self.client.get(reverse("dashboard:timeline"))
         self.assertEqual(resp.status_code, 200)
 
+    def test_async_matches_sync(self):
+        s = Stakeholder.objects.create(name="Async")
+        ContactLog.objects.create(stakeholder=s, date=timezone.now(), method="call", summary="call")
+        Note.objects.create(title="Note", content="c", date=timezone.now() - timedelta(hours=1))
+        Task.objects.create(title="Task")
+        self.assertEqual(async_to_sync(aget_activity_timeline)(limit=2), get_activity_timeline(limit=2))
+
 
 class CalendarTests(TestCase):
     def test_calendar_view(self):
@@ -244,6 +290,80 @@ class CalendarTests(TestCase):
         self.assertTrue(len(hearing_events) >= 1)
 
 
+class DeadlineIndexTests(TestCase):
+    def setUp(self):
+        self.today = timezone.localdate()
+        self.stakeholder = Stakeholder.objects.create(name="Lender")
+
+    def test_saves_project_every_source(self):
+        task = Task.objects.create(
+            title="Due", due_date=self.today + timedelta(days=1),
+            reminder_date=timezone.now() + timedelta(hours=2), status="not_started",
+        )
+        loan = Loan.objects.create(
+            name="Mortgage", status="active", lender=self.stakeholder,
+            next_payment_date=self.today + timedelta(days=3), maturity_date=self.today + timedelta(days=900),
+        )
+        LegalMatter.objects.create(title="Case", status="active", next_hearing_date=self.today + timedelta(days=4))
+        ContactLog.objects.create(
+            stakeholder=self.stakeholder, date=timezone.now(), method="call", summary="x",
+            follow_up_needed=True, follow_up_date=self.today + timedelta(days=2),
+        )
+        self.assertEqual(
+            sorted(Deadline.objects.values_list("kind", flat=True)),
+            ["contact", "hearing", "maturity", "payment", "reminder", "task"],
+        )
+        payment = Deadline.objects.get(kind="payment")
+        self.assertEqual((payment.object_id, payment.stakeholder, payment.url),
+                         (loan.pk, self.stakeholder, loan.get_absolute_url()))
+        self.assertEqual(Deadline.objects.get(kind="contact").label, "Contact: Lender")
+        # Rows backfilled by the migration have no stored url
+        Deadline.objects.update(url="")
+        self.assertEqual(Deadline.objects.get(kind="payment").get_absolute_url(), loan.get_absolute_url())
+        self.assertEqual(Deadline.objects.get(kind="contact").get_absolute_url(), self.stakeholder.get_absolute_url())
+
+        loan.next_payment_date += timedelta(days=30)
+        loan.save()
+        self.assertEqual(Deadline.objects.get(kind="payment").date, loan.next_payment_date)
+
+        task.status = "complete"
+        task.save()
+        self.assertFalse(Deadline.objects.filter(kind__in=["task", "reminder"]).exists())
+        loan.delete()
+        self.assertFalse(Deadline.objects.filter(kind__in=["payment", "maturity"]).exists())
+
+    def test_bulk_complete_removes_deadlines(self):
+        task = Task.objects.create(title="Bulk", due_date=self.today, status="not_started")
+        self.client.post(reverse("tasks:bulk_complete"), {"selected": [task.pk]})
+        self.assertFalse(Deadline.objects.exists())
+
+    def test_rebuild(self):
+        Task.objects.create(title="Due", due_date=self.today, status="not_started")
+        Task.objects.create(title="Done", due_date=self.today, status="complete")
+        Deadline.objects.all().delete()
+        self.assertEqual(deadlines.rebuild(), 1)
+        self.assertEqual(Deadline.objects.get().title, "Due")
+
+    def test_upcoming_horizon(self):
+        for offset in (0, 6, 13, 29, 31):
+            Task.objects.create(title=f"T{offset}", due_date=self.today + timedelta(days=offset), status="not_started")
+        Task.objects.create(title="Past", due_date=self.today - timedelta(days=1), status="not_started")
+        self.assertEqual([d.title for d in deadlines.upcoming(7, self.today)], ["T0", "T6"])
+        self.assertEqual(deadlines.upcoming(30, self.today).count(), 4)
+        with self.assertNumQueries(1):
+            list(deadlines.upcoming(14, self.today, kinds=["task"]))
+
+    def test_panel_horizon_param(self):
+        Task.objects.create(title="Later", due_date=self.today + timedelta(days=10), status="not_started")
+        url = reverse("dashboard:panel", args=["upcoming_deadlines"])
+        resp = self.client.get(url, {"days": 7})
+        self.assertEqual(resp.context["days"], 7)
+        self.assertNotContains(resp, "Later")
+        self.assertContains(self.client.get(url, {"days": 14}), "Later")
+        # Anything but an offered horizon falls back to the default
+        self.assertEqual(self.client.get(url, {"days": 9999}).context["days"], deadlines.DEFAULT_HORIZON)
+
+
 class NetWorthTests(TestCase):
     def test_net_worth_calculation(self):
         RealEstate.objects.create(name="Prop1", address="1 Main", estimated_value=Decimal("500000"), status="owned")
@@ -252,7 +372,7 @@ class NetWorthTests(TestCase):
         Loan.objects.create(name="Loan1", current_balance=Decimal("200000"), status="active")
         Loan.objects.create(name="Loan2", current_balance=Decimal("50000"), status="paid_off")
 
-        resp = self.client.get(reverse("dashboard:index"))
+        resp = self.client.get(reverse("dashboard:panel", args=["net_worth"]))
         nw = resp.context["net_worth"]
         # total assets = 500000 (prop1, prop2 excluded because sold) + 100000 = 600000
         self.assertEqual(nw["total_assets"], Decimal("600000"))
@@ -267,27 +387,99 @@ class NetWorthTests(TestCase):
         Loan.objects.create(name="Payment Loan", status="active", next_payment_date=today + timedelta(days=10))
         LegalMatter.objects.create(title="Hearing Matter", status="active", next_hearing_date=today + timedelta(days=15))
 
-        resp = self.client.get(reverse("dashboard:index"))
-        deadlines = resp.context["upcoming_deadlines"]
-        types = {d["type"] for d in deadlines}
-        self.assertIn("task", types)
-        self.assertIn("payment", types)
-        self.assertIn("hearing", types)
+        resp = self.client.get(reverse("dashboard:panel", args=["upcoming_deadlines"]))
+        items = resp.context["upcoming_deadlines"]
+        kinds = {d.kind for d in items}
+        self.assertIn("task", kinds)
+        self.assertIn("payment", kinds)
+        self.assertIn("hearing", kinds)
         # Sorted by date
-        dates = [d["date"] for d in deadlines]
+        dates = [d.date for d in items]
         self.assertEqual(dates, sorted(dates))
 
     def test_asset_risk_properties(self):
         RealEstate.objects.create(name="Disputed Prop", address="1 Main", status="in_dispute")
-        resp = self.client.get(reverse("dashboard:index"))
+        resp = self.client.get(reverse("dashboard:panel", args=["asset_risk"]))
         self.assertTrue(resp.context["has_asset_risks"])
-        self.assertTrue(resp.context["at_risk_properties"].exists())
+        self.assertEqual([p.name for p in resp.context["at_risk_properties"]], ["Disputed Prop"])
 
     def test_asset_risk_loans(self):
         Loan.objects.create(name="Default Loan", status="defaulted")
-        resp = self.client.get(reverse("dashboard:index"))
+        resp = self.client.get(reverse("dashboard:panel", args=["asset_risk"]))
         self.assertTrue(resp.context["has_asset_risks"])
-        self.assertTrue(resp.context["at_risk_loans"].exists())
+        self.assertEqual(resp.context["at_risk_loans"][0].risk_factors, ["Defaulted"])
+
+
+class NetWorthHistoryTests(TestCase):
+    def test_snapshot_stores_totals_and_changes_only(self):
+        today = timezone.localdate()
+        prop = RealEstate.objects.create(name="P", address="1 Main", estimated_value=Decimal("500000"))
+        Investment.objects.create(name="I", current_value=Decimal("100000"))
+        loan = Loan.objects.create(name="L", current_balance=Decimal("200000"), status="active")
+        networth.take_snapshot(today - timedelta(days=2))
+        networth.take_snapshot(today - timedelta(days=1))
+        self.assertEqual(AssetSnapshot.objects.count(), 3)  # nothing changed on day two
+
+        prop.estimated_value = Decimal("550000")
+        prop.save()
+        loan.status = "paid_off"
+        loan.save()
+        networth.take_snapshot(today)
+        networth.take_snapshot(today)  # re-running the same day replaces it
+        snap = NetWorthSnapshot.objects.get(date=today)
+        self.assertEqual((snap.total_assets, snap.total_liabilities, snap.net_worth),
+                         (Decimal("650000"), Decimal("0"), Decimal("650000")))
+        self.assertEqual(NetWorthSnapshot.objects.count(), 3)
+        self.assertEqual(
+            dict(AssetSnapshot.objects.filter(date=today).values_list("kind", "value")),
+            {"property": Decimal("550000"), "loan": Decimal("0")},
+        )
+
+    def test_daily_update_snapshots_after_payments(self):
+        today = timezone.localdate()
+        Loan.objects.create(name="L", current_balance=Decimal("1000.00"), monthly_payment=Decimal("100.00"),
+                            next_payment_date=today - timedelta(days=1))
+        networth.daily_update(today)
+        snap = NetWorthSnapshot.objects.get(date=today)
+        self.assertEqual(snap.total_liabilities, Decimal("900.00"))
+
+    def test_setup_schedules_chains_the_daily_jobs(self):
+        from django_q.models import Schedule
+
+        Schedule.objects.create(name="Snapshot Net Worth", func="dashboard.networth.take_snapshot")
+        call_command("setup_schedules", stdout=mock.MagicMock())
+        names = set(Schedule.objects.values_list("name", flat=True))
+        self.assertIn("Daily Portfolio Update", names)
+        self.assertFalse(names & {"Post Loan Payments", "Score Asset Risk", "Snapshot Net Worth"})
+
+    def test_lttb(self):
+        points = [(x, 100.0) for x in range(1000)]
+        points[500] = (500, 1000.0)
+        kept = networth.lttb(points, 50)
+        self.assertEqual(len(kept), 50)
+        self.assertEqual((kept[0], kept[-1]), (0, 999))
+        self.assertIn(500, kept)  # the spike survives downsampling
+        self.assertEqual(kept, sorted(kept))
+        self.assertEqual(networth.lttb(points[:10], 50), list(range(10)))
+
+    def test_history_endpoint(self):
+        today = timezone.localdate()
+        NetWorthSnapshot.objects.bulk_create(
+            NetWorthSnapshot(date=today - timedelta(days=n), total_assets=n, total_liabilities=0, net_worth=n)
+            for n in range(2000)
+        )
+        data = self.client.get(reverse("dashboard:net_worth_history"), {"points": 100}).json()
+        self.assertEqual(len(data["labels"]), 100)
+        self.assertEqual(data["labels"][-1], today.isoformat())
+        self.assertEqual(len(data["net_worth"]), len(data["assets"]))
+        data = self.client.get(reverse("dashboard:net_worth_history"), {"range": "1y", "points": "x"}).json()
+        self.assertGreaterEqual(data["labels"][0], (today - timedelta(days=365)).isoformat())
+        self.assertEqual(len(data["labels"]), networth.DEFAULT_POINTS)
+
+    def test_panel_empty_state(self):
+        resp = self.client.get(reverse("dashboard:panel", args=["net_worth_history"]))
+        self.assertFalse(resp.context["has_history"])
+        self.assertNotContains(resp, "netWorthChart")
 
 
 class NotificationTests(TestCase):
@@ -321,3 +513,266 @@ class NotificationTests(TestCase):
         n2 = Notification.objects.create(message="Second")
         notifications = list(Notification.objects.all())
         self.assertEqual(notifications[0], n2)  # newest first
+
+
+class BackgroundReportTests(TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.media = Path(tmp.name)
+        override = override_settings(
+            MEDIA_ROOT=self.media, PDF_CACHE_DIR=self.media / "pdf_cache",
+            PDF_ASYNC_ROW_THRESHOLD=5,
+        )
+        override.enable()
+        self.addCleanup(override.disable)
+        self.stakeholder = Stakeholder.objects.create(name="Busy Person")
+        ContactLog.objects.bulk_create([
+            ContactLog(stakeholder=self.stakeholder, date=timezone.now(), method="call", summary=f"Log {i}")
+            for i in range(10)
+        ])
+        self.pdf_url = reverse("stakeholders:export_pdf", args=[self.stakeholder.pk])
+
+    def test_small_report_renders_inline(self):
+        small = Stakeholder.objects.create(name="Quiet Person")
+        resp = self.client.get(reverse("stakeholders:export_pdf", args=[small.pk]))
+        self.assertEqual(resp["Content-Type"], "application/pdf")
+        self.assertFalse(GeneratedReport.objects.exists())
+
+    @mock.patch("dashboard.reports.async_task")
+    def test_large_report_is_queued(self, async_task):
+        resp = self.client.get(self.pdf_url)
+        report = GeneratedReport.objects.get()
+        self.assertRedirects(resp, report.get_absolute_url())
+        self.assertEqual(report.status, "pending")
+        async_task.assert_called_once()
+        self.assertEqual(async_task.call_args.args[0], "dashboard.reports.generate_pdf_report")
+
+    @mock.patch("dashboard.reports.async_task")
+    def test_repeat_request_reuses_report(self, async_task):
+        self.client.get(self.pdf_url)
+        self.client.get(self.pdf_url)
+        self.assertEqual(GeneratedReport.objects.count(), 1)
+        async_task.assert_called_once()
+
+    @mock.patch("dashboard.reports.async_task")
+    def test_stuck_report_is_requeued(self, async_task):
+        self.client.get(self.pdf_url)
+        stuck = GeneratedReport.objects.get()
+        GeneratedReport.objects.filter(pk=stuck.pk).update(
+            status="running", created_at=timezone.now() - timedelta(seconds=settings.PDF_REPORT_TIMEOUT + 1),
+        )
+        self.client.get(self.pdf_url)
+        stuck.refresh_from_db()
+        self.assertEqual(stuck.status, "failed")
+        self.assertEqual(GeneratedReport.objects.filter(status="pending").count(), 1)
+        self.assertEqual(async_task.call_count, 2)
+
+    @mock.patch("dashboard.reports.async_task")
+    def test_worker_generates_file_and_fills_cache(self, async_task):
+        self.client.get(self.pdf_url)
+        generate_pdf_report(*async_task.call_args.args[1:])
+        report = GeneratedReport.objects.get()
+        self.assertEqual(report.status, "done")
+        self.assertTrue((self.media / report.file.name).exists())
+        self.assertTrue(report.file.name.startswith("reports/"))
+        # Later requests are served straight from the disk cache
+        resp = self.client.get(self.pdf_url)
+        self.assertEqual(resp["Content-Type"], "application/pdf")
+
+    @mock.patch("dashboard.reports.async_task")
+    def test_status_polls_until_done(self, async_task):
+        self.client.get(self.pdf_url)
+        report = GeneratedReport.objects.get()
+        status_url = reverse("dashboard:report_status", args=[report.pk])
+        self.assertContains(self.client.get(status_url), "hx-trigger")
+        self.assertEqual(self.client.get(reverse("dashboard:report_download", args=[report.pk])).status_code, 404)
+
+        generate_pdf_report(*async_task.call_args.args[1:])
+        resp = self.client.get(status_url)
+        self.assertNotContains(resp, "hx-trigger")
+        self.assertContains(resp, reverse("dashboard:report_download", args=[report.pk]))
+
+        resp = self.client.get(reverse("dashboard:report_download", args=[report.pk]))
+        self.assertEqual(resp["Content-Type"], "application/pdf")
+        self.assertIn(f"stakeholder-{self.stakeholder.pk}.pdf", resp["Content-Disposition"])
+        resp.close()
+
+    def test_worker_records_failure(self):
+        report = GeneratedReport.objects.create(title="Broken", filename="broken")
+        with mock.patch("blaine.pdf_export.build_pdf", side_effect=ValueError("boom")):
+            generate_pdf_report(report.pk, "", [])
+        report.refresh_from_db()
+        self.assertEqual(report.status, "failed")
+        self.assertIn("boom", report.error)
+        self.assertContains(self.client.get(report.get_absolute_url()), "boom")
+
+
+class PortfolioReportTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        lender = Stakeholder.objects.create(name="Bank", entity_type="lender")
+        for i in range(5):
+            RealEstate.objects.create(name=f"Property {i}", address="1 Main", jurisdiction="TX",
+                                      estimated_value=Decimal("100000"), stakeholder=lender)
+            Investment.objects.create(name=f"Fund {i}", current_value=Decimal("5000"))
+            Loan.objects.create(name=f"Loan {i}", lender=lender, current_balance=Decimal("20000"))
+            LegalMatter.objects.create(title=f"Matter {i}", status="active")
+        RealEstate.objects.create(name="Sold", address="2 Main", status="sold", estimated_value=Decimal("999"))
+        LegalMatter.objects.create(title="Closed", status="resolved")
+        today = timezone.localdate()
+        CashFlowEntry.objects.create(description="Rent", amount=Decimal("1500"), entry_type="inflow", date=today)
+        CashFlowEntry.objects.create(description="Tax", amount=Decimal("800"), entry_type="outflow",
+                                     date=today, is_projected=True)
+
+    def test_streams_pdf(self):
+        resp = self.client.get(reverse("dashboard:portfolio_report"))
+        self.assertEqual(resp.status_code, 200)
+        self.assertTrue(resp.streaming)
+        self.assertEqual(resp["Content-Type"], "application/pdf")
+        self.assertIn("portfolio-", resp["Content-Disposition"])
+        self.assertTrue(b"".join(resp.streaming_content).startswith(b"%PDF"))
+
+    def test_constant_query_count(self):
+        from .portfolio import portfolio_sections
+        with self.assertNumQueries(5):
+            portfolio_sections(timezone.localdate())
+        Loan.objects.create(name="Extra", current_balance=Decimal("1"))
+        with self.assertNumQueries(5):
+            portfolio_sections(timezone.localdate())
+
+    def test_sections_content(self):
+        from .portfolio import portfolio_sections
+        sections = {s["heading"]: s for s in portfolio_sections(timezone.localdate())}
+        summary = dict(sections["Summary"]["rows"])
+        self.assertEqual(summary["Real Estate"], "$500,000")
+        self.assertEqual(summary["Net Worth"], "$425,000")
+        self.assertEqual(len(sections["Active Legal Matters"]["rows"]), 5)
+        self.assertEqual(sections["Loans"]["rows"][0][1], "Bank")
+        cash = sections["Cash Flow Summary"]["rows"]
+        self.assertEqual(len(cash), 15)
+        this_month = cash[11]
+        self.assertEqual(this_month[1], "$1,500")
+        self.assertEqual(this_month[5], "$800")
+
+    @override_settings(PDF_ASYNC_ROW_THRESHOLD=3)
+    @mock.patch("dashboard.reports.async_task")
+    def test_large_portfolio_is_queued(self, async_task):
+        resp = self.client.get(reverse("dashboard:portfolio_report"))
+        report = GeneratedReport.objects.get()
+        self.assertRedirects(resp, report.get_absolute_url())
+        async_task.assert_called_once()
+
+
+class BenchmarkCommandTests(TestCase):
+    def _generate(self, **kwargs):
+        call_command("generate_benchmark_data", scale=0.001, stdout=mock.MagicMock(), **kwargs)
+
+    def _snapshot(self):
+        return (list(Stakeholder.objects.order_by("pk").values_list("name", "entity_type")),
+                list(CashFlowEntry.objects.order_by("pk").values_list("amount", "date", "entry_type")))
+
+    def test_generate_volumes(self):
+        self._generate()
+        self.assertEqual(Stakeholder.objects.count(), 10)
+        self.assertEqual(CashFlowEntry.objects.count(), 1000)
+        self.assertEqual(Note.objects.count(), 200)
+        self.assertGreater(Relationship.objects.count(), 0)
+        self.assertTrue(Note.participants.through.objects.exists())
+
+    def test_generate_is_seeded(self):
+        self._generate(seed=7)
+        first = self._snapshot()
+        ValueChange.objects.create(kind="property", object_id=1, field="status", old_value="owned", new_value="sold")
+        AssetSnapshot.objects.create(kind="property", object_id=1, date=date(2026, 1, 1), value=Decimal("1"))
+        Notification.objects.create(message="Stale")
+        self._generate(seed=7, clear=True)
+        self.assertEqual(self._snapshot(), first)
+        self.assertFalse(ValueChange.objects.exists())
+        self.assertFalse(AssetSnapshot.objects.exists())
+        self.assertFalse(Notification.objects.exists())
+
+    def test_generate_bumps_cache_versions(self):
+        from blaine.cache import model_versions
+
+        models = [Relationship, RealEstate, Loan, NetWorthSnapshot, LegalMatter]
+        before = model_versions(*models)
+        self._generate()
+        self.assertTrue(all(new > old for new, old in zip(model_versions(*models), before)))
+
+    def test_generate_refuses_existing_data(self):
+        Stakeholder.objects.create(name="Existing")
+        with self.assertRaises(CommandError):
+            self._generate()
+
+    def test_run_benchmarks_report(self):
+        self._generate()
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "report.json"
+            call_command("run_benchmarks", runs=1, output=str(path), only=["dashboard", "task_list"],
+                         stdout=mock.MagicMock())
+            report = json.loads(path.read_text())
+        self.assertEqual(set(report["results"]), {"dashboard", "task_list"})
+        self.assertEqual(report["results"]["task_list"]["status"], 200)
+        self.assertEqual(report["dataset"]["stakeholders.Stakeholder"], 10)
+
+
+class SampleDataTests(TestCase):
+    def test_bumps_cache_versions(self):
+        from blaine.cache import model_versions
+
+        models = [Stakeholder, Relationship, Note, CashFlowEntry]
+        before = model_versions(*models)
+        load_sample_data(log=lambda msg: None)
+        self.assertTrue(all(new > old for new, old in zip(model_versions(*models), before)))
+
+    def test_bulk_load(self):
+        # one INSERT per model/through table + savepoint, then the deadline index and risk score rebuilds
+        with self.assertNumQueries(44):
+            counts = load_sample_data(log=lambda msg: None)
+        self.assertEqual(Stakeholder.objects.count(), counts["Stakeholders"])
+        self.assertEqual(Note.objects.count(), counts["Notes"])
+        self.assertEqual(CashFlowEntry.objects.count(), counts["Cash Flow"])
+        matter = LegalMatter.objects.get(title="Holston Eviction - 1200 Oak Ave")
+        self.assertEqual([a.name for a in matter.attorneys.all()], ["Marcus Reed"])
+        self.assertEqual([p.name for p in matter.related_properties.all()], ["1200 Oak Avenue"])
+        note = Note.objects.get(title="Magnolia Blvd walkthrough notes")
+        self.assertEqual(note.participants.count(), 2)
+        self.assertEqual(note.related_tasks.get().title, "Review Magnolia closing documents")
+        self.assertIsNotNone(Stakeholder.objects.first().created_at)
+
+    def test_command_if_empty(self):
+        Stakeholder.objects.create(name="Existing")
+        out = mock.MagicMock()
+        call_command("load_sample_data", if_empty=True, stdout=out)
+        self.assertEqual(Stakeholder.objects.count(), 1)
+
+
+class BootstrapCommandTests(TestCase):
+    def _bootstrap(self, static_root, **env):
+        out = mock.MagicMock()
+        with override_settings(STATIC_ROOT=static_root), mock.patch.dict("os.environ", env):
+            call_command("bootstrap", stdout=out)
+        return "".join(call.args[0] for call in out.write.call_args_list)
+
+    def test_skips_unchanged_steps(self):
+        with tempfile.TemporaryDirectory() as static_root:
+            first = self._bootstrap(static_root, LOAD_SAMPLE_DATA="true")
+            self.assertIn("up to date, skipped", first)  # test DB is already migrated
+            self.assertIn("collected", first)
+            self.assertIn("loaded", first)
+            self.assertTrue((Path(static_root) / "css").exists())
+
+            second = self._bootstrap(static_root, LOAD_SAMPLE_DATA="true")
+            self.assertIn("unchanged, skipped", second)
+            self.assertIn("already loaded, skipped", second)
+
+    def test_superuser_created_once(self):
+        from django.contrib.auth.models import User
+
+        env = {"DJANGO_SUPERUSER_USERNAME": "admin", "DJANGO_SUPERUSER_PASSWORD": "pw-12345-x",
+               "DJANGO_SUPERUSER_EMAIL": "admin@example.com"}
+        with tempfile.TemporaryDirectory() as static_root:
+            self._bootstrap(static_root, **env)
+            self.assertIn("exists, skipped", self._bootstrap(static_root, **env))
+        self.assertTrue(User.objects.get(username="admin").is_superuser)
@@ -5,6 +5,8 @@ app_name = "dashboard"
 
 urlpatterns = [
     path("", views.dashboard, name="index"),
+    path("panels/<slug:name>/", views.dashboard_panel, name="panel"),
+    path("net-worth/history/", views.net_worth_history, name="net_worth_history"),
     path("search/", views.global_search, name="search"),
     path("timeline/", views.activity_timeline, name="timeline"),
     path("calendar/", views.calendar_view, name="calendar"),
@@ -14,4 +16,9 @@ urlpatterns = [
     path("notifications/", views.notifications_list, name="notifications"),
     path("notifications/badge/", views.notifications_badge, name="notifications_badge"),
     path("notifications/mark-read/", views.notifications_mark_read, name="notifications_mark_read"),
+    path("debug/perf/", views.perf_debug, name="perf_debug"),
+    path("reports/portfolio/", views.portfolio_report, name="portfolio_report"),
+    path("reports/<int:pk>/", views.report_detail, name="report_detail"),
+    path("reports/<int:pk>/status/", views.report_status, name="report_status"),
+    path("reports/<int:pk>/download/", views.report_download, name="report_download"),
 ]
@@ -1,11 +1,12 @@
 from datetime import date, timedelta
 from datetime import datetime as dt
 
+from asgiref.sync import sync_to_async
 from django.contrib import messages
 from django.core.mail import send_mail
-from django.db.models import Q, Sum
-from django.http import JsonResponse
-from django.shortcuts import redirect, render
+from django.db.models import Q
+from django.http import FileResponse, Http404, HttpResponse, JsonResponse
+from django.shortcuts import get_object_or_404, redirect, render
 from django.utils import timezone
 from django.views.decorators.http import require_POST
 
@@ -18,144 +19,45 @@ from tasks.models import FollowUp, Task
 
 
 def dashboard(request):
-    today = timezone.localdate()
-    now = timezone.now()
-
-    # Overdue tasks: due before today and not complete
-    overdue_tasks = Task.objects.filter(
-        due_date__lt=today,
-    ).exclude(
-        status="complete",
-    ).select_related("related_stakeholder")
-
-    # Upcoming tasks: due between today and today+14 days, not complete
-    upcoming_tasks = Task.objects.filter(
-        due_date__gte=today,
-        due_date__lte=today + timedelta(days=14),
-    ).exclude(
-        status="complete",
-    ).select_related("related_stakeholder")
-
-    # Active legal matters: status is 'active' or 'pending'
-    active_legal_matters = LegalMatter.objects.filter(
-        Q(status="active") | Q(status="pending"),
-    )
+    """Page shell; every panel is loaded separately from dashboard_panel."""
+    from dashboard.panels import LAYOUT
 
-    # Recent activity: mixed timeline items for dashboard panel
-    recent_activity = get_activity_timeline(limit=10)
+    return render(request, "dashboard/index.html", {"layout": LAYOUT})
 
-    # Recent notes: last 10 ordered by -date
-    recent_notes = Note.objects.order_by("-date")[:10]
 
-    # Stale follow-ups: no response received and outreach_date > 3 days ago
-    stale_followups = FollowUp.objects.filter(
-        response_received=False,
-        outreach_date__lt=now - timedelta(days=3),
-    ).select_related("task", "stakeholder")
+def dashboard_panel(request, name):
+    """One dashboard panel as an HTML fragment, cached per panel (see dashboard.panels)."""
+    from dashboard.panels import render_panel
 
-    # Cash flow summary for current month
-    current_month_entries = CashFlowEntry.objects.filter(
-        date__year=today.year,
-        date__month=today.month,
-    )
+    return HttpResponse(render_panel(request, name))
 
-    actual_inflows = current_month_entries.filter(
-        entry_type="inflow", is_projected=False,
-    ).aggregate(total=Sum("amount"))["total"] or 0
-
-    actual_outflows = current_month_entries.filter(
-        entry_type="outflow", is_projected=False,
-    ).aggregate(total=Sum("amount"))["total"] or 0
-
-    projected_inflows = current_month_entries.filter(
-        entry_type="inflow", is_projected=True,
-    ).aggregate(total=Sum("amount"))["total"] or 0
-
-    projected_outflows = current_month_entries.filter(
-        entry_type="outflow", is_projected=True,
-    ).aggregate(total=Sum("amount"))["total"] or 0
-
-    from cashflow.alerts import get_liquidity_alerts
-
-    # Net Worth calculation
-    total_real_estate = RealEstate.objects.exclude(status="sold").aggregate(
-        total=Sum("estimated_value"),
-    )["total"] or 0
-    total_investments = Investment.objects.aggregate(
-        total=Sum("current_value"),
-    )["total"] or 0
-    total_assets = total_real_estate + total_investments
-    total_liabilities = Loan.objects.filter(status="active").aggregate(
-        total=Sum("current_balance"),
-    )["total"] or 0
-    net_worth = total_assets - total_liabilities
-
-    # Upcoming Deadlines (next 30 days, unified)
-    deadline_horizon = today + timedelta(days=30)
-    upcoming_deadlines = []
-    for task in Task.objects.filter(
-        due_date__gte=today, due_date__lte=deadline_horizon,
-    ).exclude(status="complete").select_related("related_stakeholder"):
-        upcoming_deadlines.append({
-            "date": task.due_date, "type": "task", "color": "yellow",
-            "title": task.title, "url": task.get_absolute_url(),
-        })
-    for loan in Loan.objects.filter(
-        status="active", next_payment_date__gte=today,
-        next_payment_date__lte=deadline_horizon,
-    ):
-        upcoming_deadlines.append({
-            "date": loan.next_payment_date, "type": "payment", "color": "red",
-            "title": f"Payment: {loan.name}", "url": loan.get_absolute_url(),
-        })
-    for matter in LegalMatter.objects.filter(
-        next_hearing_date__gte=today, next_hearing_date__lte=deadline_horizon,
-    ).exclude(status="resolved"):
-        upcoming_deadlines.append({
-            "date": matter.next_hearing_date, "type": "hearing", "color": "purple",
-            "title": f"Hearing: {matter.title}", "url": matter.get_absolute_url(),
-        })
-    upcoming_deadlines.sort(key=lambda x: x["date"])
-
-    # Asset Risk
-    from django.db.models import Q as DQ
-    at_risk_properties = RealEstate.objects.filter(
-        DQ(status="in_dispute") | DQ(legal_matters__status__in=["active", "pending"]),
-    ).distinct()
-    at_risk_loans = Loan.objects.filter(
-        status__in=["defaulted", "in_dispute"],
+
+def net_worth_history(request):
+    """JSON endpoint for the net worth chart: ?range=1y|5y|all&points=N."""
+    from blaine.cache import cached
+    from dashboard import networth
+    from dashboard.models import NetWorthSnapshot
+
+    span = request.GET.get("range", "all")
+    if span not in networth.RANGES:
+        span = "all"
+    try:
+        points = min(max(int(request.GET.get("points", "")), 3), networth.MAX_POINTS)
+    except ValueError:
+        points = networth.DEFAULT_POINTS
+    today = timezone.localdate()
+    days = networth.RANGES[span]
+    start = today - timedelta(days=days) if days else None
+    data = cached(
+        "dashboard:net_worth_history", [NetWorthSnapshot],
+        lambda: networth.history(start, points), vary=[today, span, points],
     )
-    has_asset_risks = at_risk_properties.exists() or at_risk_loans.exists()
-
-    context = {
-        "overdue_tasks": overdue_tasks,
-        "upcoming_tasks": upcoming_tasks,
-        "active_legal_matters": active_legal_matters,
-        "recent_notes": recent_notes,
-        "recent_activity": recent_activity,
-        "stale_followups": stale_followups,
-        "liquidity_alerts": get_liquidity_alerts(),
-        "cashflow": {
-            "actual_inflows": actual_inflows,
-            "actual_outflows": actual_outflows,
-            "projected_inflows": projected_inflows,
-            "projected_outflows": projected_outflows,
-        },
-        "net_worth": {
-            "total_assets": total_assets,
-            "total_liabilities": total_liabilities,
-            "net_worth": net_worth,
-        },
-        "upcoming_deadlines": upcoming_deadlines,
-        "at_risk_properties": at_risk_properties,
-        "at_risk_loans": at_risk_loans,
-        "has_asset_risks": has_asset_risks,
-    }
+    return JsonResponse(data)
 
-    return render(request, "dashboard/index.html", context)
 
+async def global_search(request):
+    from blaine.concurrency import gather_queries
 
-def global_search(request):
     q = request.GET.get("q", "").strip()
     context = {"query": q}
 
@@ -179,7 +81,8 @@ def global_search(request):
         context["cashflow_entries"] = CashFlowEntry.objects.filter(
             description__icontains=q
         )[:limit]
-        context["has_results"] = any([
+        # Each LIKE scan is independent; evaluate them concurrently
+        results = await gather_queries(
             context["stakeholders"],
             context["tasks_results"],
             context["notes"],
@@ -188,95 +91,131 @@ def global_search(request):
             context["investments"],
             context["loans"],
             context["cashflow_entries"],
-        ])
+        )
+        context["has_results"] = any(results)
     else:
         context["has_results"] = False
 
     if request.headers.get("HX-Request"):
-        return render(request, "dashboard/partials/_search_results.html", context)
-    return render(request, "dashboard/search.html", context)
+        return await sync_to_async(render)(request, "dashboard/partials/_search_results.html", context)
+    return await sync_to_async(render)(request, "dashboard/search.html", context)
+
+
+def _timeline_contact(log):
+    return {
+        "date": log.date,
+        "type": "contact",
+        "color": "blue",
+        "icon": "phone",
+        "title": f"{log.get_method_display()} with {log.stakeholder.name}",
+        "summary": log.summary[:120],
+        "url": log.get_absolute_url(),
+    }
 
 
-def get_activity_timeline(limit=50):
-    """Aggregate records from multiple models into unified chronological feed."""
-    items = []
-
-    for log in ContactLog.objects.select_related("stakeholder").order_by("-date")[:limit]:
-        items.append({
-            "date": log.date,
-            "type": "contact",
-            "color": "blue",
-            "icon": "phone",
-            "title": f"{log.get_method_display()} with {log.stakeholder.name}",
-            "summary": log.summary[:120],
-            "url": log.get_absolute_url(),
-        })
+def _timeline_note(note):
+    return {
+        "date": note.date,
+        "type": "note",
+        "color": "indigo",
+        "icon": "pencil",
+        "title": note.title,
+        "summary": note.content[:120],
+        "url": note.get_absolute_url(),
+    }
 
-    for note in Note.objects.order_by("-date")[:limit]:
-        items.append({
-            "date": note.date,
-            "type": "note",
-            "color": "indigo",
-            "icon": "pencil",
-            "title": note.title,
-            "summary": note.content[:120],
-            "url": note.get_absolute_url(),
-        })
 
-    for task in Task.objects.order_by("-created_at")[:limit]:
-        items.append({
-            "date": task.created_at,
-            "type": "task",
-            "color": "yellow",
-            "icon": "clipboard",
-            "title": task.title,
-            "summary": f"{task.get_status_display()} / {task.get_priority_display()}",
-            "url": task.get_absolute_url(),
-        })
+def _timeline_task(task):
+    return {
+        "date": task.created_at,
+        "type": "task",
+        "color": "yellow",
+        "icon": "clipboard",
+        "title": task.title,
+        "summary": f"{task.get_status_display()} / {task.get_priority_display()}",
+        "url": task.get_absolute_url(),
+    }
 
-    for fu in FollowUp.objects.select_related("task", "stakeholder").order_by("-outreach_date")[:limit]:
-        items.append({
-            "date": fu.outreach_date,
-            "type": "followup",
-            "color": "amber",
-            "icon": "arrow-path",
-            "title": f"Follow-up: {fu.stakeholder.name}",
-            "summary": fu.notes_text[:120] if fu.notes_text else f"Re: {fu.task.title}",
-            "url": fu.get_absolute_url(),
-        })
 
-    for entry in CashFlowEntry.objects.order_by("-date")[:limit]:
-        color = "green" if entry.entry_type == "inflow" else "red"
-        items.append({
-            "date": timezone.make_aware(
-                timezone.datetime.combine(entry.date, timezone.datetime.min.time())
-            ),
-            "type": "cashflow",
-            "color": color,
-            "icon": "currency-dollar",
-            "title": entry.description,
-            "summary": f"{'+'if entry.entry_type == 'inflow' else '-'}${entry.amount:,.0f}",
-            "url": entry.get_absolute_url(),
-        })
+def _timeline_followup(fu):
+    return {
+        "date": fu.outreach_date,
+        "type": "followup",
+        "color": "amber",
+        "icon": "arrow-path",
+        "title": f"Follow-up: {fu.stakeholder.name}",
+        "summary": fu.notes_text[:120] if fu.notes_text else f"Re: {fu.task.title}",
+        "url": fu.get_absolute_url(),
+    }
+
+
+def _timeline_cashflow(entry):
+    color = "green" if entry.entry_type == "inflow" else "red"
+    return {
+        "date": timezone.make_aware(
+            timezone.datetime.combine(entry.date, timezone.datetime.min.time())
+        ),
+        "type": "cashflow",
+        "color": color,
+        "icon": "currency-dollar",
+        "title": entry.description,
+        "summary": f"{'+'if entry.entry_type == 'inflow' else '-'}${entry.amount:,.0f}",
+        "url": entry.get_absolute_url(),
+    }
+
+
+def _timeline_evidence(ev):
+    return {
+        "date": ev.created_at,
+        "type": "evidence",
+        "color": "purple",
+        "icon": "document",
+        "title": ev.title,
+        "summary": f"Added to {ev.legal_matter.title}",
+        "url": ev.get_absolute_url(),
+    }
+
+
+# Models read by the activity timeline (including select_related ones)
+TIMELINE_MODELS = [ContactLog, Stakeholder, Note, Task, FollowUp, CashFlowEntry, Evidence, LegalMatter]
 
-    for ev in Evidence.objects.select_related("legal_matter").order_by("-created_at")[:limit]:
-        items.append({
-            "date": ev.created_at,
-            "type": "evidence",
-            "color": "purple",
-            "icon": "document",
-            "title": ev.title,
-            "summary": f"Added to {ev.legal_matter.title}",
-            "url": ev.get_absolute_url(),
-        })
 
+def _timeline_sources(limit):
+    """(queryset, item builder) per model feeding the activity timeline."""
+    return [
+        (ContactLog.objects.select_related("stakeholder").order_by("-date")[:limit], _timeline_contact),
+        (Note.objects.order_by("-date")[:limit], _timeline_note),
+        (Task.objects.order_by("-created_at")[:limit], _timeline_task),
+        (FollowUp.objects.select_related("task", "stakeholder").order_by("-outreach_date")[:limit],
+         _timeline_followup),
+        (CashFlowEntry.objects.order_by("-date")[:limit], _timeline_cashflow),
+        (Evidence.objects.select_related("legal_matter").order_by("-created_at")[:limit], _timeline_evidence),
+    ]
+
+
+def _merge_timeline(sources, limit):
+    items = [build(obj) for queryset, build in sources for obj in queryset]
     items.sort(key=lambda x: x["date"], reverse=True)
     return items[:limit]
 
 
-def activity_timeline(request):
-    items = get_activity_timeline(limit=100)
-    return render(request, "dashboard/timeline.html", {"timeline_items": items})
+def get_activity_timeline(limit=50):
+    """Aggregate records from multiple models into unified chronological feed."""
+    return _merge_timeline(_timeline_sources(limit), limit)
+
+
+async def aget_activity_timeline(limit=50):
+    """Async get_activity_timeline(): the per-model queries run concurrently."""
+    from blaine.concurrency import gather_queries
+
+    sources = _timeline_sources(limit)
+    await gather_queries(*(queryset for queryset, _build in sources))
+    return _merge_timeline(sources, limit)
+
+
+async def activity_timeline(request):
+    items = await aget_activity_timeline(limit=100)
+    return await sync_to_async(render)(request, "dashboard/timeline.html", {"timeline_items": items})
 
 
 def calendar_view(request):
@@ -293,54 +232,55 @@ def _parse_date(value):
         return None
 
 
-def calendar_events(request):
+async def calendar_events(request):
     """JSON endpoint for FullCalendar events."""
+    from blaine.concurrency import gather_queries
+    from dashboard import deadlines
+
     start = _parse_date(request.GET.get("start", ""))
     end = _parse_date(request.GET.get("end", ""))
-    events = []
 
-    # Task events - color by priority
+    # Tasks, loan payments, hearings and contact follow-ups come from the deadline index
     priority_colors = {
         "critical": "#ef4444",
         "high": "#f97316",
         "medium": "#eab308",
         "low": "#9ca3af",
     }
-    tasks = Task.objects.exclude(status="complete")
+    kind_colors = {"payment": "#dc2626", "hearing": "#7c3aed", "contact": "#3b82f6"}
+    due = deadlines.between(start, end, kinds=["task", "payment", "hearing", "contact"])
+
+    # Follow-up events (amber)
+    followups = FollowUp.objects.filter(response_received=False).select_related("task", "stakeholder")
     if start:
-        tasks = tasks.filter(due_date__gte=start)
+        followups = followups.filter(outreach_date__date__gte=start)
     if end:
-        tasks = tasks.filter(due_date__lte=end)
-    for task in tasks.filter(due_date__isnull=False):
-        events.append({
-            "title": task.title,
-            "start": str(task.due_date),
-            "url": task.get_absolute_url(),
-            "color": priority_colors.get(task.priority, "#9ca3af"),
-            "extendedProps": {"type": "task"},
-        })
+        followups = followups.filter(outreach_date__date__lte=end)
 
-    # Loan payment events (red)
-    loans = Loan.objects.filter(status="active", next_payment_date__isnull=False)
+    # Legal filing dates (purple)
+    matters = LegalMatter.objects.filter(filing_date__isnull=False).exclude(status="resolved")
     if start:
-        loans = loans.filter(next_payment_date__gte=start)
+        matters = matters.filter(filing_date__gte=start)
     if end:
-        loans = loans.filter(next_payment_date__lte=end)
-    for loan in loans:
+        matters = matters.filter(filing_date__lte=end)
+
+    # The three sources are independent; fetch them concurrently, then build events in order
+    await gather_queries(due, followups, matters)
+
+    events = []
+    for deadline in due:
+        if deadline.kind == "task":
+            color = priority_colors.get(deadline.priority, "#9ca3af")
+        else:
+            color = kind_colors[deadline.kind]
         events.append({
-            "title": f"Payment: {loan.name}",
-            "start": str(loan.next_payment_date),
-            "url": loan.get_absolute_url(),
-            "color": "#dc2626",
-            "extendedProps": {"type": "payment"},
+            "title": deadline.label,
+            "start": str(deadline.date),
+            "url": deadline.get_absolute_url(),
+            "color": color,
+            "extendedProps": {"type": deadline.kind},
         })
 
-    # Follow-up events (amber)
-    followups = FollowUp.objects.filter(response_received=False).select_related("task", "stakeholder")
-    if start:
-        followups = followups.filter(outreach_date__date__gte=start)
-    if end:
-        followups = followups.filter(outreach_date__date__lte=end)
     for fu in followups:
         events.append({
             "title": f"Follow-up: {fu.stakeholder.name}",
@@ -350,12 +290,6 @@ def calendar_events(request):
             "extendedProps": {"type": "followup"},
         })
 
-    # Legal filing dates (purple)
-    matters = LegalMatter.objects.filter(filing_date__isnull=False).exclude(status="resolved")
-    if start:
-        matters = matters.filter(filing_date__gte=start)
-    if end:
-        matters = matters.filter(filing_date__lte=end)
     for matter in matters:
         events.append({
             "title": f"Legal: {matter.title}",
@@ -365,38 +299,6 @@ def calendar_events(request):
             "extendedProps": {"type": "legal"},
         })
 
-    # Legal hearing dates (dark purple)
-    hearings = LegalMatter.objects.filter(next_hearing_date__isnull=False).exclude(status="resolved")
-    if start:
-        hearings = hearings.filter(next_hearing_date__gte=start)
-    if end:
-        hearings = hearings.filter(next_hearing_date__lte=end)
-    for matter in hearings:
-        events.append({
-            "title": f"Hearing: {matter.title}",
-            "start": str(matter.next_hearing_date),
-            "url": matter.get_absolute_url(),
-            "color": "#7c3aed",
-            "extendedProps": {"type": "hearing"},
-        })
-
-    # Contact follow-up dates (blue)
-    contacts = ContactLog.objects.filter(
-        follow_up_needed=True, follow_up_date__isnull=False
-    ).select_related("stakeholder")
-    if start:
-        contacts = contacts.filter(follow_up_date__gte=start)
-    if end:
-        contacts = contacts.filter(follow_up_date__lte=end)
-    for log in contacts:
-        events.append({
-            "title": f"Contact: {log.stakeholder.name}",
-            "start": str(log.follow_up_date),
-            "url": log.get_absolute_url(),
-            "color": "#3b82f6",
-            "extendedProps": {"type": "contact"},
-        })
-
     return JsonResponse(events, safe=False)
 
 
@@ -458,3 +360,52 @@ def notifications_mark_read(request):
     from dashboard.models import Notification
     Notification.objects.filter(is_read=False).update(is_read=True)
     return render(request, "dashboard/partials/_notification_badge.html", {"unread_count": 0})
+
+
+def portfolio_report(request):
+    """Consolidated PDF of all properties, investments, loans, active matters and cash flow."""
+    from blaine.pdf_export import stream_pdf
+    from dashboard.portfolio import portfolio_sections
+
+    today = timezone.localdate()
+    return stream_pdf(request, f"portfolio-{today:%Y-%m-%d}", "Portfolio Report",
+                      f"As of {today:%B %d, %Y}", portfolio_sections(today))
+
+
+def report_detail(request, pk):
+    from dashboard.models import GeneratedReport
+    report = get_object_or_404(GeneratedReport, pk=pk)
+    return render(request, "dashboard/report_detail.html", {"report": report})
+
+
+def report_status(request, pk):
+    from dashboard.models import GeneratedReport
+    report = get_object_or_404(GeneratedReport, pk=pk)
+    return render(request, "dashboard/partials/_report_status.html", {"report": report})
+
+
+def report_download(request, pk):
+    from dashboard.models import GeneratedReport
+    report = get_object_or_404(GeneratedReport, pk=pk, status="done")
+    try:
+        fh = report.file.open("rb")
+    except FileNotFoundError:
+        raise Http404("Report file is missing.")
+    return FileResponse(fh, as_attachment=True, filename=f"{report.filename}.pdf",
+                        content_type="application/pdf")
+
+
+def perf_debug(request):
+    """Rolling p50/p95/p99 per URL name from blaine.profiling (404 unless enabled)."""
+    from django.conf import settings
+
+    from blaine.profiling import perf_summary, recent_profiles
+
+    if not settings.PERF_PROFILING:
+        raise Http404
+    return render(request, "dashboard/perf.html", {
+        "rows": perf_summary(),
+        "profiles": recent_profiles()[:20],
+        "buffer_size": settings.PERF_BUFFER_SIZE,
+        "slow_ms": settings.PERF_SLOW_MS,
+    })
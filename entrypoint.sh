@@ -1,36 +1,24 @@
 #!/bin/bash
 set -e
 
-echo "Running migrations..."
-python manage.py migrate --noinput
-
-echo "Collecting static files..."
-python manage.py collectstatic --noinput
-
-echo "Creating superuser (if not exists)..."
-python manage.py createsuperuser --noinput || true
-
-echo "Setting up notification schedules..."
-python manage.py setup_schedules
-
-# Load sample data if requested and DB is empty
-if [ "$LOAD_SAMPLE_DATA" = "true" ]; then
-    python -c "
-import django, os
-os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'blaine.settings')
-django.setup()
-from stakeholders.models import Stakeholder
-if not Stakeholder.objects.exists():
-    print('Loading sample data...')
-    import subprocess
-    subprocess.run(['python', 'manage.py', 'load_sample_data'], check=True)
-else:
-    print('Sample data already loaded, skipping.')
-"
-fi
+# migrate, collectstatic, createsuperuser, setup_schedules and sample data
+# (LOAD_SAMPLE_DATA=true) in one Django process; unchanged steps are skipped.
+python manage.py bootstrap
 
 echo "Starting qcluster in background..."
 python manage.py qcluster &
 
+# SERVER_MODE=asgi serves through uvicorn so the async views
+# (search, timeline, calendar feed) run their queries concurrently.
+# Worker count and recycling come from blaine/gunicorn_conf.py, so the
+# CPU/memory sizing and GUNICORN_* overrides apply here too.
+if [ "${SERVER_MODE:-wsgi}" = "asgi" ]; then
+    echo "Starting Uvicorn..."
+    read -r WORKERS MAX_REQUESTS < <(python -c 'from blaine import gunicorn_conf as c; print(c.workers, c.max_requests)')
+    exec uvicorn blaine.asgi:application --host 0.0.0.0 --port 8000 \
+        --workers "$WORKERS" --limit-max-requests "$MAX_REQUESTS"
+fi
+
 echo "Starting Gunicorn..."
-exec gunicorn blaine.wsgi:application --bind 0.0.0.0:8000 --workers 2
+# Worker/thread counts, preload and recycling: blaine/gunicorn_conf.py (GUNICORN_* overrides)
+exec gunicorn blaine.wsgi:application -c python:blaine.gunicorn_conf
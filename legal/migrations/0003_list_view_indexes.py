@@ -0,0 +1,35 @@
+# Generated by Django 6.0.2 on 2026-10-19 08:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('assets', '0002_list_view_indexes'),
+        ('legal', '0002_legalmatter_judgment_amount_and_more'),
+        ('stakeholders', '0002_list_view_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='evidence',
+            index=models.Index(fields=['created_at'], name='evidence_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='legalmatter',
+            index=models.Index(fields=['created_at'], name='legal_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='legalmatter',
+            index=models.Index(fields=['status', 'next_hearing_date'], name='legal_status_hearing_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='legalmatter',
+            index=models.Index(fields=['filing_date'], name='legal_filing_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='legalmatter',
+            index=models.Index(fields=['next_hearing_date'], name='legal_hearing_idx'),
+        ),
+    ]
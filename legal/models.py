@@ -49,6 +49,12 @@ class LegalMatter(models.Model):
 
     class Meta:
         ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["created_at"], name="legal_created_idx"),
+            models.Index(fields=["status", "next_hearing_date"], name="legal_status_hearing_idx"),
+            models.Index(fields=["filing_date"], name="legal_filing_idx"),
+            models.Index(fields=["next_hearing_date"], name="legal_hearing_idx"),
+        ]
 
 
 class Evidence(models.Model):
@@ -69,3 +75,6 @@ class Evidence(models.Model):
     class Meta:
         verbose_name_plural = "Evidence"
         ordering = ["-date_obtained"]
+        indexes = [
+            models.Index(fields=["created_at"], name="evidence_created_idx"),
+        ]
@@ -153,6 +153,19 @@ class LegalViewTests(TestCase):
         resp = self.client.get(reverse("legal:export_pdf", args=[self.matter.pk]))
         self.assertEqual(resp["Content-Type"], "application/pdf")
 
+    def test_pdf_query_count(self):
+        from tasks.models import Task
+        for i in range(3):
+            person = Stakeholder.objects.create(name=f"Person {i}")
+            self.matter.attorneys.add(person)
+            self.matter.related_stakeholders.add(person)
+            Evidence.objects.create(legal_matter=self.matter, title=f"Exhibit {i}")
+            Task.objects.create(title=f"Task {i}", related_legal_matter=self.matter)
+        # matter + attorneys, related stakeholders, evidence, active tasks
+        with self.assertNumQueries(5):
+            resp = self.client.get(reverse("legal:export_pdf", args=[self.matter.pk]))
+        self.assertEqual(resp["Content-Type"], "application/pdf")
+
     def test_evidence_add(self):
         uploaded = SimpleUploadedFile("test.pdf", b"fakecontent", content_type="application/pdf")
         resp = self.client.post(
@@ -1,8 +1,11 @@
 from django.contrib import messages
+from django.db.models import Prefetch
 from django.shortcuts import get_object_or_404, redirect, render
 from django.urls import reverse_lazy
 from django.views.generic import CreateView, DeleteView, DetailView, ListView, UpdateView
 
+from tasks.models import Task
+
 from .forms import EvidenceForm, LegalMatterForm
 from .models import Evidence, LegalMatter
 
@@ -128,9 +131,19 @@ def export_csv(request):
     return do_export(qs, fields, "legal_matters")
 
 
+LEGAL_MATTER_PDF_PLAN = {
+    "prefetch_related": [
+        "attorneys",
+        "related_stakeholders",
+        "evidence",
+        Prefetch("tasks", queryset=Task.objects.exclude(status="complete"), to_attr="active_tasks"),
+    ],
+}
+
+
 def export_pdf_detail(request, pk):
-    from blaine.pdf_export import render_pdf
-    m = get_object_or_404(LegalMatter, pk=pk)
+    from blaine.pdf_export import get_pdf_object, render_pdf
+    m = get_pdf_object(LegalMatter, pk, LEGAL_MATTER_PDF_PLAN)
     sections = [
         {"heading": "Case Information", "type": "info", "rows": [
             ("Case Number", m.case_number or "N/A"),
@@ -162,14 +175,14 @@ def export_pdf_detail(request, pk):
                          "headers": ["Title", "Type", "Date Obtained"],
                          "rows": [[e.title, e.evidence_type or "-",
                                    e.date_obtained.strftime("%b %d, %Y") if e.date_obtained else "-"] for e in evidence]})
-    tasks = m.tasks.exclude(status="complete")
+    tasks = m.active_tasks
     if tasks:
         sections.append({"heading": "Related Tasks", "type": "table",
                          "headers": ["Title", "Status", "Priority", "Due Date"],
                          "rows": [[t.title, t.get_status_display(), t.get_priority_display(),
                                    t.due_date.strftime("%b %d, %Y") if t.due_date else "-"] for t in tasks]})
     return render_pdf(request, f"legal-matter-{m.pk}", m.title,
-                      f"{m.get_matter_type_display()} — {m.get_status_display()}", sections)
+                      f"{m.get_matter_type_display()} — {m.get_status_display()}", sections, cache_for=m)
 
 
 def evidence_add(request, pk):
@@ -0,0 +1,25 @@
+# Generated by Django 6.0.2 on 2026-10-19 08:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('assets', '0002_list_view_indexes'),
+        ('legal', '0003_list_view_indexes'),
+        ('notes', '0001_initial'),
+        ('stakeholders', '0002_list_view_indexes'),
+        ('tasks', '0002_list_view_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='note',
+            index=models.Index(fields=['date'], name='note_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='note',
+            index=models.Index(fields=['note_type', 'date'], name='note_type_date_idx'),
+        ),
+    ]
@@ -42,6 +42,10 @@ class Note(models.Model):
 
     class Meta:
         ordering = ["-date"]
+        indexes = [
+            models.Index(fields=["date"], name="note_date_idx"),
+            models.Index(fields=["note_type", "date"], name="note_type_date_idx"),
+        ]
 
 
 class Attachment(models.Model):
@@ -161,6 +161,18 @@ class NoteViewTests(TestCase):
         resp = self.client.get(reverse("notes:export_pdf", args=[self.note.pk]))
         self.assertEqual(resp["Content-Type"], "application/pdf")
 
+    def test_pdf_query_count(self):
+        for i in range(3):
+            person = Stakeholder.objects.create(name=f"Person {i}")
+            self.note.participants.add(person)
+            self.note.related_stakeholders.add(person)
+            self.note.related_legal_matters.add(LegalMatter.objects.create(title=f"Matter {i}"))
+            Attachment.objects.create(note=self.note, file=f"attachments/file{i}.txt")
+        # note + participants, related stakeholders, legal matters, attachments
+        with self.assertNumQueries(5):
+            resp = self.client.get(reverse("notes:export_pdf", args=[self.note.pk]))
+        self.assertEqual(resp["Content-Type"], "application/pdf")
+
     def test_attachment_add(self):
         f = SimpleUploadedFile("upload.txt", b"data", content_type="text/plain")
         resp = self.client.post(
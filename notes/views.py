@@ -113,9 +113,14 @@ class NoteDeleteView(DeleteView):
         return super().form_valid(form)
 
 
+NOTE_PDF_PLAN = {
+    "prefetch_related": ["participants", "related_stakeholders", "related_legal_matters", "attachments"],
+}
+
+
 def export_pdf_detail(request, pk):
-    from blaine.pdf_export import render_pdf
-    n = get_object_or_404(Note, pk=pk)
+    from blaine.pdf_export import get_pdf_object, render_pdf
+    n = get_pdf_object(Note, pk, NOTE_PDF_PLAN)
     sections = [
         {"heading": "Content", "type": "text", "content": n.content},
     ]
@@ -140,7 +145,7 @@ def export_pdf_detail(request, pk):
                          "headers": ["File", "Description", "Uploaded"],
                          "rows": [[a.file.name, a.description or "-", a.uploaded_at.strftime("%b %d, %Y")] for a in attachments]})
     return render_pdf(request, f"note-{n.pk}", n.title,
-                      f"{n.get_note_type_display()} — {n.date.strftime('%b %d, %Y %I:%M %p')}", sections)
+                      f"{n.get_note_type_display()} — {n.date.strftime('%b %d, %Y %I:%M %p')}", sections, cache_for=n)
 
 
 def attachment_add(request, pk):
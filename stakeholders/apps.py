@@ -3,3 +3,8 @@ from django.apps import AppConfig
 
 class StakeholdersConfig(AppConfig):
     name = 'stakeholders'
+
+    def ready(self):
+        from stakeholders import connections
+
+        connections.connect_signals()
@@ -0,0 +1,428 @@
+"""How are two stakeholders connected? Paths across every kind of link.
+
+Besides Relationship rows, stakeholders are linked implicitly by what they
+share: a legal matter (as attorneys or related parties), a note (as
+participants or related stakeholders) or a property (its owner and the
+lenders on loans it secures). Each of these, and each Relationship, is a
+*link*: a hub whose members are all connected to one another, so the graph
+is a multigraph where two stakeholders can be joined by several links.
+
+``ConnectionGraph`` keeps, per link, its member stakeholders and, per
+stakeholder, the links it belongs to. ``connection_graph()`` builds it from
+about ten queries and keeps it in process memory. Saves and deletes of the
+source rows (connected in StakeholdersConfig.ready) re-read just the links
+they touch once the transaction commits, so the graph is updated in place
+instead of rebuilt. It's rebuilt from scratch when the source models'
+versions change without a local update (bulk writes, other processes with a
+shared cache backend) and at least every MAX_AGE seconds.
+
+``shortest_path()`` runs a bidirectional breadth-first search and
+``all_paths()`` enumerates simple paths up to ``max_length`` links, pruned
+by the distance to the target, so both answer in milliseconds.
+"""
+import threading
+import time
+
+DEFAULT_MAX_LENGTH = 3
+MAX_LENGTH = 4
+SHORTEST_MAX_LENGTH = 8
+MAX_PATHS = 25
+# Seconds before the graph is rebuilt even if no change was seen
+MAX_AGE = 300
+
+KINDS = {
+    "relationship": "Relationship",
+    "legal": "Legal matter",
+    "note": "Note",
+    "property": "Property",
+}
+SOURCES = ["stakeholders.relationship", "legal.legalmatter", "notes.note", "assets.realestate", "assets.loan"]
+
+# [versioned key the graph matches, loaded at, graph]
+_loaded = [None, 0.0, None]
+# Held while the graph is read or updated (gthread workers share it)
+_lock = threading.RLock()
+
+
+class ConnectionGraph:
+    def __init__(self):
+        self.members = {}  # (kind, pk) -> tuple of stakeholder pks
+        self.labels = {}  # (kind, pk) -> label
+        self.links = {}  # stakeholder pk -> set of (kind, pk)
+        self.loan_collateral = {}  # loan pk -> property pk, to find the property a loan used to secure
+
+    def set_link(self, link, label, members):
+        """Add, replace or (with fewer than two members) drop ``link``."""
+        for pk in self.members.pop(link, ()):
+            self.links[pk].discard(link)
+            if not self.links[pk]:
+                del self.links[pk]
+        self.labels.pop(link, None)
+        members = tuple(sorted(set(members)))
+        if len(members) < 2:
+            return
+        self.members[link] = members
+        self.labels[link] = label
+        for pk in members:
+            self.links.setdefault(pk, set()).add(link)
+
+    def remove_stakeholder(self, pk):
+        for link in list(self.links.get(pk, ())):
+            self.set_link(link, self.labels[link], [m for m in self.members[link] if m != pk])
+
+    def neighbors(self, pk):
+        """(other stakeholder, link) pairs, one per link they share."""
+        for link in self.links.get(pk, ()):
+            for other in self.members[link]:
+                if other != pk:
+                    yield other, link
+
+    def load(self, kind, pks=None):
+        """(Re)read the links of ``kind`` (only ``pks`` when given)."""
+        found = LOADERS[kind](self, pks)
+        for pk in pks if pks is not None else found:
+            label, members = found.get(pk, ("", ()))
+            self.set_link((kind, pk), label, members)
+
+
+def _filter(qs, pks, field="pk"):
+    return qs if pks is None else qs.filter(**{f"{field}__in": pks})
+
+
+def _with_members(rows, member_queries):
+    """{pk: (label, members)} from (pk, label) rows and (pk, stakeholder pk) queries."""
+    found = {pk: (label, []) for pk, label in rows}
+    for query in member_queries:
+        for pk, stakeholder in query:
+            if pk in found and stakeholder:
+                found[pk][1].append(stakeholder)
+    return found
+
+
+def _relationships(graph, pks):
+    from .models import Relationship
+
+    rows = _filter(Relationship.objects.order_by(), pks).values_list(
+        "pk", "relationship_type", "from_stakeholder_id", "to_stakeholder_id",
+    )
+    return {pk: (label, (a, b)) for pk, label, a, b in rows}
+
+
+def _legal_matters(graph, pks):
+    from legal.models import LegalMatter
+
+    return _with_members(
+        _filter(LegalMatter.objects.order_by(), pks).values_list("pk", "title"),
+        [_filter(field.through.objects.order_by(), pks, "legalmatter_id").values_list("legalmatter_id", "stakeholder_id")
+         for field in (LegalMatter.attorneys, LegalMatter.related_stakeholders)],
+    )
+
+
+def _notes(graph, pks):
+    from notes.models import Note
+
+    return _with_members(
+        _filter(Note.objects.order_by(), pks).values_list("pk", "title"),
+        [_filter(field.through.objects.order_by(), pks, "note_id").values_list("note_id", "stakeholder_id")
+         for field in (Note.participants, Note.related_stakeholders)],
+    )
+
+
+def _properties(graph, pks):
+    from assets.models import Loan, RealEstate
+
+    loans = list(_filter(Loan.objects.filter(collateral_property__isnull=False).order_by(), pks,
+                         "collateral_property_id").values_list("pk", "collateral_property_id", "lender_id"))
+    if pks is not None:
+        pks = set(pks)
+        for loan in [loan for loan, prop in graph.loan_collateral.items() if prop in pks]:
+            del graph.loan_collateral[loan]
+    graph.loan_collateral.update((loan, prop) for loan, prop, _lender in loans)
+    return _with_members(
+        _filter(RealEstate.objects.order_by(), pks).values_list("pk", "name"),
+        [_filter(RealEstate.objects.order_by(), pks).values_list("pk", "stakeholder_id"),
+         [(prop, lender) for _loan, prop, lender in loans]],
+    )
+
+
+LOADERS = {
+    "relationship": _relationships,
+    "legal": _legal_matters,
+    "note": _notes,
+    "property": _properties,
+}
+
+
+def build():
+    graph = ConnectionGraph()
+    for kind in LOADERS:
+        graph.load(kind)
+    return graph
+
+
+def connection_graph():
+    """The process's graph, rebuilt when it's missing, too old or the sources changed elsewhere.
+
+    Inside a transaction a fresh graph is built and not kept, as uncommitted
+    rows could be rolled back.
+    """
+    from django.db import connection
+
+    if connection.in_atomic_block:
+        return build()
+    key = _key()
+    stored, loaded_at, graph = _loaded
+    if graph is None or time.monotonic() - loaded_at > MAX_AGE or stored != key:
+        _loaded[:] = [key, time.monotonic(), build()]
+    return _loaded[2]
+
+
+def _key():
+    from django.apps import apps
+
+    from blaine.cache import versioned_key
+
+    return versioned_key("stakeholders:connections", [apps.get_model(label) for label in SOURCES])
+
+
+def _distances(graph, start, limit):
+    """{pk: links from ``start``} for everything within ``limit`` links."""
+    links, members = graph.links, graph.members
+    distance = {start: 0}
+    frontier = [start]
+    for depth in range(1, limit + 1):
+        next_frontier = []
+        for node in frontier:
+            for link in links.get(node, ()):
+                for other in members[link]:
+                    if other not in distance:
+                        distance[other] = depth
+                        next_frontier.append(other)
+        frontier = next_frontier
+    return distance
+
+
+def shortest_path(graph, source, target, max_length=SHORTEST_MAX_LENGTH):
+    """[source, link, stakeholder, link, …, target] or None when not within ``max_length`` links.
+
+    Searches from both ends, a level at a time, always expanding the smaller
+    frontier; the level that meets the other search picks the shortest join.
+    """
+    if source == target:
+        return [source]
+    parents = [{source: None}, {target: None}]
+    depths = [{source: 0}, {target: 0}]
+    frontiers = [[source], [target]]
+    for _ in range(max_length):
+        side = 0 if len(frontiers[0]) <= len(frontiers[1]) else 1
+        seen, other_depth = parents[side], depths[1 - side]
+        next_frontier, meetings = [], []
+        for node in frontiers[side]:
+            for other, link in graph.neighbors(node):
+                if other in seen:
+                    continue
+                seen[other] = (node, link)
+                depths[side][other] = depths[side][node] + 1
+                if other in other_depth:
+                    meetings.append(other)
+                next_frontier.append(other)
+        if meetings:
+            return _join(parents, min(meetings, key=lambda pk: (other_depth[pk], pk)))
+        if not next_frontier:
+            return None
+        frontiers[side] = next_frontier
+    return None
+
+
+def _join(parents, meeting):
+    """The path through ``meeting`` from the two searches' parent maps."""
+    path = [meeting]
+    step = parents[0][meeting]
+    while step:
+        node, link = step
+        path[:0] = [node, link]
+        step = parents[0][node]
+    step = parents[1][meeting]
+    while step:
+        node, link = step
+        path += [link, node]
+        step = parents[1][node]
+    return path
+
+
+def all_paths(graph, source, target, max_length=DEFAULT_MAX_LENGTH, limit=MAX_PATHS):
+    """Simple paths of at most ``max_length`` links, shortest first, up to ``limit``.
+
+    Each path visits a stakeholder and uses a link at most once; two people
+    sharing two notes give two paths. A search back from the target first
+    bounds how far stakeholders are from it, so the walk only follows steps
+    that can still reach it in time; paths are found one length at a time,
+    stopping once ``limit`` are found.
+    """
+    if source == target:
+        return []
+    # Distances from the target, searched only half way: anyone not found is
+    # more than ``reach`` links away, which still prunes the second half
+    reach = max_length // 2
+    to_target = _distances(graph, target, reach)
+    paths = []
+    path, on_path, used = [source], {source}, set()
+
+    def walk(node, left):
+        for other, link in sorted(graph.neighbors(node)):
+            if len(paths) >= limit:
+                return
+            if other == target:
+                if left == 1 and link not in used:
+                    paths.append([*path, link, target])
+                continue
+            if other in on_path or link in used or to_target.get(other, reach + 1) > left - 1:
+                continue
+            path.extend([link, other])
+            on_path.add(other)
+            used.add(link)
+            walk(other, left - 1)
+            del path[-2:]
+            on_path.discard(other)
+            used.discard(link)
+
+    for length in range(1, max_length + 1):
+        walk(source, length)
+    return paths
+
+
+LINK_URLS = {
+    "legal": "legal:detail",
+    "note": "notes:detail",
+    "property": "assets:realestate_detail",
+}
+
+
+def describe(graph, paths):
+    """Paths as lists of display steps: stakeholders and the links between them."""
+    from django.urls import reverse
+
+    from .models import Stakeholder
+
+    people = {pk for path in paths for pk in path[::2]}
+    names = dict(Stakeholder.objects.filter(pk__in=people).values_list("pk", "name"))
+    described = []
+    for path in paths:
+        steps = []
+        for i, step in enumerate(path):
+            if i % 2 == 0:
+                steps.append({"type": "stakeholder", "id": step, "name": names.get(step, ""),
+                              "url": reverse("stakeholders:detail", args=[step])})
+            else:
+                kind, pk = step
+                url = reverse(LINK_URLS[kind], args=[pk]) if kind in LINK_URLS else ""
+                steps.append({"type": "link", "kind": kind, "kind_label": KINDS[kind], "id": pk,
+                              "label": graph.labels.get(step, ""), "url": url})
+        described.append(steps)
+    return described
+
+
+def find_connections(source, target, max_length=DEFAULT_MAX_LENGTH):
+    """{"shortest", "shortest_length", "paths", "truncated"} between two stakeholder pks.
+
+    ``shortest`` (searched up to SHORTEST_MAX_LENGTH links) and each of
+    ``paths`` (up to ``max_length``) are lists of steps from ``describe``.
+    """
+    with _lock:
+        graph = connection_graph()
+        shortest = shortest_path(graph, source, target)
+        paths = all_paths(graph, source, target, max_length, MAX_PATHS + 1)
+        truncated = len(paths) > MAX_PATHS
+        described = describe(graph, ([shortest] if shortest else []) + paths[:MAX_PATHS])
+    if shortest:
+        return {"shortest": described[0], "shortest_length": len(shortest) // 2, "paths": described[1:],
+                "truncated": truncated}
+    return {"shortest": None, "shortest_length": None, "paths": described, "truncated": truncated}
+
+
+# --- Incremental updates ---------------------------------------------------
+
+def _refresh(changes):
+    """Re-read the changed links in this process's graph (after commit)."""
+    with _lock:
+        graph = _loaded[2]
+        if graph is None:
+            return
+        for kind, pks in changes.items():
+            if kind == "stakeholder":
+                for pk in pks:
+                    graph.remove_stakeholder(pk)
+            else:
+                graph.load(kind, pks)
+        # The write's own version bumps have run by now (see connect_signals),
+        # so this is the key of the data the graph reflects; any other change
+        # makes the next read rebuild
+        _loaded[0] = _key()
+
+
+def _schedule(changes):
+    from django.db import transaction
+
+    changes = {kind: [pk for pk in pks if pk] for kind, pks in changes.items()}
+    if _loaded[2] is not None and any(changes.values()):
+        transaction.on_commit(lambda: _refresh(changes))
+
+
+def _changes(sender, instance):
+    label = sender._meta.label_lower
+    if label == "stakeholders.relationship":
+        return {"relationship": [instance.pk]}
+    if label == "legal.legalmatter":
+        return {"legal": [instance.pk]}
+    if label == "notes.note":
+        return {"note": [instance.pk]}
+    if label == "assets.realestate":
+        return {"property": [instance.pk]}
+    if label == "assets.loan":
+        graph = _loaded[2]
+        before = graph.loan_collateral.get(instance.pk) if graph else None
+        return {"property": [before, instance.collateral_property_id]}
+    return {"stakeholder": [instance.pk]}
+
+
+def _on_save(sender, instance, raw=False, created=False, **kwargs):
+    if raw or sender._meta.label_lower == "stakeholders.stakeholder":
+        return  # a new or renamed stakeholder has no links yet; names are read per query
+    _schedule(_changes(sender, instance))
+
+
+def _on_delete(sender, instance, **kwargs):
+    _schedule(_changes(sender, instance))
+
+
+def _on_members(sender, instance, action, reverse, pk_set, **kwargs):
+    kind = "legal" if sender._meta.app_label == "legal" else "note"
+    if action == "pre_clear" and reverse:
+        # The stakeholder's links are gone by post_clear
+        links = _loaded[2].links.get(instance.pk, ()) if _loaded[2] else ()
+        instance._connections_cleared = [pk for link_kind, pk in links if link_kind == kind]
+    elif action == "post_clear":
+        _schedule({kind: getattr(instance, "_connections_cleared", []) if reverse else [instance.pk]})
+    elif action in ("post_add", "post_remove"):
+        _schedule({kind: list(pk_set) if reverse else [instance.pk]})
+
+
+def connect_signals():
+    from django.apps import apps
+    from django.db.models.signals import m2m_changed, post_delete, post_save
+
+    from blaine import cache
+
+    # The version counters' receivers must run first so a write's bumps
+    # (and their on_commit hooks) come before _refresh records the key;
+    # connecting them again later is a no-op (same dispatch_uid)
+    cache.connect_signals()
+    for label in [*SOURCES, "stakeholders.stakeholder"]:
+        model = apps.get_model(label)
+        post_save.connect(_on_save, sender=model, dispatch_uid=f"connections.save.{label}")
+        post_delete.connect(_on_delete, sender=model, dispatch_uid=f"connections.delete.{label}")
+    LegalMatter, Note = apps.get_model("legal.legalmatter"), apps.get_model("notes.note")
+    for field in (LegalMatter.attorneys, LegalMatter.related_stakeholders, Note.participants,
+                  Note.related_stakeholders):
+        m2m_changed.connect(_on_members, sender=field.through,
+                            dispatch_uid=f"connections.members.{field.through._meta.label_lower}")
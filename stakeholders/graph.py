@@ -0,0 +1,208 @@
+"""The relationship network: an in-memory adjacency list, N-hop BFS and layout.
+
+``relationship_graph()`` loads every Relationship once (one query, three
+columns) into a dict-of-lists adjacency and keeps it in process memory
+under a key built from the Relationship version counter, so it's rebuilt
+only after relationships change, and every graph request after that is a
+walk in memory instead of a query per hop.
+
+``neighborhood()`` runs a breadth-first search from a stakeholder out to
+``depth`` hops, stopping at ``max_nodes``, and returns the nodes with
+their hop count plus every edge between them. ``layout()`` optionally
+places the nodes server-side so the browser can draw them as-is: "radial"
+puts each hop on its own ring with children next to their parent, and
+"force" refines that with a vectorised Fruchterman-Reingold pass (NumPy).
+"""
+import math
+from collections import deque
+
+import numpy as np
+
+DEFAULT_DEPTH = 2
+MAX_DEPTH = 4
+DEFAULT_MAX_NODES = 150
+MAX_NODES = 1000
+LAYOUTS = ("none", "radial", "force")
+# Layout coordinates fall within [-EXTENT, EXTENT]
+EXTENT = 500.0
+FORCE_ITERATIONS = 60
+# The force pass is O(n²) per step; larger neighbourhoods get the radial layout
+FORCE_MAX_NODES = 400
+
+# (versioned key, graph) of the last adjacency built in this process
+_loaded = (None, None)
+
+
+def build_graph(edges):
+    """A graph dict from (a, b, label) edges: ``edges``, ``labels`` and ``adjacency``.
+
+    ``adjacency`` maps a stakeholder pk to the indices of its edges (in
+    either direction); ``edges`` holds (a, b, label index) tuples.
+    """
+    labels, label_index, stored, adjacency = [], {}, [], {}
+    for a, b, label in edges:
+        if label not in label_index:
+            label_index[label] = len(labels)
+            labels.append(label)
+        i = len(stored)
+        stored.append((a, b, label_index[label]))
+        adjacency.setdefault(a, []).append(i)
+        if b != a:
+            adjacency.setdefault(b, []).append(i)
+    return {"edges": stored, "labels": labels, "adjacency": adjacency}
+
+
+def relationship_graph():
+    """The adjacency of all Relationship rows, rebuilt when relationships change.
+
+    Like ``blaine.cache.cached``, it isn't kept inside a transaction, where
+    uncommitted changes don't bump the version yet.
+    """
+    global _loaded
+    from django.db import connection
+
+    from blaine.cache import versioned_key
+
+    from .models import Relationship
+
+    if connection.in_atomic_block:
+        return build_graph(Relationship.objects.values_list(
+            "from_stakeholder_id", "to_stakeholder_id", "relationship_type",
+        ))
+    key = versioned_key("stakeholders:adjacency", [Relationship])
+    if _loaded[0] != key:
+        rows = Relationship.objects.order_by("pk").values_list(
+            "from_stakeholder_id", "to_stakeholder_id", "relationship_type",
+        )
+        _loaded = (key, build_graph(rows.iterator(chunk_size=5000)))
+    return _loaded[1]
+
+
+def neighborhood(graph, center, depth=DEFAULT_DEPTH, max_nodes=DEFAULT_MAX_NODES):
+    """BFS from ``center``: ({pk: hops}, {pk: parent pk}, [edge indices between found nodes], truncated).
+
+    Nodes are found nearest first; once ``max_nodes`` are found the search
+    stops and ``truncated`` is True.
+    """
+    edges, adjacency = graph["edges"], graph["adjacency"]
+    hops = {center: 0}
+    parents = {center: None}
+    queue = deque([center])
+    truncated = False
+    while queue and not truncated:
+        node = queue.popleft()
+        if hops[node] >= depth:
+            continue
+        for i in adjacency.get(node, ()):
+            a, b, _label = edges[i]
+            other = b if a == node else a
+            if other in hops:
+                continue
+            if len(hops) >= max_nodes:
+                truncated = True
+                break
+            hops[other] = hops[node] + 1
+            parents[other] = node
+            queue.append(other)
+    found = set()
+    for node in hops:
+        for i in adjacency.get(node, ()):
+            a, b, _label = edges[i]
+            if a in hops and b in hops:
+                found.add(i)
+    return hops, parents, sorted(found), truncated
+
+
+def _radial(hops, parents):
+    """Rings by hop count; each node takes an angle slot, ordered by its parent's angle."""
+    rings = {}
+    for node, hop in hops.items():
+        rings.setdefault(hop, []).append(node)
+    max_hop = max(rings) or 1
+    angles, positions = {}, {}
+    for hop in sorted(rings):
+        members = sorted(rings[hop], key=lambda n: (angles.get(parents[n], 0.0), n))
+        radius = EXTENT * hop / max_hop
+        for j, node in enumerate(members):
+            angle = 2 * math.pi * j / len(members)
+            angles[node] = angle
+            positions[node] = (radius * math.cos(angle), radius * math.sin(angle))
+    return positions
+
+
+def _force(hops, edge_pairs, start):
+    """Fruchterman-Reingold from ``start`` positions, all pairwise forces at once per step."""
+    nodes = list(hops)
+    n = len(nodes)
+    if n < 3:
+        return start
+    index = {node: i for i, node in enumerate(nodes)}
+    pos = np.array([start[node] for node in nodes], dtype=float)
+    pairs = np.array([(index[a], index[b]) for a, b in edge_pairs if a != b], dtype=int).reshape(-1, 2)
+    k = 2 * EXTENT / math.sqrt(n)
+    temperature = EXTENT / 10
+    for _ in range(FORCE_ITERATIONS):
+        delta = pos[:, None, :] - pos[None, :, :]
+        # Repulsion k²/d between every pair, along delta/d
+        squared = np.maximum(np.einsum("ijk,ijk->ij", delta, delta), 1e-6)
+        move = np.einsum("ijk,ij->ik", delta, k * k / squared)
+        if len(pairs):
+            # Attraction d²/k along edges
+            d = pos[pairs[:, 0]] - pos[pairs[:, 1]]
+            length = np.maximum(np.linalg.norm(d, axis=1), 1e-3)
+            pull = d / length[:, None] * (length * length / k)[:, None]
+            np.add.at(move, pairs[:, 0], -pull)
+            np.add.at(move, pairs[:, 1], pull)
+        length = np.maximum(np.linalg.norm(move, axis=1), 1e-3)
+        pos += move / length[:, None] * np.minimum(length, temperature)[:, None]
+        pos -= pos[index[next(iter(hops))]]  # keep the center at the origin
+        temperature *= 0.95
+    # Scale back into the drawing box
+    scale = EXTENT / max(np.abs(pos).max(), 1e-3)
+    return {node: (pos[i, 0] * scale, pos[i, 1] * scale) for i, node in enumerate(nodes)}
+
+
+def layout(kind, hops, parents, edge_pairs):
+    """{pk: (x, y)} for ``kind`` in LAYOUTS ("none" gives {}).
+
+    "force" falls back to "radial" above FORCE_MAX_NODES nodes.
+    """
+    if kind == "none" or not hops:
+        return {}
+    positions = _radial(hops, parents)
+    if kind == "force" and len(hops) <= FORCE_MAX_NODES:
+        positions = _force(hops, edge_pairs, positions)
+    return positions
+
+
+def subgraph(center, depth=DEFAULT_DEPTH, max_nodes=DEFAULT_MAX_NODES, layout_kind="none"):
+    """Compact JSON-ready data for the network around ``center`` (a Stakeholder)."""
+    from django.urls import reverse
+
+    from .models import Stakeholder
+
+    graph = relationship_graph()
+    hops, parents, edge_ids, truncated = neighborhood(graph, center.pk, depth, max_nodes)
+    edges = [graph["edges"][i] for i in edge_ids]
+    positions = layout(layout_kind, hops, parents, [(a, b) for a, b, _label in edges])
+    details = {
+        pk: (name, entity_type)
+        for pk, name, entity_type in Stakeholder.objects.filter(pk__in=hops).values_list("pk", "name", "entity_type")
+    }
+    type_labels = dict(Stakeholder.ENTITY_TYPE_CHOICES)
+    nodes = []
+    for pk, hop in hops.items():
+        name, entity_type = details.get(pk, ("", ""))
+        node = {"id": str(pk), "name": name, "type": type_labels.get(entity_type, entity_type), "depth": hop,
+                "is_center": hop == 0}
+        if pk in positions:
+            node["x"], node["y"] = (round(v, 1) for v in positions[pk])
+        nodes.append(node)
+    return {
+        "nodes": nodes,
+        "edges": [{"source": str(a), "target": str(b), "label": graph["labels"][label]} for a, b, label in edges],
+        # Node URLs are this with the 0 replaced by the node id
+        "url_template": reverse("stakeholders:detail", kwargs={"pk": 0}),
+        "depth": depth,
+        "truncated": truncated,
+    }
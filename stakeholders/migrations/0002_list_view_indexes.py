@@ -0,0 +1,29 @@
+# Generated by Django 6.0.2 on 2026-10-19 08:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('stakeholders', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='contactlog',
+            index=models.Index(fields=['date'], name='contactlog_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='contactlog',
+            index=models.Index(fields=['follow_up_needed', 'follow_up_date'], name='contactlog_followup_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='stakeholder',
+            index=models.Index(fields=['name'], name='stakeholder_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='stakeholder',
+            index=models.Index(fields=['entity_type', 'name'], name='stakeholder_type_name_idx'),
+        ),
+    ]
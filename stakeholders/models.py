@@ -39,6 +39,10 @@ class Stakeholder(models.Model):
 
     class Meta:
         ordering = ["name"]
+        indexes = [
+            models.Index(fields=["name"], name="stakeholder_name_idx"),
+            models.Index(fields=["entity_type", "name"], name="stakeholder_type_name_idx"),
+        ]
 
 
 class Relationship(models.Model):
@@ -85,3 +89,7 @@ class ContactLog(models.Model):
 
     class Meta:
         ordering = ["-date"]
+        indexes = [
+            models.Index(fields=["date"], name="contactlog_date_idx"),
+            models.Index(fields=["follow_up_needed", "follow_up_date"], name="contactlog_followup_idx"),
+        ]
@@ -1,8 +1,10 @@
 import json
 
+from django.core.cache import cache
 from django.core.exceptions import ValidationError
-from django.db import IntegrityError
-from django.test import TestCase
+from django.db import IntegrityError, connection
+from django.test import TestCase, TransactionTestCase
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from django.utils import timezone
 
@@ -245,6 +247,25 @@ class StakeholderViewTests(TestCase):
         self.assertEqual(resp["Content-Type"], "application/pdf")
         self.assertIn("attachment", resp["Content-Disposition"])
 
+    def test_pdf_export_query_count(self):
+        from notes.models import Note
+        from tasks.models import Task
+        other = Stakeholder.objects.create(name="Other")
+        for i in range(3):
+            ContactLog.objects.create(stakeholder=self.stakeholder, date=timezone.now(),
+                                      method="call", summary=f"Log {i}")
+            Task.objects.create(title=f"Task {i}", related_stakeholder=self.stakeholder)
+            note = Note.objects.create(title=f"Note {i}", content="x", date=timezone.now())
+            note.related_stakeholders.add(self.stakeholder)
+            Relationship.objects.create(from_stakeholder=self.stakeholder, to_stakeholder=other,
+                                        relationship_type=f"out {i}")
+            Relationship.objects.create(from_stakeholder=other, to_stakeholder=self.stakeholder,
+                                        relationship_type=f"in {i}")
+        # stakeholder + contact logs, relationships (x2), active tasks, notes
+        with self.assertNumQueries(6):
+            resp = self.client.get(reverse("stakeholders:export_pdf", args=[self.stakeholder.pk]))
+        self.assertEqual(resp["Content-Type"], "application/pdf")
+
     def test_contact_log_add(self):
         resp = self.client.post(
             reverse("stakeholders:contact_log_add", args=[self.stakeholder.pk]),
@@ -294,3 +315,207 @@ class StakeholderViewTests(TestCase):
         self.assertEqual(len(data["nodes"]), 2)
         self.assertEqual(len(data["edges"]), 1)
         self.assertEqual(data["edges"][0]["label"], "colleague")
+
+
+class RelationshipGraphTests(TestCase):
+    """N-hop neighbourhoods from the in-memory adjacency (stakeholders.graph)."""
+
+    @classmethod
+    def setUpTestData(cls):
+        # A chain a - b - c - d plus a spoke b - e
+        cls.people = {name: Stakeholder.objects.create(name=name) for name in "abcde"}
+        for left, right in ["ab", "bc", "cd", "be"]:
+            Relationship.objects.create(from_stakeholder=cls.people[left], to_stakeholder=cls.people[right],
+                                        relationship_type="knows")
+
+    def get(self, **params):
+        resp = self.client.get(reverse("stakeholders:graph_data", args=[self.people["a"].pk]), params)
+        self.assertEqual(resp.status_code, 200)
+        return json.loads(resp.content)
+
+    def names(self, data):
+        by_id = {str(p.pk): name for name, p in self.people.items()}
+        return {by_id[n["id"]]: n["depth"] for n in data["nodes"]}
+
+    def test_depth_reaches_further_hops(self):
+        self.assertEqual(self.names(self.get(depth=1)), {"a": 0, "b": 1})
+        data = self.get(depth=2)
+        self.assertEqual(self.names(data), {"a": 0, "b": 1, "c": 2, "e": 2})
+        self.assertEqual(len(data["edges"]), 3)
+        self.assertFalse(data["truncated"])
+        self.assertEqual(self.names(self.get(depth=3))["d"], 3)
+
+    def test_max_nodes_truncates_nearest_first(self):
+        data = self.get(depth=3, max_nodes=3)
+        self.assertTrue(data["truncated"])
+        self.assertEqual(len(data["nodes"]), 3)
+        self.assertEqual(sorted(self.names(data).values()), [0, 1, 2])
+
+    def test_invalid_params_fall_back(self):
+        data = self.get(depth="x", max_nodes="-4", layout="spiral")
+        self.assertEqual(data["depth"], 2)
+        self.assertNotIn("x", data["nodes"][0])
+        self.assertEqual(self.get(depth=99)["depth"], 4)
+        # Unicode digits pass str.isdigit() but not int()
+        self.assertEqual(self.get(depth="²")["depth"], 2)
+
+    def test_layouts_return_positions(self):
+        for layout in ["radial", "force"]:
+            data = self.get(depth=3, layout=layout)
+            center = next(n for n in data["nodes"] if n["is_center"])
+            self.assertEqual((center["x"], center["y"]), (0, 0))
+            self.assertTrue(all(abs(n["x"]) <= 500 and abs(n["y"]) <= 500 for n in data["nodes"]))
+
+    def test_node_urls_from_template(self):
+        data = self.get()
+        self.assertEqual(data["url_template"].replace("/0/", f"/{self.people['a'].pk}/"),
+                         self.people["a"].get_absolute_url())
+
+
+class RelationshipGraphCacheTests(TransactionTestCase):
+    """The adjacency is loaded once per Relationship version (outside a transaction)."""
+
+    def setUp(self):
+        cache.clear()
+        self.a = Stakeholder.objects.create(name="A")
+        self.b = Stakeholder.objects.create(name="B")
+        Relationship.objects.create(from_stakeholder=self.a, to_stakeholder=self.b, relationship_type="knows")
+
+    def relationship_queries(self):
+        from . import graph
+
+        with CaptureQueriesContext(connection) as ctx:
+            graph.subgraph(self.a)
+        return [q for q in ctx.captured_queries if "stakeholders_relationship" in q["sql"]]
+
+    def test_adjacency_reused_until_relationships_change(self):
+        from . import graph
+
+        self.relationship_queries()
+        self.assertEqual(self.relationship_queries(), [])
+        c = Stakeholder.objects.create(name="C")
+        Relationship.objects.create(from_stakeholder=self.b, to_stakeholder=c, relationship_type="knows")
+        self.assertEqual(len(self.relationship_queries()), 1)
+        self.assertEqual(len(graph.subgraph(self.a)["nodes"]), 3)
+
+
+class ConnectionFinderTests(TestCase):
+    """Paths across relationships, legal matters, notes and properties (stakeholders.connections)."""
+
+    @classmethod
+    def setUpTestData(cls):
+        from assets.models import Loan, RealEstate
+        from legal.models import LegalMatter
+        from notes.models import Note
+
+        cls.people = {name: Stakeholder.objects.create(name=name) for name in
+                      ["Ann", "Bob", "Cal", "Dee", "Eve", "Loner"]}
+        p = cls.people
+        Relationship.objects.create(from_stakeholder=p["Ann"], to_stakeholder=p["Bob"], relationship_type="partner")
+        cls.matter = LegalMatter.objects.create(title="Smith v. Jones")
+        cls.matter.attorneys.add(p["Bob"])
+        cls.matter.related_stakeholders.add(p["Cal"])
+        cls.note = Note.objects.create(title="Site visit", content="c", date=timezone.now())
+        cls.note.participants.add(p["Ann"])
+        cls.note.related_stakeholders.add(p["Cal"])
+        cls.property = RealEstate.objects.create(name="Elm St", stakeholder=p["Cal"])
+        Loan.objects.create(name="Elm mortgage", lender=p["Dee"], collateral_property=cls.property)
+
+    def find(self, a, b, **params):
+        resp = self.client.get(reverse("stakeholders:connections_data", args=[self.people[a].pk, self.people[b].pk]),
+                               params)
+        self.assertEqual(resp.status_code, 200)
+        return json.loads(resp.content)
+
+    def describe(self, path):
+        return [step["name"] if step["type"] == "stakeholder" else step["kind"] for step in path]
+
+    def test_shortest_path_crosses_implicit_links(self):
+        data = self.find("Ann", "Dee")
+        self.assertEqual(data["shortest_length"], 2)
+        self.assertEqual(self.describe(data["shortest"]), ["Ann", "note", "Cal", "property", "Dee"])
+        self.assertEqual(data["shortest"][1]["label"], "Site visit")
+        self.assertEqual(data["shortest"][1]["url"], self.note.get_absolute_url())
+
+    def test_all_paths_up_to_length(self):
+        data = self.find("Ann", "Cal")
+        paths = [self.describe(path) for path in data["paths"]]
+        self.assertEqual(paths, [["Ann", "note", "Cal"], ["Ann", "relationship", "Bob", "legal", "Cal"]])
+        self.assertEqual(len(self.find("Ann", "Cal", max_length=1)["paths"]), 1)
+
+    def test_no_connection(self):
+        data = self.find("Ann", "Loner")
+        self.assertIsNone(data["shortest"])
+        self.assertEqual(data["paths"], [])
+
+    def test_partial_searches_then_shows_paths(self):
+        url = reverse("stakeholders:connections", args=[self.people["Ann"].pk])
+        resp = self.client.get(url, {"q": "de"})
+        self.assertContains(resp, "Dee")
+        self.assertNotContains(resp, "Ann</button>")
+        resp = self.client.get(url, {"target": self.people["Dee"].pk})
+        self.assertContains(resp, "Shortest path (2 links)")
+        self.assertContains(resp, "Elm St")
+        self.assertEqual(self.client.get(url, {"target": "²", "max_length": "³"}).status_code, 200)
+
+    def test_detail_page_has_finder(self):
+        resp = self.client.get(reverse("stakeholders:detail", args=[self.people["Ann"].pk]))
+        self.assertContains(resp, "Connection Finder")
+
+
+class ConnectionGraphUpdateTests(TransactionTestCase):
+    """Committed changes update the kept graph in place (outside a transaction)."""
+
+    def setUp(self):
+        from notes.models import Note
+
+        from . import connections
+
+        cache.clear()
+        connections._loaded[:] = [None, 0.0, None]
+        self.a, self.b, self.c = (Stakeholder.objects.create(name=name) for name in "abc")
+        self.note = Note.objects.create(title="Call", content="c", date=timezone.now())
+        self.note.participants.add(self.a, self.b)
+        self.graph = connections.connection_graph()
+
+    def path(self, source, target):
+        from . import connections
+
+        self.assertIs(connections.connection_graph(), self.graph)
+        return connections.shortest_path(self.graph, source.pk, target.pk)
+
+    def test_member_changes_applied(self):
+        self.assertIsNone(self.path(self.a, self.c))
+        self.note.related_stakeholders.add(self.c)
+        self.assertEqual(self.path(self.a, self.c), [self.a.pk, ("note", self.note.pk), self.c.pk])
+        self.note.participants.remove(self.a)
+        self.assertEqual(self.path(self.b, self.c), [self.b.pk, ("note", self.note.pk), self.c.pk])
+        self.assertIsNone(self.path(self.a, self.c))
+
+    def test_loan_collateral_moves(self):
+        from assets.models import Loan, RealEstate
+
+        first = RealEstate.objects.create(name="First", stakeholder=self.a)
+        second = RealEstate.objects.create(name="Second", stakeholder=self.b)
+        loan = Loan.objects.create(name="Loan", lender=self.c, collateral_property=first)
+        self.assertEqual(self.path(self.a, self.c)[1], ("property", first.pk))
+        loan.collateral_property = second
+        loan.save()
+        self.assertEqual(self.path(self.b, self.c)[1], ("property", second.pk))
+        self.assertEqual(len(self.path(self.a, self.c)), 5)  # now only via the note and b
+
+    def test_other_writes_rebuild(self):
+        from blaine.cache import mark_changed
+
+        from . import connections
+
+        self.note.related_stakeholders.add(self.c)
+        self.assertIs(connections.connection_graph(), self.graph)
+        # A bulk write (or another process) after the local update
+        mark_changed("notes.note")
+        self.assertIsNot(connections.connection_graph(), self.graph)
+
+    def test_deleted_stakeholder_removed(self):
+        self.b.delete()
+        self.assertNotIn(self.b.pk, self.graph.links)
+        self.assertNotIn(("note", self.note.pk), self.graph.members)
@@ -12,6 +12,8 @@ urlpatterns = [
     path("<int:pk>/edit/", views.StakeholderUpdateView.as_view(), name="edit"),
     path("<int:pk>/delete/", views.StakeholderDeleteView.as_view(), name="delete"),
     path("<int:pk>/graph-data/", views.relationship_graph_data, name="graph_data"),
+    path("<int:pk>/connections/", views.connections, name="connections"),
+    path("<int:pk>/connections/<int:target>/", views.connections_data, name="connections_data"),
     path("<int:pk>/contact-log/add/", views.contact_log_add, name="contact_log_add"),
     path("contact-log/<int:pk>/delete/", views.contact_log_delete, name="contact_log_delete"),
     path("bulk/delete/", views.bulk_delete, name="bulk_delete"),
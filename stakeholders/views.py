@@ -1,9 +1,12 @@
 from django.contrib import messages
+from django.db.models import Prefetch
 from django.http import HttpResponse, JsonResponse
 from django.shortcuts import get_object_or_404, redirect, render
 from django.urls import reverse_lazy
 from django.views.generic import CreateView, DeleteView, DetailView, ListView, UpdateView
 
+from tasks.models import Task
+
 from .forms import ContactLogForm, StakeholderForm
 from .models import ContactLog, Relationship, Stakeholder
 
@@ -111,9 +114,20 @@ def export_csv(request):
     return do_export(qs, fields, "stakeholders")
 
 
+STAKEHOLDER_PDF_PLAN = {
+    "prefetch_related": [
+        "contact_logs",
+        Prefetch("relationships_from", queryset=Relationship.objects.select_related("to_stakeholder")),
+        Prefetch("relationships_to", queryset=Relationship.objects.select_related("from_stakeholder")),
+        Prefetch("tasks", queryset=Task.objects.exclude(status="complete"), to_attr="active_tasks"),
+        "notes",
+    ],
+}
+
+
 def export_pdf_detail(request, pk):
-    from blaine.pdf_export import render_pdf
-    s = get_object_or_404(Stakeholder, pk=pk)
+    from blaine.pdf_export import get_pdf_object, render_pdf
+    s = get_pdf_object(Stakeholder, pk, STAKEHOLDER_PDF_PLAN)
     sections = [
         {"heading": "Contact Information", "type": "info", "rows": [
             ("Email", s.email or "N/A"),
@@ -131,14 +145,14 @@ def export_pdf_detail(request, pk):
                          "headers": ["Date", "Method", "Summary", "Follow-up"],
                          "rows": [[l.date.strftime("%b %d, %Y"), l.get_method_display(),
                                    l.summary[:80], "Yes" if l.follow_up_needed else "No"] for l in logs]})
-    rels_from = s.relationships_from.select_related("to_stakeholder").all()
-    rels_to = s.relationships_to.select_related("from_stakeholder").all()
+    rels_from = s.relationships_from.all()
+    rels_to = s.relationships_to.all()
     if rels_from or rels_to:
         rows = [[r.to_stakeholder.name, r.relationship_type, "Outgoing"] for r in rels_from]
         rows += [[r.from_stakeholder.name, r.relationship_type, "Incoming"] for r in rels_to]
         sections.append({"heading": "Relationships", "type": "table",
                          "headers": ["Name", "Relationship", "Direction"], "rows": rows})
-    tasks = s.tasks.exclude(status="complete")
+    tasks = s.active_tasks
     if tasks:
         sections.append({"heading": "Active Tasks", "type": "table",
                          "headers": ["Title", "Status", "Priority", "Due Date"],
@@ -152,7 +166,7 @@ def export_pdf_detail(request, pk):
     subtitle = f"{s.get_entity_type_display()}"
     if s.organization:
         subtitle += f" — {s.organization}"
-    return render_pdf(request, f"stakeholder-{s.pk}", s.name, subtitle, sections)
+    return render_pdf(request, f"stakeholder-{s.pk}", s.name, subtitle, sections, cache_for=s)
 
 
 def contact_log_add(request, pk):
@@ -180,46 +194,70 @@ def contact_log_delete(request, pk):
                   {"contact_logs": stakeholder.contact_logs.all()[:10], "stakeholder": stakeholder})
 
 
+def _int_param(request, name, default, low, high):
+    try:
+        return min(max(int(request.GET.get(name, "")), low), high)
+    except ValueError:
+        return default
+
+
 def relationship_graph_data(request, pk):
-    """JSON endpoint for Cytoscape.js relationship graph."""
+    """JSON endpoint for the Cytoscape.js relationship graph.
+
+    ``depth`` (hops, 1-4), ``max_nodes`` (1-1000) and ``layout`` (none, radial,
+    force) shape the N-hop neighbourhood; see stakeholders.graph.
+    """
+    from blaine.cache import cached
+
+    from . import graph
+
     center = get_object_or_404(Stakeholder, pk=pk)
-    nodes = {}
-    edges = []
-
-    def add_node(s, is_center=False):
-        if s.pk not in nodes:
-            nodes[s.pk] = {
-                "id": str(s.pk),
-                "name": s.name,
-                "type": s.get_entity_type_display(),
-                "url": s.get_absolute_url(),
-                "is_center": is_center,
-            }
-
-    add_node(center, is_center=True)
-
-    # Direct relationships (1st degree)
-    connected_ids = set()
-    for rel in Relationship.objects.filter(from_stakeholder=center).select_related("to_stakeholder"):
-        add_node(rel.to_stakeholder)
-        connected_ids.add(rel.to_stakeholder.pk)
-        edges.append({"source": str(center.pk), "target": str(rel.to_stakeholder.pk), "label": rel.relationship_type})
-    for rel in Relationship.objects.filter(to_stakeholder=center).select_related("from_stakeholder"):
-        add_node(rel.from_stakeholder)
-        connected_ids.add(rel.from_stakeholder.pk)
-        edges.append({"source": str(rel.from_stakeholder.pk), "target": str(center.pk), "label": rel.relationship_type})
-
-    # 2nd degree relationships (between connected stakeholders)
-    if connected_ids:
-        for rel in Relationship.objects.filter(
-            from_stakeholder_id__in=connected_ids,
-            to_stakeholder_id__in=connected_ids,
-        ).select_related("from_stakeholder", "to_stakeholder"):
-            add_node(rel.from_stakeholder)
-            add_node(rel.to_stakeholder)
-            edges.append({"source": str(rel.from_stakeholder.pk), "target": str(rel.to_stakeholder.pk), "label": rel.relationship_type})
-
-    return JsonResponse({"nodes": list(nodes.values()), "edges": edges})
+    depth = _int_param(request, "depth", graph.DEFAULT_DEPTH, 1, graph.MAX_DEPTH)
+    max_nodes = _int_param(request, "max_nodes", graph.DEFAULT_MAX_NODES, 1, graph.MAX_NODES)
+    layout = request.GET.get("layout", "none")
+    if layout not in graph.LAYOUTS:
+        layout = "none"
+    data = cached(
+        "stakeholders:graph", [Stakeholder, Relationship],
+        lambda: graph.subgraph(center, depth, max_nodes, layout),
+        vary=[pk, depth, max_nodes, layout],
+    )
+    return JsonResponse(data, json_dumps_params={"separators": (",", ":")})
+
+
+CONNECTION_SEARCH_LIMIT = 10
+
+
+def connections(request, pk):
+    """Connection finder partial: stakeholders matching ``q``, or the paths to ``target``."""
+    from . import connections as finder
+
+    stakeholder = get_object_or_404(Stakeholder, pk=pk)
+    max_length = _int_param(request, "max_length", finder.DEFAULT_MAX_LENGTH, 1, finder.MAX_LENGTH)
+    context = {"stakeholder": stakeholder, "max_length": max_length}
+    target_pk = request.GET.get("target", "")
+    # isdigit() alone accepts digits like "²" that int() rejects
+    if target_pk.isascii() and target_pk.isdigit():
+        target = get_object_or_404(Stakeholder, pk=target_pk)
+        context.update(target=target, **finder.find_connections(stakeholder.pk, target.pk, max_length))
+    else:
+        q = request.GET.get("q", "").strip()
+        context["q"] = q
+        if q:
+            context["matches"] = (Stakeholder.objects.filter(name__icontains=q).exclude(pk=pk)
+                                  .only("pk", "name", "entity_type")[:CONNECTION_SEARCH_LIMIT])
+    return render(request, "stakeholders/partials/_connections.html", context)
+
+
+def connections_data(request, pk, target):
+    """JSON endpoint: shortest path and all paths (up to ``max_length`` links) between two stakeholders."""
+    from . import connections as finder
+
+    source = get_object_or_404(Stakeholder, pk=pk)
+    target = get_object_or_404(Stakeholder, pk=target)
+    max_length = _int_param(request, "max_length", finder.DEFAULT_MAX_LENGTH, 1, finder.MAX_LENGTH)
+    data = finder.find_connections(source.pk, target.pk, max_length)
+    return JsonResponse({"max_length": max_length, **data}, json_dumps_params={"separators": (",", ":")})
 
 
 def bulk_delete(request):
@@ -0,0 +1,48 @@
+# Generated by Django 6.0.2 on 2026-10-19 08:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('assets', '0002_list_view_indexes'),
+        ('legal', '0003_list_view_indexes'),
+        ('stakeholders', '0002_list_view_indexes'),
+        ('tasks', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='followup',
+            index=models.Index(fields=['outreach_date'], name='followup_outreach_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='followup',
+            index=models.Index(fields=['response_received', 'outreach_date'], name='followup_pending_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['due_date', '-priority'], name='task_due_priority_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['status', 'due_date'], name='task_status_due_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['priority', 'due_date'], name='task_priority_due_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['created_at'], name='task_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(condition=models.Q(('status', 'complete'), _negated=True), fields=['due_date'], name='task_open_due_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(condition=models.Q(('status', 'complete'), _negated=True), fields=['reminder_date'], name='task_open_reminder_idx'),
+        ),
+    ]
@@ -51,6 +51,16 @@ class Task(models.Model):
 
     class Meta:
         ordering = ["due_date", "-priority"]
+        indexes = [
+            models.Index(fields=["due_date", "-priority"], name="task_due_priority_idx"),
+            models.Index(fields=["status", "due_date"], name="task_status_due_idx"),
+            models.Index(fields=["priority", "due_date"], name="task_priority_due_idx"),
+            models.Index(fields=["created_at"], name="task_created_idx"),
+            # Open tasks only: overdue/upcoming panels, calendar, reminders
+            models.Index(fields=["due_date"], condition=~models.Q(status="complete"), name="task_open_due_idx"),
+            models.Index(fields=["reminder_date"], condition=~models.Q(status="complete"),
+                         name="task_open_reminder_idx"),
+        ]
 
 
 class FollowUp(models.Model):
@@ -80,3 +90,7 @@ class FollowUp(models.Model):
 
     class Meta:
         ordering = ["-outreach_date"]
+        indexes = [
+            models.Index(fields=["outreach_date"], name="followup_outreach_idx"),
+            models.Index(fields=["response_received", "outreach_date"], name="followup_pending_idx"),
+        ]
@@ -74,43 +74,41 @@ def check_upcoming_reminders():
     if ctx is None:
         return "Notifications disabled."
 
-    from tasks.models import Task
+    from dashboard.models import Deadline, Notification
 
     now = timezone.now()
-    upcoming = Task.objects.filter(
-        reminder_date__gte=now,
-        reminder_date__lte=now + timedelta(hours=24),
-    ).exclude(
-        status="complete",
-    ).select_related("related_stakeholder")
+    upcoming = list(Deadline.objects.filter(
+        kind="reminder",
+        at__gte=now,
+        at__lte=now + timedelta(hours=24),
+    ).select_related("stakeholder").order_by("at"))
 
-    if not upcoming.exists():
+    if not upcoming:
         return "No upcoming reminders."
 
     lines = []
-    for task in upcoming:
-        stakeholder = f" ({task.related_stakeholder.name})" if task.related_stakeholder else ""
-        lines.append(f"  - {task.title}{stakeholder} — reminder at {task.reminder_date:%Y-%m-%d %H:%M}")
+    for reminder in upcoming:
+        stakeholder = f" ({reminder.stakeholder.name})" if reminder.stakeholder else ""
+        lines.append(f"  - {reminder.title}{stakeholder} — reminder at {reminder.at:%Y-%m-%d %H:%M}")
 
-    body = f"Upcoming reminders ({upcoming.count()}):\n\n" + "\n".join(lines)
+    body = f"Upcoming reminders ({len(upcoming)}):\n\n" + "\n".join(lines)
 
     send_mail(
-        subject=f"[Control Center] {upcoming.count()} Upcoming Reminder(s)",
+        subject=f"[Control Center] {len(upcoming)} Upcoming Reminder(s)",
         message=body,
         from_email=ctx["from_email"],
         recipient_list=[ctx["admin_email"]],
         connection=ctx["connection"],
     )
 
-    from dashboard.models import Notification
-    for task in upcoming:
+    for reminder in upcoming:
         Notification.objects.create(
-            message=f"Reminder: {task.title}",
+            message=f"Reminder: {reminder.title}",
             level="info",
-            link=task.get_absolute_url(),
+            link=reminder.get_absolute_url(),
         )
 
-    return f"Sent reminder alert for {upcoming.count()} task(s)."
+    return f"Sent reminder alert for {len(upcoming)} task(s)."
 
 
 def check_stale_followups():
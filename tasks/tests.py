@@ -7,6 +7,7 @@ from django.test import TestCase
 from django.urls import reverse
 from django.utils import timezone
 
+from blaine.testing import QueryGuardMixin
 from stakeholders.models import Stakeholder
 
 from .models import FollowUp, Task
@@ -181,6 +182,21 @@ class TaskViewTests(TestCase):
         resp = self.client.get(reverse("tasks:export_pdf", args=[self.task.pk]))
         self.assertEqual(resp["Content-Type"], "application/pdf")
 
+    def test_pdf_query_count(self):
+        from notes.models import Note
+        person = Stakeholder.objects.create(name="Contact")
+        self.task.related_stakeholder = person
+        self.task.save()
+        for i in range(3):
+            FollowUp.objects.create(task=self.task, stakeholder=person,
+                                    outreach_date=timezone.now(), method="email")
+            note = Note.objects.create(title=f"Note {i}", content="x", date=timezone.now())
+            note.related_tasks.add(self.task)
+        # task with FKs joined + follow-ups, notes
+        with self.assertNumQueries(3):
+            resp = self.client.get(reverse("tasks:export_pdf", args=[self.task.pk]))
+        self.assertEqual(resp["Content-Type"], "application/pdf")
+
     def test_toggle_complete(self):
         resp = self.client.post(reverse("tasks:toggle_complete", args=[self.task.pk]))
         self.assertEqual(resp.status_code, 200)
@@ -231,6 +247,30 @@ class TaskViewTests(TestCase):
         self.assertFalse(FollowUp.objects.filter(pk=fu.pk).exists())
 
 
+class TaskQueryGuardTests(QueryGuardMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        for i in range(8):
+            stakeholder = Stakeholder.objects.create(name=f"Guard Stakeholder {i}")
+            cls.task = Task.objects.create(title=f"Guard Task {i}", related_stakeholder=stakeholder)
+            FollowUp.objects.create(task=cls.task, stakeholder=stakeholder, outreach_date=timezone.now())
+
+    def test_list_no_n_plus_one(self):
+        with self.assertNoNPlusOne():
+            resp = self.client.get(reverse("tasks:list"))
+        self.assertContains(resp, "Guard Stakeholder 7")
+
+    def test_list_partial_no_n_plus_one(self):
+        with self.assertNoNPlusOne():
+            resp = self.client.get(reverse("tasks:list"), {"q": "Guard"}, HTTP_HX_REQUEST="true")
+        self.assertContains(resp, "Guard Stakeholder 7")
+
+    def test_detail_no_n_plus_one(self):
+        with self.assertNoNPlusOne():
+            resp = self.client.get(reverse("tasks:detail", args=[self.task.pk]))
+        self.assertEqual(resp.status_code, 200)
+
+
 class NotificationTests(TestCase):
     @classmethod
     def setUpTestData(cls):
@@ -1,4 +1,5 @@
 from django.contrib import messages
+from django.db.models import Prefetch
 from django.shortcuts import get_object_or_404, redirect, render
 from django.urls import reverse_lazy
 from django.utils import timezone
@@ -17,7 +18,7 @@ class TaskListView(ListView):
     paginate_by = 25
 
     def get_queryset(self):
-        qs = super().get_queryset()
+        qs = super().get_queryset().select_related("related_stakeholder")
         q = self.request.GET.get("q", "").strip()
         if q:
             qs = qs.filter(title__icontains=q)
@@ -141,9 +142,18 @@ def export_csv(request):
     return do_export(qs, fields, "tasks")
 
 
+TASK_PDF_PLAN = {
+    "select_related": ["related_stakeholder", "related_legal_matter", "related_property"],
+    "prefetch_related": [
+        Prefetch("follow_ups", queryset=FollowUp.objects.select_related("stakeholder")),
+        "notes",
+    ],
+}
+
+
 def export_pdf_detail(request, pk):
-    from blaine.pdf_export import render_pdf
-    t = get_object_or_404(Task, pk=pk)
+    from blaine.pdf_export import get_pdf_object, render_pdf
+    t = get_pdf_object(Task, pk, TASK_PDF_PLAN)
     sections = [
         {"heading": "Task Information", "type": "info", "rows": [
             ("Due Date", t.due_date.strftime("%b %d, %Y") if t.due_date else "None"),
@@ -161,7 +171,7 @@ def export_pdf_detail(request, pk):
         sections[0]["rows"].append(("Property", t.related_property.name))
     if t.description:
         sections.append({"heading": "Description", "type": "text", "content": t.description})
-    follow_ups = t.follow_ups.select_related("stakeholder").all()
+    follow_ups = t.follow_ups.all()
     if follow_ups:
         sections.append({"heading": "Follow-ups", "type": "table",
                          "headers": ["Date", "Stakeholder", "Method", "Response", "Notes"],
@@ -176,7 +186,7 @@ def export_pdf_detail(request, pk):
                          "headers": ["Title", "Type", "Date"],
                          "rows": [[n.title, n.get_note_type_display(), n.date.strftime("%b %d, %Y")] for n in notes]})
     return render_pdf(request, f"task-{t.pk}", t.title,
-                      f"{t.get_status_display()} — {t.get_priority_display()} Priority", sections)
+                      f"{t.get_status_display()} — {t.get_priority_display()} Priority", sections, cache_for=t)
 
 
 def toggle_complete(request, pk):
@@ -247,6 +257,12 @@ def bulk_export_csv(request):
 def bulk_complete(request):
     if request.method == "POST":
         pks = request.POST.getlist("selected")
+        from blaine.cache import mark_changed
+        from dashboard import deadlines
+
         count = Task.objects.filter(pk__in=pks).exclude(status="complete").update(status="complete")
+        # update() sends no signals: drop the completed tasks' deadlines here
+        deadlines.remove_objects(Task, pks)
+        mark_changed(Task)
         messages.success(request, f"{count} task(s) marked complete.")
     return redirect("tasks:list")